@@ -0,0 +1,57 @@
+import json
+from typing import Dict, Tuple
+
+from fastapi import HTTPException
+
+
+class BodySizeLimitMiddleware:
+    """Per-route request body caps, enforced before the body is parsed.
+
+    A declared Content-Length over the cap is refused at once; chunked
+    bodies are counted as they arrive and cut off as soon as they pass it,
+    so an oversized upload is never spooled in full. ``limits`` maps
+    (method, path) to a byte count.
+    """
+
+    def __init__(self, app, limits: Dict[Tuple[str, str], int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        limit = self.limits.get((scope["method"], scope["path"]))
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                return await _reject(send, limit)
+
+        received = 0
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside body parsing, so FastAPI answers with it
+                    raise HTTPException(status_code=413, detail=_too_large(limit))
+            return message
+
+        return await self.app(scope, counting_receive, send)
+
+
+def _too_large(limit: int) -> str:
+    return f"Request body is larger than {limit // (1024 * 1024) or 1} MB"
+
+
+async def _reject(send, limit: int) -> None:
+    body = json.dumps({"detail": _too_large(limit)}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
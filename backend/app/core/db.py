@@ -3,31 +3,58 @@ from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 
-from app.services.auth_service.models.user import User
-from app.services.application.models.application import Application
-from app.services.job.models.job import Job
-from app.services.resume.models.resume import Resume
-from app.services.profile.models.profile import Profile
-
 # Load .env variables
 load_dotenv()
 
 # ✅ Use the correct env key
 MONGODB_URI = os.getenv("MONGODB_URL")  # Make sure your .env uses MONGODB_URL, not MONGODB_URI
+DATABASE_NAME = "jobboard"  # Will use the db name you added in URL, e.g. /jobboard
+
+# ✅ Created on first use (normally from the lifespan hook), not at import
+_client = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(MONGODB_URI)
+    return _client
+
+
+def get_db():
+    return get_client()[DATABASE_NAME]
 
-# ✅ Connect to MongoDB
-client = AsyncIOMotorClient(MONGODB_URI)
-db = client["jobboard"]  # Will use the db name you added in URL, e.g. /jobboard
 
 # ✅ Init Beanie with all models
 async def init_db():
+    from app.services.auth_service.models.user import User
+    from app.services.auth_service.models.revoked_token import RevokedToken
+    from app.services.application.models.application import Application
+    from app.services.application.models.application_counters import JobApplicationCounters
+    from app.services.application.models.application_event import ApplicationEventBucket
+    from app.services.job.models.job import Job
+    from app.services.dashboard.models.dashboard import DashboardSnapshot
+    from app.services.analytics.models.analytics import JobViewEvent, AnalyticsRollup, UniqueViewerSketch, TrendingSnapshot, FunnelStats
+    from app.services.resume.models.resume import Resume, ResumeBlob
+    from app.services.profile.models.profile import Profile
+
     await init_beanie(
-        database=db,
+        database=get_db(),
         document_models=[
             User,
+            RevokedToken,
             Application,
+            JobApplicationCounters,
+            ApplicationEventBucket,
             Job,
+            DashboardSnapshot,
+            JobViewEvent,
+            AnalyticsRollup,
+            UniqueViewerSketch,
+            TrendingSnapshot,
+            FunnelStats,
             Resume,
+            ResumeBlob,
             Profile,
         ],
     )
@@ -0,0 +1,30 @@
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List
+
+# Handlers receive every event of a publish call as one list, so a bulk
+# operation is delivered as a single batch rather than N callbacks.
+EventHandler = Callable[[List[dict]], Awaitable[None]]
+
+# Topics; handlers filter a batch on each event's "type"
+APPLICATION_EVENTS = "application.events"
+JOB_EVENTS = "job.events"
+FAVORITE_EVENTS = "favorite.events"
+JOB_VIEW_EVENTS = "job_view.events"
+USER_EVENTS = "user.events"
+
+_handlers: Dict[str, List[EventHandler]] = defaultdict(list)
+
+
+def subscribe(event_type: str, handler: EventHandler) -> None:
+    _handlers[event_type].append(handler)
+
+
+async def publish(event_type: str, events: List[dict]) -> None:
+    """Deliver a batch of events in-process; a failing handler never fails the publisher"""
+    if not events:
+        return
+    for handler in _handlers.get(event_type, []):
+        try:
+            await handler(events)
+        except Exception as e:
+            print(f"Error handling {event_type} events in {handler.__qualname__}: {e}")
@@ -0,0 +1,119 @@
+import hashlib
+import math
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+# Forward-decayed weights grow as exp(rate * age); rescale before they get
+# anywhere near float overflow.
+MAX_EXPONENT = 60.0
+
+
+class _ForwardDecay:
+    """Exponential decay without touching every counter on every tick.
+
+    Each increment is scaled up by exp(rate * (t - landmark)) instead, and
+    reads scale back down to "now". Moving the landmark rescales once.
+    """
+
+    def __init__(self, half_life_seconds: float):
+        self.rate = math.log(2) / half_life_seconds
+        self.landmark = time.time()
+
+    def weight(self, at: float) -> float:
+        return math.exp(self.rate * (at - self.landmark))
+
+    def needs_rescale(self, at: float) -> bool:
+        return self.rate * (at - self.landmark) > MAX_EXPONENT
+
+    def to_now(self, value: float, now: float) -> float:
+        return value * math.exp(-self.rate * (now - self.landmark))
+
+
+class DecayedCountMinSketch:
+    """Count-min sketch of exponentially decayed scores.
+
+    Memory is width x depth floats whatever the number of keys; estimates
+    never undercount and overcount by at most ~e/width of the total mass
+    with probability 1 - exp(-depth).
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, half_life_seconds: float = 6 * 3600):
+        self.width = width
+        self.depth = depth
+        self._decay = _ForwardDecay(half_life_seconds)
+        self._rows = [array("d", bytes(8 * width)) for _ in range(depth)]
+
+    def _columns(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def _rescale(self, at: float) -> float:
+        factor = self._decay.weight(at)  # > 1: everything shrinks relative to the new landmark
+        for row in self._rows:
+            for i in range(self.width):
+                row[i] /= factor
+        self._decay.landmark = at
+        return factor
+
+    def add(self, key: str, amount: float = 1.0, at: Optional[float] = None) -> float:
+        """Add a decayed increment; returns the key's new estimate as of ``at``"""
+        at = time.time() if at is None else at
+        if self._decay.needs_rescale(at):
+            self._rescale(at)
+        weighted = amount * self._decay.weight(at)
+        estimate = math.inf
+        for row, column in zip(self._rows, self._columns(key)):
+            row[column] += weighted
+            estimate = min(estimate, row[column])
+        return self._decay.to_now(estimate, at)
+
+    def estimate(self, key: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        raw = min(row[column] for row, column in zip(self._rows, self._columns(key)))
+        return self._decay.to_now(raw, now)
+
+
+class SpaceSavingTopK:
+    """Space-saving heavy hitters over decayed weights, using O(k) memory.
+
+    Any key whose true score exceeds total / k is guaranteed to be tracked;
+    a newcomer evicts the smallest entry and inherits its count as error.
+    """
+
+    def __init__(self, k: int = 100, half_life_seconds: float = 6 * 3600):
+        self.k = k
+        self._decay = _ForwardDecay(half_life_seconds)
+        self._counts: Dict[str, Tuple[float, float]] = {}  # key -> (count, overestimate)
+
+    def _rescale(self, at: float) -> None:
+        factor = self._decay.weight(at)
+        self._counts = {key: (count / factor, error / factor) for key, (count, error) in self._counts.items()}
+        self._decay.landmark = at
+
+    def add(self, key: str, amount: float = 1.0, at: Optional[float] = None) -> None:
+        at = time.time() if at is None else at
+        if self._decay.needs_rescale(at):
+            self._rescale(at)
+        weighted = amount * self._decay.weight(at)
+
+        if key in self._counts:
+            count, error = self._counts[key]
+            self._counts[key] = (count + weighted, error)
+        elif len(self._counts) < self.k:
+            self._counts[key] = (weighted, 0.0)
+        else:
+            smallest = min(self._counts, key=lambda item: self._counts[item][0])
+            floor, _ = self._counts.pop(smallest)
+            self._counts[key] = (floor + weighted, floor)
+
+    def top(self, n: Optional[int] = None, now: Optional[float] = None) -> List[Tuple[str, float, float]]:
+        """(key, score, max overestimate) as of ``now``, highest score first"""
+        now = time.time() if now is None else now
+        ranked = sorted(self._counts.items(), key=lambda item: item[1][0], reverse=True)[:n or self.k]
+        return [
+            (key, self._decay.to_now(count, now), self._decay.to_now(error, now))
+            for key, (count, error) in ranked
+        ]
@@ -0,0 +1,100 @@
+import hashlib
+import math
+from typing import Dict, Optional
+
+SPARSE = 0
+DENSE = 1
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch (standard error ~1.04 / sqrt(2 ** precision)).
+
+    Starts sparse (only touched registers, 3 bytes each) and switches to a
+    dense register array once that is smaller, so sketches of quiet jobs
+    stay tiny. ``to_bytes``/``from_bytes`` give a compact stored form.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self._sparse: Optional[Dict[int, int]] = {}
+        self._dense: Optional[bytearray] = None
+
+    @staticmethod
+    def hash(item: str) -> int:
+        return int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), "big")
+
+    def _set(self, index: int, rank: int) -> None:
+        if self._dense is not None:
+            if rank > self._dense[index]:
+                self._dense[index] = rank
+            return
+        if rank > self._sparse.get(index, 0):
+            self._sparse[index] = rank
+            if len(self._sparse) * 3 > self.num_registers:
+                self._densify()
+
+    def _densify(self) -> None:
+        self._dense = bytearray(self.num_registers)
+        for index, rank in self._sparse.items():
+            self._dense[index] = rank
+        self._sparse = None
+
+    def add_hash(self, value: int) -> None:
+        index = value >> (64 - self.precision)
+        rest = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        self._set(index, rank)
+
+    def add(self, item: str) -> None:
+        self.add_hash(self.hash(item))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        if other._dense is not None:
+            if self._dense is None:
+                self._densify()
+            self._dense = bytearray(map(max, self._dense, other._dense))
+        else:
+            for index, rank in other._sparse.items():
+                self._set(index, rank)
+
+    def __len__(self) -> int:
+        return round(self.estimate())
+
+    def estimate(self) -> float:
+        m = self.num_registers
+        if self._dense is not None:
+            zeros = self._dense.count(0)
+            harmonic = sum(2.0 ** -rank for rank in self._dense)
+        else:
+            zeros = m - len(self._sparse)
+            harmonic = zeros + sum(2.0 ** -rank for rank in self._sparse.values())
+
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / harmonic
+        if estimate <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting is more accurate when small
+        return estimate
+
+    def to_bytes(self) -> bytes:
+        if self._dense is not None:
+            return bytes([self.precision, DENSE]) + bytes(self._dense)
+        payload = bytearray([self.precision, SPARSE])
+        for index in sorted(self._sparse):
+            payload += index.to_bytes(2, "big") + bytes([self._sparse[index]])
+        return bytes(payload)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        sketch = cls(data[0])
+        if data[1] == DENSE:
+            sketch._dense = bytearray(data[2:])
+            sketch._sparse = None
+        else:
+            for offset in range(2, len(data), 3):
+                sketch._sparse[int.from_bytes(data[offset:offset + 2], "big")] = data[offset + 2]
+        return sketch
@@ -0,0 +1,32 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.db import get_db
+
+
+def new_holder() -> str:
+    """An id unique to this process, for telling lease holders apart"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+async def acquire_lease(name: str, holder: str, ttl: timedelta) -> bool:
+    """Take or renew the named lease for ``ttl``; False while another holder has it.
+
+    One document per lease: the conditional upsert either matches an expired
+    (or our own) lease and takes it over, or hits the _id of a live lease
+    held by someone else and fails with a duplicate key.
+    """
+    now = datetime.utcnow()
+    try:
+        await get_db()["leases"].update_one(
+            {"_id": name, "$or": [{"expires_at": {"$lte": now}}, {"holder": holder}]},
+            {"$set": {"holder": holder, "expires_at": now + ttl}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
@@ -0,0 +1,206 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+# Set to a redis:// URL to share buckets between workers; otherwise every
+# worker keeps its own in-process buckets.
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+
+# Only trust X-Forwarded-For when running behind a proxy that sets it
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+
+# Request bodies larger than this are not inspected for an email key
+MAX_INSPECTED_BODY = 16 * 1024
+
+
+class RateLimit(BaseModel):
+    key: str  # "ip" or "email"
+    per_minute: float  # sustained refill rate
+    burst: int  # bucket capacity
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60.0
+
+
+class ShardedBucketStore:
+    """In-process token buckets, split across independently locked shards.
+
+    Each shard is a bounded LRU, so memory stays flat under key floods;
+    an evicted bucket simply starts full again.
+    """
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 10000):
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+        self.max_keys_per_shard = max_keys_per_shard
+
+    async def take(self, key: str, rate: float, burst: int, cost: float = 1.0) -> Tuple[bool, float]:
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            tokens, updated_at = buckets.get(key, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - updated_at) * rate)
+            if tokens >= cost:
+                allowed, retry_after = True, 0.0
+                tokens -= cost
+            else:
+                allowed, retry_after = False, (cost - tokens) / rate
+            buckets[key] = (tokens, now)
+            buckets.move_to_end(key)
+            if len(buckets) > self.max_keys_per_shard:
+                buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+# Refill, take and persist in one server-side step so concurrent workers
+# cannot both spend the same token. Uses the Redis clock to avoid skew.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisBucketStore:
+    """Token buckets shared by all workers through any Redis-protocol server"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the 'redis' package is not installed")
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_LUA)
+        self.prefix = prefix
+
+    async def take(self, key: str, rate: float, burst: int, cost: float = 1.0) -> Tuple[bool, float]:
+        try:
+            allowed, retry_after = await self._script(keys=[self.prefix + key], args=[rate, burst, cost])
+        except Exception as e:
+            # Fail open: an unavailable limiter must not take login down with it
+            print(f"Rate limit store unavailable: {e}")
+            return True, 0.0
+        return bool(int(allowed)), float(retry_after)
+
+
+def create_bucket_store():
+    if RATE_LIMIT_REDIS_URL:
+        return RedisBucketStore(RATE_LIMIT_REDIS_URL)
+    return ShardedBucketStore()
+
+
+class RateLimitMiddleware:
+    """Per-route token-bucket limits keyed by client IP and/or request email.
+
+    Runs before routing, so over-limit requests never reach a database
+    lookup or a password hash. ``rules`` maps (method, path) to a list of
+    RateLimit or (key, per_minute, burst) tuples.
+    """
+
+    def __init__(self, app, rules: Dict[Tuple[str, str], List], store=None):
+        self.app = app
+        self.rules = {
+            route: [limit if isinstance(limit, RateLimit) else RateLimit(key=limit[0], per_minute=limit[1], burst=limit[2])
+                    for limit in limits]
+            for route, limits in rules.items()
+        }
+        self.store = store or create_bucket_store()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        limits = self.rules.get((scope["method"], scope["path"]))
+        if not limits:
+            return await self.app(scope, receive, send)
+
+        email = None
+        if any(limit.key == "email" for limit in limits):
+            receive, body = await _buffer_body(receive)
+            email = _email_from_body(body)
+
+        route = f"{scope['method']}:{scope['path']}"
+        for limit in limits:
+            identity = _client_ip(scope) if limit.key == "ip" else email
+            if not identity:
+                continue
+            allowed, retry_after = await self.store.take(f"{route}:{limit.key}:{identity}", limit.rate, limit.burst)
+            if not allowed:
+                return await _reject(send, retry_after)
+
+        return await self.app(scope, receive, send)
+
+
+def _client_ip(scope) -> Optional[str]:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+async def _buffer_body(receive):
+    """Read the request body and return a receive callable that replays it"""
+    messages, size = [], 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        size += len(message.get("body", b""))
+        if not message.get("more_body", False) or size > MAX_INSPECTED_BODY:
+            break
+
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.request")
+    pending = iter(messages)
+
+    async def replay():
+        for message in pending:
+            return message
+        return await receive()
+
+    return replay, body if size <= MAX_INSPECTED_BODY else b""
+
+
+def _email_from_body(body: bytes) -> Optional[str]:
+    try:
+        email = json.loads(body).get("email")
+    except (ValueError, AttributeError):
+        return None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+async def _reject(send, retry_after: float):
+    body = json.dumps({"detail": "Too many requests, please slow down"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, int(retry_after + 0.999))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
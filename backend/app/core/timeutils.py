@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def naive_utc(value: Optional[datetime] = None) -> datetime:
+    """Mongo hands back naive UTC datetimes; compare everything that way. None means now."""
+    if value is None:
+        return datetime.utcnow()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -2,19 +2,59 @@ from fastapi import FastAPI
 from app.core.db import init_db
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import include_all_routers
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.services.auth_service.config import AUTH_RATE_LIMITS
+from app.services.resume.config import RESUME_BODY_LIMITS
+from app.services.resume import resume_storage
+from app.services.auth_service.utils.password_hash import password_hash_pool
+from app.services.auth_service.services.token_revocation import token_revocation_store
+from app.services.auth_service.services.auth_utils import calibrate_password_hashing
+from app.services.application.services.application_counters import application_counters_reconciler
+from app.services.dashboard.services.dashboard_snapshots import dashboard_snapshot_refresher
+from app.services.analytics.services.tracker import job_view_tracker
+from app.services.analytics.services.unique_viewers import unique_viewer_counter
+from app.services.analytics.services.trending import trending_jobs
+from app.services.job.services.similar_jobs_updater import similar_jobs_updater
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 # ✅ Lifespan function to initialize DB
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await token_revocation_store.start()
+    await application_counters_reconciler.start()
+    await dashboard_snapshot_refresher.start()
+    await job_view_tracker.start()
+    await unique_viewer_counter.start()
+    await trending_jobs.start()
+    await similar_jobs_updater.start()
+    # Benchmarks bcrypt in the background so it does not delay readiness
+    calibration = asyncio.create_task(calibrate_password_hashing())
     yield
-    # Optional: cleanup logic can go here
+    calibration.cancel()
+    # Flush queued view events while the database is still reachable
+    await job_view_tracker.stop()
+    await unique_viewer_counter.stop()
+    await trending_jobs.stop()
+    await similar_jobs_updater.stop()
+    await application_counters_reconciler.stop()
+    await dashboard_snapshot_refresher.stop()
+    await token_revocation_store.stop()
+    await resume_storage.close()
+    password_hash_pool.shutdown()
 
 # ✅ Create the FastAPI app with lifespan
 app = FastAPI(lifespan=lifespan)
 
+# ✅ Rate limiting for credential endpoints (inside CORS so 429s stay readable)
+app.add_middleware(RateLimitMiddleware, rules=AUTH_RATE_LIMITS)
+
+# ✅ Upload size caps, checked before a multipart body is spooled
+app.add_middleware(BodySizeLimitMiddleware, limits=RESUME_BODY_LIMITS)
+
 # ✅ CORS configuration
 app.add_middleware(
     CORSMiddleware,
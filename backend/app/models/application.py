@@ -1,9 +1,10 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 
 class ApplicationStatus(str, Enum):
+    PENDING = "pending"
     SUBMITTED = "submitted"
     UNDER_REVIEW = "under_review"
     INTERVIEW_SCHEDULED = "interview_scheduled"
@@ -22,6 +23,7 @@ class ApplicationResponse(BaseModel):
     id: str
     job_id: str
     candidate_id: str
+    employer_id: Optional[str] = None
     status: ApplicationStatus
     cover_letter: Optional[str] = None
     resume_url: Optional[str] = None
@@ -32,6 +34,12 @@ class ApplicationResponse(BaseModel):
     # Job details for convenience
     job_title: Optional[str] = None
     company_name: Optional[str] = None
+    job_location: Optional[str] = None
+    job_status: Optional[str] = None
+
+class ApplicationPage(BaseModel):
+    items: List[ApplicationResponse]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
 
 class ApplicationUpdate(BaseModel):
     status: Optional[ApplicationStatus] = None
@@ -0,0 +1,4 @@
+from pydantic import BaseModel
+
+class JobStatusUpdate(BaseModel):
+    status: str  # "active", "closed" or "draft"
\ No newline at end of file
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+class SimilarJobResponse(BaseModel):
+    job_id: str
+    title: str
+    company: str
+    location: str
+    score: float
\ No newline at end of file
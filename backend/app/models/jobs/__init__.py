@@ -1,4 +1,6 @@
 from .JobCreate import JobCreate
 from .JobResponse import JobResponse
+from .JobStatusUpdate import JobStatusUpdate
+from .SimilarJobResponse import SimilarJobResponse
 
-__all__ = ["JobCreate", "JobResponse"]
\ No newline at end of file
+__all__ = ["JobCreate", "JobResponse", "JobStatusUpdate", "SimilarJobResponse"]
\ No newline at end of file
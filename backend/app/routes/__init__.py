@@ -3,6 +3,8 @@
 from fastapi import FastAPI
 from app.routes import auth, jobs, resume, dashboard
 from app.services.job.routes import job_routes
+from app.services.application.routes import application_routes
+from app.services.analytics.routes import analytics_routes
 
 def include_all_routers(app: FastAPI):
     app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
@@ -10,3 +12,5 @@ def include_all_routers(app: FastAPI):
     app.include_router(resume.router, prefix="/api/resume", tags=["Resume"])
     app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
     app.include_router(job_routes.router, prefix="/api/jobs", tags=["jobs"])
+    app.include_router(application_routes.router, prefix="/api/applications", tags=["Applications"])
+    app.include_router(analytics_routes.router, prefix="/api/analytics", tags=["Analytics"])
@@ -1,9 +1,11 @@
 #backend/app/routes/auth.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from app.services.auth_service.services.auth_handlers import signup_user, login_user
 from app.services.auth_service.services.firebase_auth_handlers import handle_firebase_auth, link_firebase_account
-from app.services.auth_service.services.jwt_handler import get_current_user
+from app.services.auth_service.config import METRICS_ADMIN_USER_IDS
+from app.services.auth_service.services.jwt_handler import get_current_principal, get_current_user, revoke_access_token
+from app.services.auth_service.utils.password_hash import password_hash_pool
 from app.models.auth import UserSignup, UserLogin, UserResponse, FirebaseAuthRequest, FirebaseLinkRequest
 
 
@@ -31,6 +33,17 @@ async def link_firebase(payload: FirebaseLinkRequest, user=Depends(get_current_u
 async def me(user=Depends(get_current_user)):
     return user
 
+@router.get("/metrics/password-hashing")
+async def password_hashing_metrics(user=Depends(get_current_principal)):
+    """Queue depth, throughput and shed count of the password-hash pool; operators only"""
+    if user["id"] not in METRICS_ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="Not authorized to view metrics")
+    return password_hash_pool.stats()
+
 @router.post("/logout")
-async def logout():
+async def logout(request: Request):
+    """Revoke the bearer token, if any, for the rest of its lifetime"""
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        await revoke_access_token(auth_header.split(" ")[1])
     return {"detail": "Logged out"}
@@ -1,23 +1,27 @@
 # backend/app/routes/dashboard.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from app.services.auth_service.services.jwt_handler import get_current_principal
+from app.services.dashboard.models.dashboard import DashboardResponse
 from app.services.dashboard.services.candidate_widgets import get_candidate_summary
-from app.services.dashboard.services.employer_widgets import get_employer_summary
+from app.services.dashboard.services.employer_widgets import get_employer_summary, recent_applications as load_recent_applications
 
 router = APIRouter()
 
-@router.get("/candidate")
-async def stats_candidate():
-    return await get_candidate_summary()
+@router.get("/candidate", response_model=DashboardResponse)
+async def stats_candidate(user=Depends(get_current_principal)):
+    if user["role"] != "candidate":
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    return await get_candidate_summary(user["id"])
+
+@router.get("/employer", response_model=DashboardResponse)
+async def stats_employer(user=Depends(get_current_principal)):
+    if user["role"] != "employer":
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    return await get_employer_summary(user["id"])
 
-@router.get("/employer")
-async def stats_employer():
-    return await get_employer_summary()
 @router.get("/employer/recent-applications")
-async def recent_applications():
-    return {
-        "recent_applications": [
-            {"candidate": "John Doe", "job_title": "UX Designer", "status": "Pending"},
-            {"candidate": "Ayesha Khan", "job_title": "Backend Dev", "status": "Interview Scheduled"},
-        ]
-    }
\ No newline at end of file
+async def recent_applications(user=Depends(get_current_principal)):
+    if user["role"] != "employer":
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    return {"recent_applications": await load_recent_applications(user["id"])}
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from app.models.favorite import FavoriteCreate, FavoriteResponse, FavoriteDelete
 from app.services.auth_service.services.jwt_handler import get_current_user
 from typing import List
+from app.core import events
 import uuid
 from datetime import datetime
 
@@ -28,6 +29,7 @@ async def add_favorite(payload: FavoriteCreate, current_user=Depends(get_current
     }
     
     favorites_db.append(favorite)
+    await events.publish(events.FAVORITE_EVENTS, [{"type": "added", "user_id": user_id, "job_id": payload.job_id}])
     return FavoriteResponse(**favorite)
 
 @router.delete("/{job_id}")
@@ -37,6 +39,7 @@ async def remove_favorite(job_id: str, current_user=Depends(get_current_user)):
     
     global favorites_db
     favorites_db = [f for f in favorites_db if not (f["user_id"] == user_id and f["job_id"] == job_id)]
+    await events.publish(events.FAVORITE_EVENTS, [{"type": "removed", "user_id": user_id, "job_id": job_id}])
     
     return {"message": "Favorite removed successfully"}
 
@@ -1,9 +1,9 @@
 # /backend/app/routes/jobs.py
 from fastapi import APIRouter, Depends, HTTPException
-from app.models.jobs import JobCreate, JobResponse
-from app.services.auth_service.services.jwt_handler import get_current_user
+from app.models.jobs import JobCreate, JobResponse, JobStatusUpdate, SimilarJobResponse
+from app.services.auth_service.services.jwt_handler import get_current_principal
 
-from app.services.job import list_jobs, get_job, create_job, apply_to_job
+from app.services.job import list_jobs, get_job, create_job, update_job_status, apply_to_job, get_similar_jobs
 from app.services.job.routes import job_routes as job_service_router
 
 router = APIRouter()
@@ -18,14 +18,25 @@ async def get_jobs():
 async def get_single_job(job_id: str):
     return await get_job(job_id)
 
+@router.get("/{job_id}/similar", response_model=list[SimilarJobResponse])
+async def get_job_similar(job_id: str):
+    return await get_similar_jobs(job_id)
+
 @router.post("/", response_model=JobResponse)
-async def post_job(payload: JobCreate, current_user=Depends(get_current_user)):
+async def post_job(payload: JobCreate, current_user=Depends(get_current_principal)):
     # Check if user is an employer
     if current_user.get("role") != "employer":
         raise HTTPException(status_code=403, detail="Only employers can post jobs")
     
     return await create_job(payload, current_user["id"])
 
+@router.put("/{job_id}/status", response_model=JobResponse)
+async def put_job_status(job_id: str, payload: JobStatusUpdate, current_user=Depends(get_current_principal)):
+    if current_user.get("role") != "employer":
+        raise HTTPException(status_code=403, detail="Only employers can update jobs")
+    
+    return await update_job_status(job_id, payload.status, current_user["id"])
+
 @router.post("/{job_id}/apply")
 async def apply_job(job_id: str, application_data: dict):
     return await apply_to_job(job_id, application_data)
@@ -1,17 +1,43 @@
-from fastapi import APIRouter, UploadFile, File
-from app.services.resume import upload_resume, list_resumes
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import FileResponse, RedirectResponse
+from app.services.auth_service.services.jwt_handler import get_current_principal, get_optional_principal
+from app.services.resume import (
+    upload_resume,
+    list_resumes,
+    create_direct_upload,
+    complete_direct_upload,
+    get_resume_download,
+)
+from app.services.resume.models.resume import DirectUploadComplete, DirectUploadRequest
 
 router = APIRouter()
 
 @router.post("/upload")
-async def upload(file: UploadFile = File(...)):
-    file_data = {
-        "filename": file.filename,
-        "content_type": file.content_type,
-        "content": await file.read()
-    }
-    return await upload_resume(file_data)
+async def upload(file: UploadFile = File(...), user=Depends(get_optional_principal)):
+    # Never read the whole upload into memory; the service streams it to disk
+    return await upload_resume(file, user["id"] if user else None)
+
+@router.post("/upload-url")
+async def upload_url(payload: DirectUploadRequest):
+    # The client PUTs the file to object storage itself, then calls /complete
+    return await create_direct_upload(payload.filename, payload.content_type, payload.size, payload.sha256)
+
+@router.post("/complete")
+async def complete_upload(payload: DirectUploadComplete, user=Depends(get_optional_principal)):
+    return await complete_direct_upload(payload.upload_id, payload.filename, user["id"] if user else None)
 
 @router.get("/")
 async def get_uploaded(user_id: int):
     return await list_resumes(str(user_id))
+
+@router.get("/{resume_id}/download")
+async def download(resume_id: str, user=Depends(get_current_principal)):
+    target = await get_resume_download(resume_id, user)
+    if "url" in target:
+        # Served by the object store; the API only signs the link
+        return RedirectResponse(target["url"], status_code=307)
+    if not os.path.isfile(target["path"]):
+        raise HTTPException(status_code=404, detail="Resume file not found")
+    return FileResponse(target["path"], media_type=target["content_type"], filename=target["filename"])
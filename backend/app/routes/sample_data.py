@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 from app.services.job.models.job import Job, EmploymentType, JobStatus
 from app.services.auth_service.models.user import User
-from app.services.auth_service.services.auth_utils import hash_password
+from app.services.auth_service.services.auth_utils import hash_password_async
 from datetime import datetime, timedelta
 import random
 
@@ -47,7 +47,7 @@ async def create_sample_data():
                 email=user_data["email"],
                 full_name=user_data["full_name"],
                 role=user_data["role"],
-                hashed_password=hash_password(user_data["password"])
+                hashed_password=await hash_password_async(user_data["password"])
             )
             await user.insert()
             created_users.append(str(user.id))
@@ -0,0 +1,40 @@
+# app/services/analytics/config.py
+
+import os
+
+# View/click events held in memory before new ones are shed
+ANALYTICS_QUEUE_MAX_EVENTS = int(os.getenv("ANALYTICS_QUEUE_MAX_EVENTS", "100000"))
+
+# A flush writes at most this many events and runs when this many are
+# waiting or the interval elapses, whichever comes first
+ANALYTICS_FLUSH_BATCH_SIZE = int(os.getenv("ANALYTICS_FLUSH_BATCH_SIZE", "1000"))
+ANALYTICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("ANALYTICS_FLUSH_INTERVAL_SECONDS", "1.0"))
+
+# Most events accepted in one ingestion request
+ANALYTICS_MAX_EVENTS_PER_REQUEST = int(os.getenv("ANALYTICS_MAX_EVENTS_PER_REQUEST", "500"))
+
+# How long minute and hour rollups are kept; day rollups are kept forever
+ANALYTICS_MINUTE_ROLLUP_RETENTION_HOURS = int(os.getenv("ANALYTICS_MINUTE_ROLLUP_RETENTION_HOURS", "48"))
+ANALYTICS_HOUR_ROLLUP_RETENTION_DAYS = int(os.getenv("ANALYTICS_HOUR_ROLLUP_RETENTION_DAYS", "90"))
+
+# Unique-viewer sketches: 2 ** 14 registers gives ~0.8% standard error
+ANALYTICS_HLL_PRECISION = int(os.getenv("ANALYTICS_HLL_PRECISION", "14"))
+ANALYTICS_SKETCH_FLUSH_INTERVAL_SECONDS = int(os.getenv("ANALYTICS_SKETCH_FLUSH_INTERVAL_SECONDS", "10"))
+
+# Trending jobs: scores halve every half-life; an application counts as
+# this many views
+TRENDING_HALF_LIFE_SECONDS = int(os.getenv("TRENDING_HALF_LIFE_SECONDS", str(6 * 3600)))
+TRENDING_APPLY_WEIGHT = float(os.getenv("TRENDING_APPLY_WEIGHT", "5"))
+TRENDING_TOP_K = int(os.getenv("TRENDING_TOP_K", "100"))
+TRENDING_SNAPSHOT_INTERVAL_SECONDS = int(os.getenv("TRENDING_SNAPSHOT_INTERVAL_SECONDS", "10"))
+
+# Raw view events older than this many days move to the columnar archive
+ANALYTICS_ARCHIVE_AFTER_DAYS = int(os.getenv("ANALYTICS_ARCHIVE_AFTER_DAYS", "30"))
+ANALYTICS_ARCHIVE_DIR = os.getenv("ANALYTICS_ARCHIVE_DIR", "archive/analytics")
+# Views are moved a batch at a time, so memory stays bounded however busy a day was
+ANALYTICS_ARCHIVE_BATCH_SIZE = int(os.getenv("ANALYTICS_ARCHIVE_BATCH_SIZE", "50000"))
+
+# Funnel reports are cached per scope; updates on this worker drop the
+# entry at once, other workers' updates show within the TTL
+FUNNEL_REPORT_CACHE_TTL_SECONDS = int(os.getenv("FUNNEL_REPORT_CACHE_TTL_SECONDS", "60"))
+FUNNEL_REPORT_CACHE_MAX_SIZE = int(os.getenv("FUNNEL_REPORT_CACHE_MAX_SIZE", "10000"))
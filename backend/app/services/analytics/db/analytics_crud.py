@@ -0,0 +1,41 @@
+# app/services/analytics/db/analytics_crud.py
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from pymongo import UpdateOne
+
+from app.services.analytics.models.analytics import AnalyticsRollup
+
+# (scope, scope_id, granularity, bucket_start) -> {counter: delta}
+RollupDeltas = Dict[Tuple[str, str, str, datetime], Dict[str, int]]
+
+
+async def apply_rollup_deltas(deltas: RollupDeltas, expiry: Dict[str, timedelta]) -> None:
+    """One $inc upsert per touched bucket, sent as a single unordered bulk write"""
+    operations = []
+    for (scope, scope_id, granularity, bucket_start), counts in deltas.items():
+        update = {"$inc": {f"counts.{name}": value for name, value in counts.items()}}
+        if granularity in expiry:
+            update["$setOnInsert"] = {"expires_at": bucket_start + expiry[granularity]}
+        operations.append(UpdateOne(
+            {"scope": scope, "scope_id": scope_id, "granularity": granularity, "bucket_start": bucket_start},
+            update,
+            upsert=True,
+        ))
+    if operations:
+        await AnalyticsRollup.get_motor_collection().bulk_write(operations, ordered=False)
+
+
+async def get_rollups(scope: str, scope_id: str, granularity: str, start: datetime, end: datetime) -> List[dict]:
+    """Buckets in [start, end), oldest first; served by the unique index"""
+    cursor = AnalyticsRollup.get_motor_collection().find(
+        {
+            "scope": scope,
+            "scope_id": scope_id,
+            "granularity": granularity,
+            "bucket_start": {"$gte": start, "$lt": end},
+        },
+        projection={"_id": 0, "bucket_start": 1, "counts": 1},
+    ).sort("bucket_start", 1)
+    return await cursor.to_list(None)
@@ -0,0 +1,49 @@
+# app/services/analytics/eventhandlers/job_view_events.py
+
+from datetime import datetime
+from typing import List, Optional
+
+from app.core import events
+from app.services.analytics.models.analytics import JobViewIn
+from app.services.analytics.services import insights_aggregator
+from app.services.analytics.services.unique_viewers import unique_viewer_counter
+from app.services.analytics.services.trending import trending_jobs
+from app.services.application.db.job_permission_check import get_job_owner
+
+
+async def to_events(views: List[JobViewIn], viewer_id: Optional[str]) -> List[dict]:
+    """Raw event documents for the tracker, stamped with the job's employer.
+
+    The employer lookup is cached, so a page view costs no database read.
+    """
+    now = datetime.utcnow()
+    owners = {}
+    for job_id in {view.job_id for view in views}:
+        job = await get_job_owner(job_id)
+        owners[job_id] = job.employer_id if job else None
+
+    return [
+        {
+            "job_id": view.job_id,
+            "employer_id": owners[view.job_id],
+            "viewer_id": viewer_id,
+            "session_id": view.session_id,
+            "kind": view.kind.value,
+            "source": view.source,
+            "at": now,
+        }
+        for view in views
+        if owners[view.job_id] is not None  # unknown jobs are not worth storing
+    ]
+
+
+async def on_job_views_flushed(batch: List[dict]) -> None:
+    """Fold every batch the tracker wrote into the rollups, viewer sketches and trending scores"""
+    unique_viewer_counter.record(batch)
+    for event in batch:
+        if event.get("kind", "view") == "view":
+            trending_jobs.record(event["job_id"])
+    await insights_aggregator.record_job_views(batch)
+
+
+events.subscribe(events.JOB_VIEW_EVENTS, on_job_views_flushed)
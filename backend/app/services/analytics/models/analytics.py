@@ -0,0 +1,113 @@
+# app/services/analytics/models/analytics.py
+
+from beanie import Document
+from pydantic import BaseModel, Field
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional
+from pymongo import ASCENDING, IndexModel
+
+class JobEventKind(str, Enum):
+    VIEW = "view"
+    CLICK = "click"  # e.g. the apply button or an external link on the job page
+
+class JobViewIn(BaseModel):
+    job_id: str
+    kind: JobEventKind = JobEventKind.VIEW
+    session_id: Optional[str] = Field(None, max_length=128)
+    source: Optional[str] = Field(None, max_length=64)  # "search", "similar_jobs", ...
+
+class JobViewBatch(BaseModel):
+    events: List[JobViewIn]
+
+class JobViewEvent(Document):
+    """Raw view/click event, written in batches by the tracker"""
+    job_id: str
+    employer_id: Optional[str] = None
+    viewer_id: Optional[str] = None
+    session_id: Optional[str] = None
+    kind: JobEventKind = JobEventKind.VIEW
+    source: Optional[str] = None
+    at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "job_view_events"
+        indexes = [
+            IndexModel([("job_id", ASCENDING), ("at", ASCENDING)]),
+        ]
+
+class RollupGranularity(str, Enum):
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"  # starts on Monday
+    MONTH = "month"
+
+class AnalyticsRollup(Document):
+    """Event counts of one scope (a job, an employer or the whole platform) in one time bucket"""
+    scope: str  # "job", "employer" or "platform"
+    scope_id: str  # job or employer id; "" for the platform
+    granularity: RollupGranularity
+    bucket_start: datetime
+    counts: Dict[str, int] = Field(default_factory=dict)
+    expires_at: Optional[datetime] = None  # fine-grained buckets are dropped by a TTL index
+
+    class Settings:
+        name = "analytics_rollups"
+        indexes = [
+            IndexModel(
+                [("scope", ASCENDING), ("scope_id", ASCENDING), ("granularity", ASCENDING), ("bucket_start", ASCENDING)],
+                unique=True,
+            ),
+            IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+        ]
+
+class UniqueViewerSketch(Document):
+    """HyperLogLog of the viewers of one scope on one day"""
+    scope: str  # "job", "employer" or "platform"
+    scope_id: str
+    day: datetime
+    registers: bytes  # HyperLogLog.to_bytes()
+    version: int = 0  # compare-and-swap guard for concurrent merges
+
+    class Settings:
+        name = "unique_viewer_sketches"
+        indexes = [
+            IndexModel([("scope", ASCENDING), ("scope_id", ASCENDING), ("day", ASCENDING)], unique=True),
+        ]
+
+class TrendingEntry(BaseModel):
+    job_id: str
+    score: float
+
+class TrendingSnapshot(Document):
+    """One worker's current top-K, merged with the other workers' on read"""
+    worker_id: str
+    items: List[TrendingEntry] = []
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "trending_snapshots"
+        indexes = [
+            IndexModel([("worker_id", ASCENDING)], unique=True),
+            # Workers that stopped reporting drop out on their own
+            IndexModel([("updated_at", ASCENDING)], expireAfterSeconds=3600),
+        ]
+
+class FunnelStats(Document):
+    """All-time hiring funnel of one scope: stage counts, transitions and duration histograms"""
+    scope: str  # "job", "employer" or "platform"
+    scope_id: str
+    entered: Dict[str, int] = Field(default_factory=dict)  # applications that reached each stage
+    transitions: Dict[str, Dict[str, int]] = Field(default_factory=dict)  # from stage -> to stage -> count
+    # metric (a stage, or "time_to_hire") -> log-scale bucket -> count, plus summed seconds for means
+    durations: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+    duration_seconds: Dict[str, float] = Field(default_factory=dict)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    rebuilt_at: Optional[datetime] = None
+
+    class Settings:
+        name = "funnel_stats"
+        indexes = [
+            IndexModel([("scope", ASCENDING), ("scope_id", ASCENDING)], unique=True),
+        ]
@@ -1,61 +1,157 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from app.services.analytics.config import ANALYTICS_MAX_EVENTS_PER_REQUEST
+from app.services.analytics.eventhandlers.job_view_events import to_events
+from app.services.analytics.models.analytics import JobViewBatch
+from app.services.analytics.services.tracker import job_view_tracker
+from app.services.analytics.services import hiring_funnel, insights_aggregator
+from app.services.analytics.services.unique_viewers import unique_viewer_counter
+from app.services.analytics.services.trending import trending_jobs
+from app.services.analytics.models.analytics import RollupGranularity
+from app.services.application.db.job_permission_check import get_job_owner
+from app.core.timeutils import naive_utc
+from datetime import datetime, timedelta
+from typing import Optional
+from app.services.auth_service.config import METRICS_ADMIN_USER_IDS
+from app.services.auth_service.services.jwt_handler import get_current_principal, get_optional_principal
 
 router = APIRouter()
 
-@router.get("/jobs")
-async def get_job_analytics():
-    """Get job analytics data"""
+DEFAULT_RANGE = timedelta(days=7)
+
+
+class InsightsQuery:
+    """Common query parameters: time range, optional granularity and scope"""
+
+    def __init__(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        granularity: Optional[RollupGranularity] = None,
+        scope: str = Query(insights_aggregator.PLATFORM, pattern="^(platform|employer|job)$"),
+        job_id: Optional[str] = None,
+    ):
+        # Aware timestamps (e.g. ...Z) are converted; rollups are stored as naive UTC
+        self.end = naive_utc(end)
+        self.start = naive_utc(start) if start else self.end - DEFAULT_RANGE
+        if self.start >= self.end:
+            raise HTTPException(status_code=400, detail="start must be before end")
+        self.granularity = granularity.value if granularity else None
+        if self.granularity is None:
+            try:
+                self.granularity = insights_aggregator.pick_granularity(self.start, self.end)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            buckets = (self.end - self.start) / insights_aggregator.GRANULARITY_STEP[self.granularity]
+            if buckets > insights_aggregator.MAX_BUCKETS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Range needs more than {insights_aggregator.MAX_BUCKETS} {self.granularity} buckets; "
+                           "use a coarser granularity",
+                )
+        self.scope = scope
+        self.job_id = job_id
+
+
+class ScopeQuery:
+    """Scope only, for all-time reports"""
+
+    def __init__(
+        self,
+        scope: str = Query(insights_aggregator.PLATFORM, pattern="^(platform|employer|job)$"),
+        job_id: Optional[str] = None,
+    ):
+        self.scope = scope
+        self.job_id = job_id
+
+
+async def _scope_id(query, user: Optional[dict]) -> str:
+    """Platform figures are public; employer and job figures only to their owner"""
+    if query.scope == insights_aggregator.PLATFORM:
+        return ""
+    if not user or user["role"] != "employer":
+        raise HTTPException(status_code=403, detail="Only employers can view these analytics")
+    if query.scope == insights_aggregator.EMPLOYER:
+        return user["id"]
+    job = await get_job_owner(query.job_id) if query.job_id else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.employer_id != user["id"]:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    return query.job_id
+
+
+async def _insights(query: InsightsQuery, user: Optional[dict]) -> dict:
+    scope_id = await _scope_id(query, user)
+    return await insights_aggregator.get_insights(query.scope, scope_id, query.start, query.end, query.granularity)
+
+
+def _only(insights: dict, *prefixes: str) -> dict:
+    """Keep the counters of one report (e.g. views and clicks for /jobs)"""
+    keep = lambda counts: {k: v for k, v in counts.items() if k.startswith(prefixes)}
     return {
-        "total_jobs": 150,
-        "active_jobs": 120,
-        "jobs_this_month": 25,
-        "top_categories": [
-            {"category": "Technology", "count": 45},
-            {"category": "Finance", "count": 32},
-            {"category": "Healthcare", "count": 28},
-            {"category": "Marketing", "count": 22},
-            {"category": "Education", "count": 18}
-        ],
-        "employment_types": [
-            {"type": "Full-time", "count": 85},
-            {"type": "Part-time", "count": 25},
-            {"type": "Contract", "count": 30},
-            {"type": "Freelance", "count": 10}
-        ]
+        **insights,
+        "totals": keep(insights["totals"]),
+        "series": [{**point, "counts": keep(point["counts"])} for point in insights["series"]],
     }
 
+@router.post("/events", status_code=202)
+async def track_job_events(batch: JobViewBatch, user=Depends(get_optional_principal)):
+    """Queue job view/click events; they are written in the background"""
+    if len(batch.events) > ANALYTICS_MAX_EVENTS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"At most {ANALYTICS_MAX_EVENTS_PER_REQUEST} events per request")
+    if job_view_tracker.saturated:
+        # Tell well-behaved clients to back off instead of queueing more
+        return JSONResponse(status_code=503, content={"detail": "Event queue is full"}, headers={"Retry-After": "1"})
+
+    tracked = await to_events(batch.events, user["id"] if user else None)
+    accepted = job_view_tracker.track_many(tracked)
+    return {"accepted": accepted, "dropped": len(tracked) - accepted}
+
+@router.get("/trending")
+async def get_trending_jobs(limit: int = Query(10, ge=1, le=100)):
+    """Trending active jobs from the latest snapshot (refreshed every few seconds)"""
+    return trending_jobs.feed(limit)
+
+@router.get("/tracker")
+async def get_tracker_stats(user=Depends(get_current_principal)):
+    """Queue depth, throughput and shed counts of the view tracker; operators only"""
+    if user["id"] not in METRICS_ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="Not authorized to view metrics")
+    return job_view_tracker.stats()
+
+@router.get("/jobs")
+async def get_job_analytics(query: InsightsQuery = Depends(), user=Depends(get_optional_principal)):
+    """Jobs posted, views, clicks and unique viewers over a time range"""
+    insights = _only(await _insights(query, user), "jobs_posted", "views", "clicks")
+    # Sketches are daily, so this covers whole days around the range
+    insights["unique_viewers"] = await unique_viewer_counter.count(
+        insights["scope"], insights["scope_id"] or "", insights["start"], insights["end"]
+    )
+    return insights
+
 @router.get("/applications")
-async def get_application_analytics():
-    """Get application analytics data"""
-    return {
-        "total_applications": 1250,
-        "applications_this_month": 180,
-        "conversion_rate": 12.5,
-        "average_time_to_hire": 18,
-        "status_breakdown": [
-            {"status": "Submitted", "count": 450},
-            {"status": "Under Review", "count": 320},
-            {"status": "Interview Scheduled", "count": 180},
-            {"status": "Interviewed", "count": 120},
-            {"status": "Accepted", "count": 80},
-            {"status": "Rejected", "count": 100}
-        ]
-    }
+async def get_application_analytics(query: InsightsQuery = Depends(), user=Depends(get_optional_principal)):
+    """Applications and status transitions over a time range"""
+    insights = _only(await _insights(query, user), "applications", "transitions.")
+    applications = insights["totals"].get("applications", 0)
+    accepted = insights["totals"].get("transitions.accepted", 0)
+    insights["conversion_rate"] = round(100 * accepted / applications, 2) if applications else 0.0
+    # Durations come from the all-time funnel, not just this range
+    funnel = await hiring_funnel.get_funnel_report(query.scope, insights["scope_id"] or "")
+    insights["average_time_to_hire"] = funnel[hiring_funnel.TIME_TO_HIRE]["mean_seconds"]
+    insights["time_to_hire"] = funnel[hiring_funnel.TIME_TO_HIRE]
+    return insights
+
+@router.get("/funnel")
+async def get_hiring_funnel(query: ScopeQuery = Depends(), user=Depends(get_optional_principal)):
+    """All-time stage conversion, time-in-stage and time-to-hire percentiles"""
+    return await hiring_funnel.get_funnel_report(query.scope, await _scope_id(query, user))
 
 @router.get("/users")
-async def get_user_analytics():
-    """Get user analytics data"""
-    return {
-        "total_users": 2500,
-        "active_users": 1800,
-        "new_users_this_month": 250,
-        "user_types": [
-            {"type": "Candidates", "count": 2000},
-            {"type": "Employers", "count": 500}
-        ],
-        "user_activity": [
-            {"metric": "Daily Active Users", "value": 650},
-            {"metric": "Weekly Active Users", "value": 1200},
-            {"metric": "Monthly Active Users", "value": 1800}
-        ]
-    }
\ No newline at end of file
+async def get_user_analytics(query: InsightsQuery = Depends(), user=Depends(get_optional_principal)):
+    """Signups per role and logins over a time range (platform only)"""
+    if query.scope != insights_aggregator.PLATFORM:
+        raise HTTPException(status_code=400, detail="User analytics are platform-wide")
+    return _only(await _insights(query, user), "signups.", "logins")
@@ -0,0 +1,272 @@
+# app/services/analytics/services/event_archive.py
+
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.services.analytics.config import (
+    ANALYTICS_ARCHIVE_AFTER_DAYS,
+    ANALYTICS_ARCHIVE_BATCH_SIZE,
+    ANALYTICS_ARCHIVE_DIR,
+)
+from app.services.analytics.models.analytics import JobViewEvent
+from app.services.application.models.application_event import ApplicationEventBucket
+
+# Every dataset has an "at" timestamp column plus dictionary-encoded string
+# columns: int32 codes into a per-partition array of distinct values (-1 = null).
+DATASETS = {
+    "job_views": ["job_id", "employer_id", "viewer_id", "session_id", "kind", "source"],
+    "application_events": ["type", "application_id", "candidate_id", "job_id", "employer_id", "from_status", "to_status"],
+}
+
+# Datasets moved out of Mongo keep each row's ObjectId (12 raw bytes), so
+# rows archived before a crash are recognised and not appended twice
+IDENTIFIED = {"job_views"}
+
+# Pseudo-columns that group_by understands besides the stored ones
+TIME_GROUPS = {"day": 86_400_000, "hour": 3_600_000}
+
+_EPOCH = datetime(1970, 1, 1)
+_DAY = timedelta(days=1)
+
+
+def _to_ms(value: datetime) -> int:
+    return int((value - _EPOCH) / timedelta(milliseconds=1))
+
+
+def _encode(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    present = np.array([value is not None for value in values], dtype=bool)
+    codes = np.full(len(values), -1, dtype=np.int32)
+    dictionary = np.array([], dtype=str)
+    if present.any():
+        dictionary, inverse = np.unique(
+            np.array([str(value) for value in values if value is not None]), return_inverse=True
+        )
+        codes[present] = inverse
+    return codes, dictionary
+
+
+class _Partition:
+    """One day of one dataset, loaded fully into memory (a few MB per million rows)"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.at = arrays["at"]
+        self.codes = {name[:-6]: array for name, array in arrays.items() if name.endswith("_codes")}
+        self.dictionaries = {name[:-5]: array for name, array in arrays.items() if name.endswith("_dict")}
+        self.ids = arrays.get("ids", np.array([], dtype="S12"))
+
+    def __len__(self) -> int:
+        return len(self.at)
+
+    def decode(self, column: str) -> np.ndarray:
+        """Column as a string array; nulls become empty strings"""
+        dictionary = np.append(self.dictionaries[column], "")  # code -1 indexes the trailing ""
+        return dictionary[self.codes[column]]
+
+    def mask(self, start_ms: int, end_ms: int, where: Dict[str, Iterable[str]]) -> np.ndarray:
+        mask = (self.at >= start_ms) & (self.at < end_ms)
+        for column, wanted in where.items():
+            wanted_codes = np.flatnonzero(np.isin(self.dictionaries[column], list(wanted)))
+            mask &= np.isin(self.codes[column], wanted_codes)
+        return mask
+
+
+class EventArchive:
+    """Day-partitioned, compressed columnar files for aged analytics events.
+
+    Layout: ``<root>/<dataset>/<yyyy>/<yyyy-mm-dd>.npz``. Queries load only
+    the partitions in range and run as NumPy mask/unique operations, never
+    touching Mongo.
+    """
+
+    def __init__(self, root: str = ANALYTICS_ARCHIVE_DIR):
+        self.root = root
+
+    def _path(self, dataset: str, day: date) -> str:
+        return os.path.join(self.root, dataset, f"{day:%Y}", f"{day:%Y-%m-%d}.npz")
+
+    def has_partition(self, dataset: str, day: date) -> bool:
+        return os.path.exists(self._path(dataset, day))
+
+    def _load(self, dataset: str, day: date) -> Optional[_Partition]:
+        path = self._path(dataset, day)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as arrays:
+            return _Partition({name: arrays[name] for name in arrays.files})
+
+    def write_partition(self, dataset: str, day: date, rows: List[dict], append: bool = False) -> int:
+        """Write (or extend) one day; the file is swapped in atomically.
+
+        Returns the number of rows added. When appending to an identified
+        dataset, rows whose ``_id`` is already archived are skipped, so
+        replaying a batch is harmless.
+        """
+        columns = DATASETS[dataset]
+        existing = self._load(dataset, day) if append else None
+        identified = dataset in IDENTIFIED
+        if identified:
+            ids = np.array([row["_id"].binary for row in rows], dtype="S12")
+            if existing is not None and len(existing.ids):
+                fresh = ~np.isin(ids, existing.ids)
+                ids = ids[fresh]
+                rows = [row for row, keep in zip(rows, fresh) if keep]
+        added = len(rows)
+
+        at = np.array([_to_ms(row["at"]) for row in rows], dtype=np.int64)
+        values = {column: [row.get(column) for row in rows] for column in columns}
+        if existing is not None and len(existing):
+            if not added:
+                return 0
+            at = np.concatenate([existing.at, at])
+            if identified:
+                ids = np.concatenate([existing.ids, ids])
+            for column in columns:
+                old = existing.decode(column).tolist()
+                values[column] = [value or None for value in old] + values[column]
+
+        order = np.argsort(at, kind="stable")
+        arrays = {"at": at[order]}
+        if identified:
+            arrays["ids"] = ids[order]
+        for column in columns:
+            codes, dictionary = _encode(values[column])
+            arrays[f"{column}_codes"] = codes[order]
+            arrays[f"{column}_dict"] = dictionary
+
+        path = self._path(dataset, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.tmp.npz"
+        np.savez_compressed(temporary, **arrays)
+        os.replace(temporary, path)
+        return added
+
+    def _partitions(self, dataset: str, start: datetime, end: datetime):
+        day = start.date()
+        while datetime.combine(day, datetime.min.time()) < end:
+            partition = self._load(dataset, day)
+            if partition is not None and len(partition):
+                yield day, partition
+            day += _DAY
+
+    def count(
+        self,
+        dataset: str,
+        start: datetime,
+        end: datetime,
+        where: Optional[Dict[str, Iterable[str]]] = None,
+        group_by: Union[str, Sequence[str], None] = None,
+    ) -> Union[int, Dict[tuple, int]]:
+        """Event counts in [start, end), filtered and optionally grouped.
+
+        ``group_by`` takes stored columns and/or "day"/"hour"; grouped
+        results are keyed by a tuple of strings in the same order.
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        where = where or {}
+        if group_by is None:
+            return int(sum(partition.mask(start_ms, end_ms, where).sum() for _, partition in self._partitions(dataset, start, end)))
+
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by)
+        totals: Dict[tuple, int] = {}
+        for _, partition in self._partitions(dataset, start, end):
+            mask = partition.mask(start_ms, end_ms, where)
+            if not mask.any():
+                continue
+            keys = np.stack([
+                partition.at[mask] // TIME_GROUPS[column] if column in TIME_GROUPS else partition.codes[column][mask]
+                for column in group_by
+            ], axis=1)
+            unique_keys, counts = np.unique(keys, axis=0, return_counts=True)
+            for key, count in zip(unique_keys, counts):
+                label = tuple(self._label(partition, column, value) for column, value in zip(group_by, key))
+                totals[label] = totals.get(label, 0) + int(count)
+        return totals
+
+    @staticmethod
+    def _label(partition: _Partition, column: str, value) -> str:
+        if column in TIME_GROUPS:
+            moment = _EPOCH + timedelta(milliseconds=int(value) * TIME_GROUPS[column])
+            return moment.strftime("%Y-%m-%d" if column == "day" else "%Y-%m-%dT%H:00")
+        return "" if value < 0 else str(partition.dictionaries[column][value])
+
+    def frame(
+        self,
+        dataset: str,
+        start: datetime,
+        end: datetime,
+        columns: Sequence[str],
+        where: Optional[Dict[str, Iterable[str]]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Matching rows as decoded column arrays (``at`` as datetime64[ms]) for custom vectorized work"""
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        parts = {column: [] for column in ["at", *columns]}
+        for _, partition in self._partitions(dataset, start, end):
+            mask = partition.mask(start_ms, end_ms, where or {})
+            parts["at"].append(partition.at[mask])
+            for column in columns:
+                parts[column].append(partition.decode(column)[mask])
+        frame = {
+            column: np.concatenate(chunks) if chunks else np.array([], dtype=np.int64 if column == "at" else str)
+            for column, chunks in parts.items()
+        }
+        frame["at"] = frame["at"].astype("datetime64[ms]")
+        return frame
+
+
+async def archive_job_views(archive: EventArchive, now: Optional[datetime] = None) -> int:
+    """Move raw view events older than the retention window into the archive"""
+    now = now or datetime.utcnow()
+    cutoff = datetime.combine((now - timedelta(days=ANALYTICS_ARCHIVE_AFTER_DAYS)).date(), datetime.min.time())
+    collection = JobViewEvent.get_motor_collection()
+    oldest = await collection.find_one({"at": {"$lt": cutoff}}, sort=[("at", 1)], projection={"at": 1})
+    if oldest is None:
+        return 0
+
+    async def move(day: datetime, batch: List[dict]) -> int:
+        # Archived before deleting, and appends skip ids already archived, so
+        # a crash in between leaves rows in Mongo that the next run moves
+        # without duplicating them
+        archive.write_partition("job_views", day.date(), batch, append=True)
+        result = await collection.delete_many({"_id": {"$in": [row["_id"] for row in batch]}})
+        return result.deleted_count
+
+    moved = 0
+    day = datetime.combine(oldest["at"].date(), datetime.min.time())
+    while day < cutoff:
+        batch = []
+        cursor = collection.find({"at": {"$gte": day, "$lt": day + _DAY}}, batch_size=ANALYTICS_ARCHIVE_BATCH_SIZE)
+        async for row in cursor:
+            batch.append(row)
+            if len(batch) >= ANALYTICS_ARCHIVE_BATCH_SIZE:
+                moved += await move(day, batch)
+                batch = []
+        if batch:
+            moved += await move(day, batch)
+        day += _DAY
+    return moved
+
+
+async def export_application_events(archive: EventArchive, now: Optional[datetime] = None) -> int:
+    """Copy each finished day of the application event log into the archive.
+
+    The log itself stays in Mongo because application history is read from
+    it; the copy is what offline reports scan.
+    """
+    today = datetime.combine((now or datetime.utcnow()).date(), datetime.min.time())
+    collection = ApplicationEventBucket.get_motor_collection()
+    exported = 0
+    for day in sorted(await collection.distinct("bucket_start", {"bucket_start": {"$lt": today}})):
+        if archive.has_partition("application_events", day.date()):
+            continue  # past days never change once written
+        rows = []
+        async for bucket in collection.find({"bucket_start": day}, projection={"job_id": 1, "employer_id": 1, "events": 1}):
+            for event in bucket["events"]:
+                rows.append({**event, "job_id": bucket["job_id"], "employer_id": bucket.get("employer_id")})
+        exported += archive.write_partition("application_events", day.date(), rows)
+    return exported
+
+
+event_archive = EventArchive()
@@ -0,0 +1,331 @@
+# app/services/analytics/services/hiring_funnel.py
+
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.core import events
+from app.core.cache import TTLCache
+from app.core.timeutils import naive_utc
+from app.models.application import ApplicationStatus
+from app.services.analytics.config import FUNNEL_REPORT_CACHE_MAX_SIZE, FUNNEL_REPORT_CACHE_TTL_SECONDS
+from app.services.analytics.models.analytics import FunnelStats
+from app.services.analytics.services.insights_aggregator import EMPLOYER, JOB, PLATFORM
+from app.services.application.models.application_event import ApplicationEventBucket, ApplicationEventType
+from app.services.application.services.event_log import FUNNEL_STAGES
+
+TIME_TO_HIRE = "time_to_hire"
+HIRED = ApplicationStatus.ACCEPTED.value
+PERCENTILES = (50, 90, 95)
+
+# Durations are counted in log-scale buckets [GROWTH ** i, GROWTH ** (i + 1))
+# seconds, so percentiles are within ~5% whatever the spread. Stored
+# histograms depend on it: change it only together with a rebuild.
+GROWTH = 1.1
+_LOG_GROWTH = math.log(GROWTH)
+
+# (scope, scope_id) -> report
+_report_cache = TTLCache(maxsize=FUNNEL_REPORT_CACHE_MAX_SIZE, ttl=FUNNEL_REPORT_CACHE_TTL_SECONDS)
+
+HISTORY_COLUMNS = ["type", "application_id", "job_id", "employer_id", "from_status", "to_status"]
+
+
+def _bucket(seconds: float) -> int:
+    return int(math.log(max(seconds, 1.0)) / _LOG_GROWTH)
+
+
+def _scopes(job_id: Optional[str], employer_id: Optional[str]) -> List[Tuple[str, str]]:
+    scopes = [(PLATFORM, "")]
+    if employer_id:
+        scopes.append((EMPLOYER, employer_id))
+    if job_id:
+        scopes.append((JOB, job_id))
+    return scopes
+
+
+def _event_deltas(event: dict) -> Dict[str, float]:
+    event_type = event["type"]
+    if event_type == ApplicationEventType.APPLIED:
+        return {f"entered.{event['to_status']}": 1}
+    if event_type == ApplicationEventType.VIEWED:
+        return {f"entered.{ApplicationEventType.VIEWED.value}": 1} if event.get("first_view") else {}
+
+    source, target = event["from_status"], event["to_status"]
+    at = naive_utc(event["at"])
+    deltas = {f"entered.{target}": 1, f"transitions.{source}.{target}": 1}
+    if event.get("stage_entered_at"):
+        elapsed = max(0.0, (at - naive_utc(event["stage_entered_at"])).total_seconds())
+        deltas[f"durations.{source}.{_bucket(elapsed)}"] = 1
+        deltas[f"duration_seconds.{source}"] = elapsed
+    if target == HIRED and event.get("applied_at"):
+        elapsed = max(0.0, (at - naive_utc(event["applied_at"])).total_seconds())
+        deltas[f"durations.{TIME_TO_HIRE}.{_bucket(elapsed)}"] = 1
+        deltas[f"duration_seconds.{TIME_TO_HIRE}"] = elapsed
+    return deltas
+
+
+async def _on_application_events(batch: List[dict]) -> None:
+    """Fold new transitions into every scope they belong to, one write per scope"""
+    deltas: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(lambda: defaultdict(int))
+    for event in batch:
+        event_deltas = _event_deltas(event)
+        if not event_deltas:
+            continue
+        for scope in _scopes(event["job_id"], event.get("employer_id")):
+            for field, amount in event_deltas.items():
+                deltas[scope][field] += amount
+
+    if not deltas:
+        return
+    now = datetime.utcnow()
+    await FunnelStats.get_motor_collection().bulk_write([
+        UpdateOne(
+            {"scope": scope, "scope_id": scope_id},
+            {"$inc": dict(scope_deltas), "$set": {"updated_at": now}},
+            upsert=True,
+        )
+        for (scope, scope_id), scope_deltas in deltas.items()
+    ], ordered=False)
+    for scope in deltas:
+        _report_cache.pop(scope)
+
+
+events.subscribe(events.APPLICATION_EVENTS, _on_application_events)
+
+
+def _percentile(histogram: Dict[str, int], total: int, percentile: int) -> float:
+    rank = percentile / 100 * total
+    seen = 0
+    for bucket, count in sorted(((int(key), count) for key, count in histogram.items())):
+        seen += count
+        if seen >= rank:
+            return round(GROWTH ** (bucket + 0.5), 1)  # geometric middle of the bucket
+    return round(GROWTH ** (bucket + 0.5), 1)
+
+
+def _duration_summary(stats: FunnelStats, metric: str) -> dict:
+    histogram = stats.durations.get(metric, {})
+    count = sum(histogram.values())
+    summary = {"count": count, "mean_seconds": None, **{f"p{p}_seconds": None for p in PERCENTILES}}
+    if count:
+        summary["mean_seconds"] = round(stats.duration_seconds.get(metric, 0.0) / count, 1)
+        for p in PERCENTILES:
+            summary[f"p{p}_seconds"] = _percentile(histogram, count, p)
+    return summary
+
+
+def _report(scope: str, scope_id: str, stats: FunnelStats) -> dict:
+    applied = stats.entered.get(ApplicationStatus.PENDING.value, 0)
+    stages = []
+    for stage in FUNNEL_STAGES:
+        entered = stats.entered.get(stage, 0)
+        moved_to = stats.transitions.get(stage, {})
+        stages.append({
+            "stage": stage,
+            "entered": entered,
+            "conversion": round(entered / applied, 4) if applied else 0.0,
+            # Share of the applications that entered this stage and moved on to each next one
+            "next": {target: round(count / entered, 4) for target, count in moved_to.items() if count and entered},
+            "time_in_stage": _duration_summary(stats, stage),
+        })
+    return {
+        "scope": scope,
+        "scope_id": scope_id or None,
+        "applied": applied,
+        "hire_rate": round(stats.entered.get(HIRED, 0) / applied, 4) if applied else 0.0,
+        "stages": stages,
+        TIME_TO_HIRE: _duration_summary(stats, TIME_TO_HIRE),
+        "updated_at": stats.updated_at,
+    }
+
+
+async def get_funnel_report(scope: str, scope_id: str = "") -> dict:
+    """All-time conversion and time-in-stage percentiles of one scope, cached"""
+    cached = _report_cache.get((scope, scope_id))
+    if cached is not None:
+        return cached
+    stats = await FunnelStats.find_one(FunnelStats.scope == scope, FunnelStats.scope_id == scope_id)
+    report = _report(scope, scope_id, stats or FunnelStats(scope=scope, scope_id=scope_id))
+    _report_cache.set((scope, scope_id), report)
+    return report
+
+
+async def _load_history(archive) -> dict:
+    """The whole application event log as column arrays.
+
+    Days already exported are read from the columnar archive; only the
+    rest (normally today) is read from the Mongo buckets.
+    """
+    import numpy as np
+
+    collection = ApplicationEventBucket.get_motor_collection()
+    parts = {column: [] for column in ["at", *HISTORY_COLUMNS]}
+    for day in sorted(await collection.distinct("bucket_start")):
+        if archive.has_partition("application_events", day.date()):
+            frame = archive.frame("application_events", day, day + timedelta(days=1), HISTORY_COLUMNS)
+            for column, values in frame.items():
+                parts[column].append(values)
+            continue
+        rows = []
+        async for bucket in collection.find({"bucket_start": day}, projection={"job_id": 1, "employer_id": 1, "events": 1}):
+            for event in bucket["events"]:
+                rows.append({**event, "job_id": bucket["job_id"], "employer_id": bucket.get("employer_id")})
+        if rows:
+            parts["at"].append(np.array([row["at"] for row in rows], dtype="datetime64[ms]"))
+            for column in HISTORY_COLUMNS:
+                parts[column].append(np.array([row.get(column) or "" for row in rows], dtype=str))
+    return {
+        column: np.concatenate(chunks) if chunks else np.array([], dtype="datetime64[ms]" if column == "at" else str)
+        for column, chunks in parts.items()
+    }
+
+
+def _grouped(np, columns: list, weights=None):
+    """(labels, count, summed weight) per distinct combination of the columns.
+
+    Columns are (codes, labels) pairs; the codes are folded into one integer
+    key, so grouping is a single integer sort whatever the column count.
+    """
+    if not len(columns[0][0]):
+        return
+    dims = [len(labels) for _, labels in columns]
+    keys, inverse, counts = np.unique(
+        np.ravel_multi_index([codes for codes, _ in columns], dims), return_inverse=True, return_counts=True
+    )
+    sums = np.bincount(inverse, weights=weights, minlength=len(keys)) if weights is not None else None
+    for i, key in enumerate(zip(*np.unravel_index(keys, dims))):
+        yield (
+            tuple(str(labels[code]) for (_, labels), code in zip(columns, key)),
+            int(counts[i]),
+            float(sums[i]) if sums is not None else 0.0,
+        )
+
+
+def _duration_buckets(np, seconds):
+    buckets = np.floor(np.log(np.maximum(seconds, 1.0)) / _LOG_GROWTH).astype(np.int64)
+    return buckets, np.arange(buckets.max() + 1 if len(buckets) else 0)
+
+
+def compute_funnel_stats(history: dict) -> Dict[Tuple[str, str], dict]:
+    """Vectorized funnel totals of every scope from the raw event history.
+
+    Time in a stage is the gap to the application's previous status event,
+    so applications whose "applied" event predates the log only count from
+    their second transition on.
+    """
+    import numpy as np
+
+    # Dictionary-encode every string column once so the group-bys sort integers
+    labels, codes = {}, {}
+    for name in HISTORY_COLUMNS:
+        labels[name], codes[name] = np.unique(history[name], return_inverse=True)
+    column = lambda name, rows: (codes[name][rows], labels[name])
+    at = history["at"].astype("datetime64[ms]").astype(np.int64) / 1000.0
+    event_type = history["type"]
+
+    # Status events of each application in time order
+    moves = np.flatnonzero(event_type != ApplicationEventType.VIEWED.value)
+    moves = moves[np.lexsort((at[moves], codes["application_id"][moves]))]
+    applications = codes["application_id"][moves]
+    first = np.ones(len(moves), dtype=bool)
+    first[1:] = applications[1:] != applications[:-1]
+    starts = np.flatnonzero(first)
+
+    applied = event_type[moves] == ApplicationEventType.APPLIED.value
+    move_at = at[moves]
+    previous_at = np.full(len(moves), np.nan)
+    previous_at[1:] = np.where(first[1:], np.nan, move_at[:-1])
+    applied_at = np.where(applied[starts], move_at[starts], np.nan)[np.cumsum(first) - 1]
+
+    in_stage = move_at - previous_at
+    timed = ~applied & ~np.isnan(in_stage)
+    to_hire = move_at - applied_at
+    hired = ~applied & (history["to_status"][moves] == HIRED) & ~np.isnan(to_hire)
+
+    # First view of each application
+    views = np.flatnonzero(event_type == ApplicationEventType.VIEWED.value)
+    _, first_views = np.unique(codes["application_id"][views], return_index=True)
+    views = views[first_views]
+
+    stats: Dict[Tuple[str, str], dict] = defaultdict(lambda: {
+        "entered": defaultdict(int),
+        "transitions": defaultdict(lambda: defaultdict(int)),
+        "durations": defaultdict(lambda: defaultdict(int)),
+        "duration_seconds": defaultdict(float),
+    })
+    for scope, scope_column in ((PLATFORM, None), (EMPLOYER, "employer_id"), (JOB, "job_id")):
+        if scope_column is None:
+            owned = np.ones(len(at), dtype=bool)
+            scope_of = lambda rows: (np.zeros(len(rows), dtype=np.int64), np.array([""]))
+        else:
+            owned = history[scope_column] != ""
+            scope_of = lambda rows, name=scope_column: column(name, rows)
+
+        rows = moves[owned[moves]]
+        for (scope_id, stage), count, _ in _grouped(np, [scope_of(rows), column("to_status", rows)]):
+            stats[(scope, scope_id)]["entered"][stage] += count
+        rows = views[owned[views]]
+        for (scope_id,), count, _ in _grouped(np, [scope_of(rows)]):
+            stats[(scope, scope_id)]["entered"][ApplicationEventType.VIEWED.value] += count
+
+        rows = moves[~applied & owned[moves]]
+        grouped = _grouped(np, [scope_of(rows), column("from_status", rows), column("to_status", rows)])
+        for (scope_id, stage, next_stage), count, _ in grouped:
+            stats[(scope, scope_id)]["transitions"][stage][next_stage] += count
+
+        selected = timed & owned[moves]
+        rows, seconds = moves[selected], in_stage[selected]
+        grouped = _grouped(np, [scope_of(rows), column("from_status", rows), _duration_buckets(np, seconds)], weights=seconds)
+        for (scope_id, stage, bucket), count, total in grouped:
+            stats[(scope, scope_id)]["durations"][stage][bucket] += count
+            stats[(scope, scope_id)]["duration_seconds"][stage] += total
+
+        selected = hired & owned[moves]
+        rows, seconds = moves[selected], to_hire[selected]
+        for (scope_id, bucket), count, total in _grouped(np, [scope_of(rows), _duration_buckets(np, seconds)], weights=seconds):
+            stats[(scope, scope_id)]["durations"][TIME_TO_HIRE][bucket] += count
+            stats[(scope, scope_id)]["duration_seconds"][TIME_TO_HIRE] += total
+
+    return {
+        key: {
+            "entered": dict(value["entered"]),
+            "transitions": {stage: dict(targets) for stage, targets in value["transitions"].items()},
+            "durations": {metric: dict(histogram) for metric, histogram in value["durations"].items()},
+            "duration_seconds": dict(value["duration_seconds"]),
+        }
+        for key, value in stats.items()
+    }
+
+
+async def rebuild_funnel_stats(archive=None) -> int:
+    """Recompute every scope from the event log. Returns the number of scopes written.
+
+    For backfills and repairs; increments racing with the rebuild can be
+    lost until the next one, as with the application counters.
+    """
+    if archive is None:
+        from app.services.analytics.services.event_archive import event_archive as archive
+
+    started = datetime.utcnow()
+    stats = compute_funnel_stats(await _load_history(archive))
+    collection = FunnelStats.get_motor_collection()
+    if stats:
+        await collection.bulk_write([
+            UpdateOne(
+                {"scope": scope, "scope_id": scope_id},
+                {"$set": {**fields, "updated_at": started, "rebuilt_at": started}},
+                upsert=True,
+            )
+            for (scope, scope_id), fields in stats.items()
+        ], ordered=False)
+
+    # Scopes with no events left in the log
+    await collection.update_many(
+        {"rebuilt_at": {"$ne": started}, "updated_at": {"$lt": started}},
+        {"$set": {"entered": {}, "transitions": {}, "durations": {}, "duration_seconds": {}, "rebuilt_at": started}},
+    )
+    _report_cache.clear()
+    return len(stats)
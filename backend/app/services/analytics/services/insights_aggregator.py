@@ -0,0 +1,155 @@
+# app/services/analytics/services/insights_aggregator.py
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core import events
+from app.core.timeutils import naive_utc
+from app.services.analytics.config import (
+    ANALYTICS_MINUTE_ROLLUP_RETENTION_HOURS,
+    ANALYTICS_HOUR_ROLLUP_RETENTION_DAYS,
+)
+from app.services.analytics.db import analytics_crud
+from app.services.analytics.models.analytics import RollupGranularity
+
+PLATFORM = "platform"
+EMPLOYER = "employer"
+JOB = "job"
+
+GRANULARITY_STEP = {
+    RollupGranularity.MINUTE.value: timedelta(minutes=1),
+    RollupGranularity.HOUR.value: timedelta(hours=1),
+    RollupGranularity.DAY.value: timedelta(days=1),
+    RollupGranularity.WEEK.value: timedelta(weeks=1),
+    # The shortest month, so a range's bucket count is never underestimated
+    RollupGranularity.MONTH.value: timedelta(days=28),
+}
+
+RETENTION = {
+    RollupGranularity.MINUTE.value: timedelta(hours=ANALYTICS_MINUTE_ROLLUP_RETENTION_HOURS),
+    RollupGranularity.HOUR.value: timedelta(days=ANALYTICS_HOUR_ROLLUP_RETENTION_DAYS),
+}
+
+# A range is read at the finest granularity that needs at most this many
+# buckets, so any query touches a bounded number of documents
+MAX_BUCKETS = 400
+
+
+def _bucket_starts(at: datetime) -> Iterable[Tuple[str, datetime]]:
+    yield RollupGranularity.MINUTE.value, at.replace(second=0, microsecond=0)
+    yield RollupGranularity.HOUR.value, at.replace(minute=0, second=0, microsecond=0)
+    day = at.replace(hour=0, minute=0, second=0, microsecond=0)
+    yield RollupGranularity.DAY.value, day
+    yield RollupGranularity.WEEK.value, day - timedelta(days=day.weekday())
+    yield RollupGranularity.MONTH.value, day.replace(day=1)
+
+
+class _RollupBatch:
+    """Collects the increments of one event batch before a single bulk write"""
+
+    def __init__(self):
+        self.deltas: analytics_crud.RollupDeltas = defaultdict(lambda: defaultdict(int))
+
+    def count(self, at: Optional[datetime], counter: str, job_id: Optional[str] = None,
+              employer_id: Optional[str] = None, amount: int = 1) -> None:
+        scopes = [(PLATFORM, "")]
+        if employer_id:
+            scopes.append((EMPLOYER, employer_id))
+        if job_id:
+            scopes.append((JOB, job_id))
+        for granularity, bucket_start in _bucket_starts(naive_utc(at)):
+            for scope, scope_id in scopes:
+                self.deltas[(scope, scope_id, granularity, bucket_start)][counter] += amount
+
+    async def write(self) -> None:
+        await analytics_crud.apply_rollup_deltas(self.deltas, RETENTION)
+
+
+async def record_job_views(batch: List[dict]) -> None:
+    rollup = _RollupBatch()
+    for event in batch:
+        counter = "views" if event.get("kind", "view") == "view" else "clicks"
+        rollup.count(event.get("at"), counter, event["job_id"], event.get("employer_id"))
+    await rollup.write()
+
+
+async def _on_application_events(batch: List[dict]) -> None:
+    rollup = _RollupBatch()
+    for event in batch:
+        if event["type"] == "applied":
+            counter = "applications"
+        elif event["type"] in ("status_changed", "withdrawn"):
+            counter = f"transitions.{event['to_status']}"
+        else:
+            continue
+        rollup.count(event["at"], counter, event["job_id"], event.get("employer_id"))
+    await rollup.write()
+
+
+async def _on_job_events(batch: List[dict]) -> None:
+    rollup = _RollupBatch()
+    for event in batch:
+        if event["type"] == "created":
+            rollup.count(event.get("at"), "jobs_posted", event["job_id"], event["employer_id"])
+    await rollup.write()
+
+
+async def _on_user_events(batch: List[dict]) -> None:
+    rollup = _RollupBatch()
+    for event in batch:
+        if event["type"] == "signed_up":
+            rollup.count(event.get("at"), f"signups.{event['role']}")
+        elif event["type"] == "logged_in":
+            rollup.count(event.get("at"), "logins")
+    await rollup.write()
+
+
+events.subscribe(events.APPLICATION_EVENTS, _on_application_events)
+events.subscribe(events.JOB_EVENTS, _on_job_events)
+events.subscribe(events.USER_EVENTS, _on_user_events)
+
+
+def pick_granularity(start: datetime, end: datetime) -> str:
+    """Finest granularity still retained for ``start`` that covers the range in at most MAX_BUCKETS buckets"""
+    for granularity, step in GRANULARITY_STEP.items():  # finest first
+        retained = RETENTION.get(granularity)
+        if (end - start) / step <= MAX_BUCKETS and (retained is None or datetime.utcnow() - start <= retained):
+            return granularity
+    raise ValueError(f"Range needs more than {MAX_BUCKETS} {RollupGranularity.MONTH.value} buckets; narrow it")
+
+
+def _flatten(counts: dict, prefix: str = "") -> Dict[str, int]:
+    flat = {}
+    for name, value in counts.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}."))
+        else:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+async def get_insights(scope: str, scope_id: str, start: datetime, end: datetime,
+                       granularity: Optional[str] = None) -> dict:
+    """Totals and a time series for one scope, read from rollups only"""
+    start, end = naive_utc(start), naive_utc(end)
+    granularity = granularity or pick_granularity(start, end)
+    start = dict(_bucket_starts(start))[granularity]  # include the bucket start falls in
+    rows = await analytics_crud.get_rollups(scope, scope_id, granularity, start, end)
+
+    totals: Dict[str, int] = defaultdict(int)
+    series = []
+    for row in rows:
+        counts = _flatten(row.get("counts", {}))
+        for name, value in counts.items():
+            totals[name] += value
+        series.append({"bucket_start": row["bucket_start"], "counts": counts})
+    return {
+        "scope": scope,
+        "scope_id": scope_id or None,
+        "granularity": granularity,
+        "start": start,
+        "end": end,
+        "totals": dict(totals),
+        "series": series,
+    }
@@ -0,0 +1,133 @@
+# app/services/analytics/services/tracker.py
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Iterable, List, Optional
+
+from app.core import events
+from app.services.analytics.config import (
+    ANALYTICS_QUEUE_MAX_EVENTS,
+    ANALYTICS_FLUSH_BATCH_SIZE,
+    ANALYTICS_FLUSH_INTERVAL_SECONDS,
+)
+from app.services.analytics.models.analytics import JobViewEvent
+
+
+class EventTracker:
+    """In-memory queue of view/click events, written to Mongo in batches.
+
+    ``track`` is a synchronous append, so recording an event never waits on
+    the database. A single background task flushes with ``insert_many`` when
+    a batch fills up or the interval passes. When the queue is full new
+    events are shed and counted rather than slowing the request down.
+    """
+
+    def __init__(
+        self,
+        max_events: int = ANALYTICS_QUEUE_MAX_EVENTS,
+        batch_size: int = ANALYTICS_FLUSH_BATCH_SIZE,
+        interval: float = ANALYTICS_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.max_events = max_events
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: Deque[dict] = deque()
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_ms = 0.0
+
+    def track_many(self, batch: Iterable[dict]) -> int:
+        """Queue events; returns how many were accepted (the rest were shed)"""
+        accepted = 0
+        for event in batch:
+            if len(self._queue) >= self.max_events:
+                self.dropped += 1
+                continue
+            self._queue.append(event)
+            accepted += 1
+        self.enqueued += accepted
+        if len(self._queue) >= self.batch_size:
+            self._batch_ready.set()
+        return accepted
+
+    def track(self, event: dict) -> bool:
+        return self.track_many([event]) == 1
+
+    @property
+    def saturated(self) -> bool:
+        return len(self._queue) >= self.max_events
+
+    def _take_batch(self) -> List[dict]:
+        count = min(self.batch_size, len(self._queue))
+        return [self._queue.popleft() for _ in range(count)]
+
+    async def flush(self) -> int:
+        """Write one batch; returns the number of events written"""
+        batch = self._take_batch()
+        if not batch:
+            return 0
+        started = time.perf_counter()
+        try:
+            await JobViewEvent.get_motor_collection().insert_many(batch, ordered=False)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Error flushing {len(batch)} job view events: {e}")
+            return 0
+        self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.flushed += len(batch)
+        self.batches += 1
+        await events.publish(events.JOB_VIEW_EVENTS, batch)
+        return len(batch)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            # Drain full batches back to back so a burst cannot pile up
+            while self._queue:
+                await self.flush()
+                if len(self._queue) < self.batch_size:
+                    break
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still queued"""
+        if self._task is not None:
+            # Wake the flusher and let it finish its current write; cancelling
+            # mid-insert would lose the batch it already took off the queue
+            self._stopping = True
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+        while self._queue:
+            if not await self.flush():
+                break
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": len(self._queue),
+            "max_events": self.max_events,
+            "batch_size": self.batch_size,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+job_view_tracker = EventTracker()
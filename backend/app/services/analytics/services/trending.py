@@ -0,0 +1,138 @@
+# app/services/analytics/services/trending.py
+
+import asyncio
+import os
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.core import events
+from app.core.heavy_hitters import DecayedCountMinSketch, SpaceSavingTopK
+from app.services.analytics.config import (
+    TRENDING_HALF_LIFE_SECONDS,
+    TRENDING_APPLY_WEIGHT,
+    TRENDING_TOP_K,
+    TRENDING_SNAPSHOT_INTERVAL_SECONDS,
+)
+from app.services.analytics.models.analytics import TrendingEntry, TrendingSnapshot
+from app.services.job.models.job import Job, JobStatus
+
+
+class _JobCard(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    company: str
+    location: str
+    status: JobStatus
+
+
+class TrendingJobs:
+    """The "trending now" feed, from exponentially decayed view and apply scores.
+
+    Every event updates a count-min sketch (a decayed score for any job in
+    fixed memory) and a space-saving top-K (which jobs are the heavy
+    hitters). A background task publishes this worker's top-K, merges it
+    with the other workers' and resolves job cards, so serving the feed is
+    just returning a prepared list.
+    """
+
+    def __init__(self, interval: int = TRENDING_SNAPSHOT_INTERVAL_SECONDS):
+        self.interval = interval
+        self.worker_id = f"{os.uname().nodename}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._scores = DecayedCountMinSketch(half_life_seconds=TRENDING_HALF_LIFE_SECONDS)
+        self._top = SpaceSavingTopK(TRENDING_TOP_K, half_life_seconds=TRENDING_HALF_LIFE_SECONDS)
+        self._feed: List[dict] = []
+        self._feed_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, job_id: str, weight: float = 1.0, at: Optional[float] = None) -> None:
+        self._scores.add(job_id, weight, at)
+        self._top.add(job_id, weight, at)
+
+    def local_top(self, now: Optional[float] = None) -> List[TrendingEntry]:
+        now = time.time() if now is None else now
+        # Both structures only overestimate, so the smaller figure is the tighter one
+        return [
+            TrendingEntry(job_id=job_id, score=round(min(score, self._scores.estimate(job_id, now)), 4))
+            for job_id, score, _ in self._top.top(now=now)
+        ]
+
+    def feed(self, limit: int) -> dict:
+        return {"items": self._feed[:limit], "snapshot_at": self._feed_at}
+
+    async def snapshot(self) -> None:
+        """Publish this worker's top-K and rebuild the served feed from all workers"""
+        now = datetime.utcnow()
+        await TrendingSnapshot.get_motor_collection().update_one(
+            {"worker_id": self.worker_id},
+            {"$set": {"items": [entry.model_dump() for entry in self.local_top()], "updated_at": now}},
+            upsert=True,
+        )
+
+        # Scores are all "as of now" and decay at the same rate, so they add up
+        totals = defaultdict(float)
+        recent = now - timedelta(seconds=3 * self.interval)
+        async for snapshot in TrendingSnapshot.find(TrendingSnapshot.updated_at >= recent):
+            for entry in snapshot.items:
+                totals[entry.job_id] += entry.score
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:TRENDING_TOP_K]
+
+        ids = []
+        for job_id, _ in ranked:
+            try:
+                ids.append(PydanticObjectId(job_id))
+            except Exception:
+                continue
+        cards = {
+            str(card.id): card
+            for card in await Job.find({"_id": {"$in": ids}}, projection_model=_JobCard).to_list()
+        }
+        self._feed = [
+            {
+                "job_id": job_id,
+                "title": cards[job_id].title,
+                "company": cards[job_id].company,
+                "location": cards[job_id].location,
+                "score": round(score, 2),
+            }
+            for job_id, score in ranked
+            if job_id in cards and cards[job_id].status == JobStatus.ACTIVE
+        ]
+        self._feed_at = now
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.snapshot()
+            except Exception as e:
+                print(f"Error snapshotting trending jobs: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+trending_jobs = TrendingJobs()
+
+
+async def _on_application_events(batch: List[dict]) -> None:
+    for event in batch:
+        if event["type"] == "applied":
+            trending_jobs.record(event["job_id"], TRENDING_APPLY_WEIGHT)
+
+
+events.subscribe(events.APPLICATION_EVENTS, _on_application_events)
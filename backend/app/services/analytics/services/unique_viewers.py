@@ -0,0 +1,125 @@
+# app/services/analytics/services/unique_viewers.py
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.hyperloglog import HyperLogLog
+from app.services.analytics.config import ANALYTICS_HLL_PRECISION, ANALYTICS_SKETCH_FLUSH_INTERVAL_SECONDS
+from app.services.analytics.models.analytics import UniqueViewerSketch
+
+SketchKey = Tuple[str, str, datetime]  # (scope, scope_id, day)
+
+MAX_MERGE_ATTEMPTS = 5
+
+
+def _viewer(event: dict) -> Optional[str]:
+    if event.get("viewer_id"):
+        return f"u:{event['viewer_id']}"
+    if event.get("session_id"):
+        return f"s:{event['session_id']}"
+    return None  # nothing to tell anonymous viewers apart
+
+
+class UniqueViewerCounter:
+    """Per job, employer and platform HyperLogLog sketches of daily viewers.
+
+    Views are folded into in-memory sketches (sparse while small) and merged
+    into the stored ones every few seconds with a compare-and-swap, so
+    workers never overwrite each other's registers.
+    """
+
+    def __init__(self, interval: int = ANALYTICS_SKETCH_FLUSH_INTERVAL_SECONDS):
+        self.interval = interval
+        self._pending: Dict[SketchKey, HyperLogLog] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wake = asyncio.Event()
+
+    def record(self, batch: List[dict]) -> None:
+        for event in batch:
+            viewer = _viewer(event)
+            if viewer is None or event.get("kind", "view") != "view":
+                continue
+            value = HyperLogLog.hash(viewer)
+            day = event["at"].replace(hour=0, minute=0, second=0, microsecond=0)
+            scopes = [("platform", ""), ("job", event["job_id"])]
+            if event.get("employer_id"):
+                scopes.append(("employer", event["employer_id"]))
+            for scope, scope_id in scopes:
+                key = (scope, scope_id, day)
+                if key not in self._pending:
+                    self._pending[key] = HyperLogLog(ANALYTICS_HLL_PRECISION)
+                self._pending[key].add_hash(value)
+
+    async def _merge(self, key: SketchKey, sketch: HyperLogLog) -> None:
+        scope, scope_id, day = key
+        collection = UniqueViewerSketch.get_motor_collection()
+        for _ in range(MAX_MERGE_ATTEMPTS):
+            stored = await collection.find_one({"scope": scope, "scope_id": scope_id, "day": day})
+            merged = HyperLogLog.from_bytes(stored["registers"]) if stored else HyperLogLog(ANALYTICS_HLL_PRECISION)
+            merged.merge(sketch)
+            try:
+                if stored is None:
+                    await collection.insert_one({
+                        "scope": scope, "scope_id": scope_id, "day": day,
+                        "registers": merged.to_bytes(), "version": 0,
+                    })
+                    return
+                result = await collection.update_one(
+                    {"_id": stored["_id"], "version": stored["version"]},
+                    {"$set": {"registers": merged.to_bytes()}, "$inc": {"version": 1}},
+                )
+                if result.modified_count:
+                    return
+            except DuplicateKeyError:
+                pass  # another worker created it first; merge into theirs
+        raise RuntimeError(f"gave up merging viewer sketch {key} after {MAX_MERGE_ATTEMPTS} attempts")
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for key, sketch in pending.items():
+            try:
+                await self._merge(key, sketch)
+            except Exception as e:
+                print(f"Error storing unique viewers for {key}: {e}")
+
+    async def count(self, scope: str, scope_id: str, start: datetime, end: datetime) -> int:
+        """Distinct viewers over the days overlapping [start, end)"""
+        first_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        merged = HyperLogLog(ANALYTICS_HLL_PRECISION)
+        async for stored in UniqueViewerSketch.get_motor_collection().find(
+            {"scope": scope, "scope_id": scope_id, "day": {"$gte": first_day, "$lt": end}},
+            projection={"_id": 0, "registers": 1},
+        ):
+            merged.merge(HyperLogLog.from_bytes(stored["registers"]))
+        return len(merged)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self._stopping:
+                await self.flush()
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and merge every sketch still pending"""
+        if self._task is not None:
+            # Wake the flusher and let it finish its current merge; cancelling
+            # mid-flush would lose the sketches it already took off _pending
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+unique_viewer_counter = UniqueViewerCounter()
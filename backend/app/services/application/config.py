@@ -0,0 +1,16 @@
+# app/services/application/config.py
+
+import os
+
+# Most applications one bulk status request may touch
+BULK_STATUS_MAX_ITEMS = int(os.getenv("BULK_STATUS_MAX_ITEMS", "1000"))
+
+# Job owner/status lookups made on every apply
+JOB_LOOKUP_CACHE_TTL_SECONDS = int(os.getenv("JOB_LOOKUP_CACHE_TTL_SECONDS", "60"))
+JOB_LOOKUP_CACHE_MAX_SIZE = int(os.getenv("JOB_LOOKUP_CACHE_MAX_SIZE", "10000"))
+
+# How often per-job applicant counters are recounted from the applications
+APPLICATION_COUNTERS_RECONCILE_INTERVAL_SECONDS = int(os.getenv("APPLICATION_COUNTERS_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+# Events per application_events bucket document before a new one is started
+APPLICATION_EVENT_BUCKET_MAX_EVENTS = int(os.getenv("APPLICATION_EVENT_BUCKET_MAX_EVENTS", "200"))
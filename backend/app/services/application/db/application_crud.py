@@ -1,14 +1,109 @@
 # app/services/application/db/application_crud.py
 
 from app.services.application.models.application import Application
+from app.services.job.models.job import Job
 from beanie import PydanticObjectId
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from fastapi import HTTPException
+from typing import List, Optional
+import base64
+import json
+
+# Job fields copied onto each application row ("card" view of the job)
+JOB_CARD_FIELDS = {
+    "job_title": "$job.title",
+    "company_name": "$job.company",
+    "job_location": "$job.location",
+    "job_status": "$job.status",
+}
+
+
+def encode_cursor(applied_at: datetime, application_id: str) -> str:
+    raw = json.dumps({"t": applied_at.isoformat(), "id": application_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _page_pipeline(match: dict, cursor: Optional[str], limit: int) -> list:
+    """Newest-first page of applications with their job card joined in.
+
+    Keyset pagination on (applied_at, _id) keeps every page an index range
+    scan; the join runs only for the rows on the page.
+    """
+    if cursor:
+        applied_at, last_id = decode_cursor(cursor)
+        match = {"$and": [match, {"$or": [
+            {"applied_at": {"$lt": applied_at}},
+            {"applied_at": applied_at, "_id": {"$lt": last_id}},
+        ]}]}
+
+    return [
+        {"$match": match},
+        {"$sort": {"applied_at": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        {"$addFields": {"job_oid": {"$convert": {"input": "$job_id", "to": "objectId", "onError": None, "onNull": None}}}},
+        {"$lookup": {"from": Job.Settings.name, "localField": "job_oid", "foreignField": "_id", "as": "job"}},
+        {"$unwind": {"path": "$job", "preserveNullAndEmptyArrays": True}},
+        {"$project": {
+            "_id": 0,
+            "id": {"$toString": "$_id"},
+            "job_id": 1,
+            "candidate_id": 1,
+            "employer_id": 1,
+            "status": 1,
+            "cover_letter": 1,
+            "resume_url": 1,
+            "applied_at": 1,
+            "updated_at": 1,
+            **JOB_CARD_FIELDS,
+        }},
+    ]
+
+
+async def _get_page(match: dict, cursor: Optional[str], limit: int) -> dict:
+    rows = await Application.aggregate(_page_pipeline(match, cursor, limit)).to_list()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["applied_at"], rows[-1]["id"])
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+async def get_applications_by_candidate(candidate_id: str, status: Optional[str] = None,
+                                        cursor: Optional[str] = None, limit: int = 20):
+    match = {"candidate_id": candidate_id}
+    if status:
+        match["status"] = status
+    return await _get_page(match, cursor, limit)
+
+
+async def get_applications_by_employer(employer_id: str, status: Optional[str] = None,
+                                       cursor: Optional[str] = None, limit: int = 20):
+    match = {"employer_id": employer_id}
+    if status:
+        match["status"] = status
+    return await _get_page(match, cursor, limit)
 
-async def get_applications_by_candidate(candidate_id: str):
-    return await Application.find(Application.candidate_id == candidate_id).to_list()
 
-async def get_applications_by_employer(employer_id: str):
-    return await Application.find(Application.employer_id == employer_id).to_list()
 async def create_application(application_data: dict):
     application = Application(**application_data)
     await application.insert()
     return application
+
+
+async def employer_received_resume(employer_id: str, candidate_id: str, resume_urls: List[str]) -> bool:
+    """Whether the candidate applied to one of the employer's jobs with any of these resume references"""
+    application = await Application.get_motor_collection().find_one(
+        {"employer_id": employer_id, "candidate_id": candidate_id, "resume_url": {"$in": resume_urls}},
+        projection={"_id": 1},
+    )
+    return application is not None
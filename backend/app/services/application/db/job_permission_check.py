@@ -0,0 +1,48 @@
+# app/services/application/db/job_permission_check.py
+
+from app.core.cache import TTLCache
+from app.services.application.config import JOB_LOOKUP_CACHE_TTL_SECONDS, JOB_LOOKUP_CACHE_MAX_SIZE
+from app.services.job.models.job import Job, JobStatus
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+from pydantic import BaseModel
+from typing import Optional
+
+# job id -> _JobOwner; a missing job is cached as None too
+_job_cache = TTLCache(maxsize=JOB_LOOKUP_CACHE_MAX_SIZE, ttl=JOB_LOOKUP_CACHE_TTL_SECONDS)
+_MISSING = object()
+
+
+class _JobOwner(BaseModel):
+    """Projection with only what applying needs to know about a job"""
+    employer_id: str
+    status: JobStatus
+
+
+async def get_job_owner(job_id: str) -> Optional[_JobOwner]:
+    cached = _job_cache.get(job_id, _MISSING)
+    if cached is not _MISSING:
+        return cached
+
+    try:
+        object_id = PydanticObjectId(job_id)
+    except Exception:
+        return None
+    job = await Job.find_one(Job.id == object_id, projection_model=_JobOwner)
+    _job_cache.set(job_id, job)
+    return job
+
+
+def forget_job(job_id: str) -> None:
+    """Drop the cached lookup after the job's status or owner changes"""
+    _job_cache.pop(str(job_id))
+
+
+async def get_employer_for_application(job_id: str) -> str:
+    """Employer of a job that is open for applications"""
+    job = await get_job_owner(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.ACTIVE:
+        raise HTTPException(status_code=400, detail="This job is not accepting applications")
+    return job.employer_id
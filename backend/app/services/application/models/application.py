@@ -3,6 +3,8 @@
 from beanie import Document
 from pydantic import Field
 from datetime import datetime, timezone
+from typing import Optional
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class Application(Document):
     candidate_id: str
@@ -11,8 +13,29 @@ class Application(Document):
     cover_letter: str
     status: str = Field(default="pending")
     employer_id: str
+    idempotency_key: Optional[str] = None  # client-supplied, makes apply safe to retry
     applied_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Projection of the event log: when the current stage began and the
+    # employer first opened the application
+    status_changed_at: Optional[datetime] = None
+    viewed_at: Optional[datetime] = None
 
     class Settings:
         name = "applications"  # MongoDB collection name
+        # Back the newest-first, cursor-paginated listings; _id breaks ties
+        # between applications with the same applied_at
+        indexes = [
+            IndexModel([("candidate_id", ASCENDING), ("applied_at", DESCENDING), ("_id", DESCENDING)]),
+            # Unfiltered employer listing; the status index above cannot give
+            # this order without an in-memory sort of every application
+            IndexModel([("employer_id", ASCENDING), ("applied_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("employer_id", ASCENDING), ("status", ASCENDING), ("applied_at", DESCENDING), ("_id", DESCENDING)]),
+            # One application per candidate and job
+            IndexModel([("candidate_id", ASCENDING), ("job_id", ASCENDING)], unique=True),
+            IndexModel(
+                [("candidate_id", ASCENDING), ("idempotency_key", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"idempotency_key": {"$type": "string"}},
+            ),
+        ]
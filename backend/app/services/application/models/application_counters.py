@@ -0,0 +1,23 @@
+# app/services/application/models/application_counters.py
+
+from beanie import Document
+from pydantic import Field
+from datetime import datetime
+from typing import Dict, Optional
+from pymongo import ASCENDING, IndexModel
+
+class JobApplicationCounters(Document):
+    """Running applicant counts for one job, kept current with $inc"""
+    job_id: str
+    employer_id: str
+    total: int = 0
+    by_status: Dict[str, int] = Field(default_factory=dict)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    reconciled_at: Optional[datetime] = None
+
+    class Settings:
+        name = "application_counters"
+        indexes = [
+            IndexModel([("job_id", ASCENDING)], unique=True),
+            IndexModel([("employer_id", ASCENDING)]),
+        ]
@@ -0,0 +1,44 @@
+# app/services/application/models/application_event.py
+
+from beanie import Document
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from pymongo import ASCENDING, IndexModel
+
+class ApplicationEventType(str, Enum):
+    APPLIED = "applied"
+    VIEWED = "viewed"
+    STATUS_CHANGED = "status_changed"
+    WITHDRAWN = "withdrawn"
+
+class ApplicationEvent(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
+    type: ApplicationEventType
+    application_id: str
+    candidate_id: str
+    actor_id: Optional[str] = None
+    from_status: Optional[str] = None
+    to_status: Optional[str] = None
+    at: datetime
+
+class ApplicationEventBucket(Document):
+    """Append-only log: the events of one job within one day, pushed in batches.
+
+    Bucketing keeps a write to one small document update and lets a job's
+    history for a date range be read from a handful of documents.
+    """
+    job_id: str
+    employer_id: Optional[str] = None
+    bucket_start: datetime
+    size: int = 0  # events in this bucket
+    events: List[ApplicationEvent] = []
+
+    class Settings:
+        name = "application_events"
+        indexes = [
+            IndexModel([("job_id", ASCENDING), ("bucket_start", ASCENDING)]),
+            IndexModel([("events.application_id", ASCENDING), ("bucket_start", ASCENDING)]),
+        ]
@@ -1,11 +1,14 @@
 # app/services/application/routes/application_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.services.application.services import apply_handler, status_updater
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from app.services.application.services import apply_handler, status_updater, application_counters, application_viewer
+from app.services.application.services.event_log import get_funnel
+from app.services.application.db.job_permission_check import get_job_owner
 from app.services.application.db import application_crud
-from app.services.auth_service.services.jwt_handler import get_current_user
+from app.services.auth_service.services.jwt_handler import get_current_principal
+from app.models.application import ApplicationPage, ApplicationStatus
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from fastapi import Depends
 router = APIRouter()
 
@@ -19,35 +22,129 @@ class UpdateStatusForm(BaseModel):
     application_id: str
     new_status: str  # e.g., "interview", "rejected", "hired"
 
+class BulkStatusFilter(BaseModel):
+    job_id: Optional[str] = None
+    statuses: Optional[List[ApplicationStatus]] = None
+
+class BulkUpdateStatusForm(BaseModel):
+    new_status: ApplicationStatus
+    # Either explicit ids or a filter over the employer's own applications
+    application_ids: Optional[List[str]] = None
+    filter: Optional[BulkStatusFilter] = None
 
 
 # POST /api/applications/apply
 @router.post("/apply", status_code=status.HTTP_201_CREATED)
-async def apply_to_job(form: ApplyForm, user=Depends(get_current_user)):
+async def apply_to_job(
+    form: ApplyForm,
+    idempotency_key: Optional[str] = Header(None, max_length=128),
+    user=Depends(get_current_principal),
+):
     if not user or user["role"] != "candidate":
         raise HTTPException(status_code=403, detail="Only candidates can apply.")
-    return await apply_handler.submit_application(user["id"], form)
+    return await apply_handler.submit_application(user["id"], form, idempotency_key)
 
 
 # GET /api/applications/candidate
-@router.get("/candidate", response_model=List[dict])
-async def get_candidate_applications(user=Depends(get_current_user)):
+@router.get("/candidate", response_model=ApplicationPage)
+async def get_candidate_applications(
+    status_filter: Optional[ApplicationStatus] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    user=Depends(get_current_principal),
+):
     if not user or user["role"] != "candidate":
         raise HTTPException(status_code=403, detail="Unauthorized")
-    return await application_crud.get_applications_by_candidate(user["id"])
+    return await application_crud.get_applications_by_candidate(
+        user["id"], status_filter.value if status_filter else None, cursor, limit
+    )
 
 
 # GET /api/applications/employer
-@router.get("/employer", response_model=List[dict])
-async def get_employer_applications(user=Depends(get_current_user)):
+@router.get("/employer", response_model=ApplicationPage)
+async def get_employer_applications(
+    status_filter: Optional[ApplicationStatus] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    user=Depends(get_current_principal),
+):
     if not user or user["role"] != "employer":
         raise HTTPException(status_code=403, detail="Unauthorized")
-    return await application_crud.get_applications_by_employer(user["id"])
+    return await application_crud.get_applications_by_employer(
+        user["id"], status_filter.value if status_filter else None, cursor, limit
+    )
+
+
+# GET /api/applications/counts
+@router.get("/counts")
+async def get_employer_application_counts(user=Depends(get_current_principal)):
+    if not user or user["role"] != "employer":
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    return await application_counters.get_employer_counters(user["id"])
+
+
+# GET /api/applications/counts/{job_id}
+@router.get("/counts/{job_id}")
+async def get_job_application_counts(job_id: str, user=Depends(get_current_principal)):
+    if not user or user["role"] != "employer":
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    job = await get_job_owner(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.employer_id != user["id"]:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    return await application_counters.get_job_counters(job_id)
+
+
+# GET /api/applications/funnel/{job_id}
+@router.get("/funnel/{job_id}")
+async def get_job_application_funnel(job_id: str, user=Depends(get_current_principal)):
+    if not user or user["role"] != "employer":
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    job = await get_job_owner(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.employer_id != user["id"]:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    return await get_funnel(job_id)
 
 
 # PUT /api/applications/update-status
 @router.put("/update-status")
-async def update_application_status(data: UpdateStatusForm, user=Depends(get_current_user)):
+async def update_application_status(data: UpdateStatusForm, user=Depends(get_current_principal)):
     if not user or user["role"] != "employer":
         raise HTTPException(status_code=403, detail="Only employers can update application status.")
     return await status_updater.update_status(user["id"], data.application_id, data.new_status)
+
+
+# PUT /api/applications/bulk-status
+@router.put("/bulk-status")
+async def bulk_update_application_status(data: BulkUpdateStatusForm, user=Depends(get_current_principal)):
+    if not user or user["role"] != "employer":
+        raise HTTPException(status_code=403, detail="Only employers can update application status.")
+    if (data.application_ids is None) == (data.filter is None):
+        raise HTTPException(status_code=400, detail="Provide either application_ids or filter.")
+    criteria = data.filter or BulkStatusFilter()
+    return await status_updater.bulk_update_status(
+        user["id"],
+        data.new_status,
+        application_ids=data.application_ids,
+        job_id=criteria.job_id,
+        statuses=criteria.statuses,
+    )
+
+
+# PUT /api/applications/{application_id}/withdraw
+@router.put("/{application_id}/withdraw")
+async def withdraw_application(application_id: str, user=Depends(get_current_principal)):
+    if not user or user["role"] != "candidate":
+        raise HTTPException(status_code=403, detail="Only candidates can withdraw applications.")
+    return await status_updater.withdraw_application(user["id"], application_id)
+
+
+# GET /api/applications/{application_id}
+@router.get("/{application_id}")
+async def get_application(application_id: str, user=Depends(get_current_principal)):
+    if not user:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    return await application_viewer.view_application(user, application_id)
@@ -0,0 +1,186 @@
+# app/services/application/services/application_counters.py
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from app.core.leases import acquire_lease, new_holder
+from app.services.application.config import APPLICATION_COUNTERS_RECONCILE_INTERVAL_SECONDS
+from app.services.application.models.application import Application
+from app.services.application.models.application_counters import JobApplicationCounters
+from app.services.job.models.job import Job
+
+RECONCILE_LEASE = "application_counters.reconcile"
+
+
+def _collection():
+    return JobApplicationCounters.get_motor_collection()
+
+
+def _as_dict(counters: JobApplicationCounters) -> dict:
+    return {
+        "job_id": counters.job_id,
+        "total": counters.total,
+        "by_status": {status: count for status, count in counters.by_status.items() if count},
+        "updated_at": counters.updated_at,
+    }
+
+
+async def record_applied(job_id: str, employer_id: str, status: str = "pending") -> None:
+    await _collection().update_one(
+        {"job_id": job_id},
+        {
+            "$inc": {"total": 1, f"by_status.{status}": 1},
+            "$set": {"employer_id": employer_id, "updated_at": datetime.utcnow()},
+        },
+        upsert=True,
+    )
+
+
+async def record_status_changes(changes: List[dict]) -> None:
+    """Move counts between statuses; one write per affected job.
+
+    A job without a counter document yet is seeded from a recount instead,
+    which already includes these changes; moving counts out of a document
+    that does not exist would store negative counts.
+    """
+    deltas: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for change in changes:
+        job_deltas = deltas[change["job_id"]]
+        job_deltas[f"by_status.{change['from_status']}"] -= 1
+        job_deltas[f"by_status.{change['to_status']}"] += 1
+
+    if not deltas:
+        return
+    now = datetime.utcnow()
+    result = await _collection().bulk_write([
+        UpdateOne({"job_id": job_id}, {"$inc": dict(job_deltas), "$set": {"updated_at": now}})
+        for job_id, job_deltas in deltas.items()
+    ], ordered=False)
+    if result.matched_count < len(deltas):
+        counted = set(await _collection().distinct("job_id", {"job_id": {"$in": list(deltas)}}))
+        await _recount([job_id for job_id in deltas if job_id not in counted], now)
+
+
+async def get_job_counters(job_id: str) -> dict:
+    counters = await JobApplicationCounters.find_one(JobApplicationCounters.job_id == job_id)
+    if counters is None:
+        return {"job_id": job_id, "total": 0, "by_status": {}, "updated_at": None}
+    return _as_dict(counters)
+
+
+async def get_employer_counters(employer_id: str) -> List[dict]:
+    counters = await JobApplicationCounters.find(JobApplicationCounters.employer_id == employer_id).to_list()
+    return [_as_dict(item) for item in counters]
+
+
+async def _employers_of(job_ids: Iterable[str]) -> Dict[str, str]:
+    object_ids = []
+    for job_id in job_ids:
+        try:
+            object_ids.append(PydanticObjectId(job_id))
+        except Exception:
+            continue
+    rows = Job.get_motor_collection().find({"_id": {"$in": object_ids}}, projection={"employer_id": 1})
+    return {str(row["_id"]): row["employer_id"] async for row in rows if row.get("employer_id")}
+
+
+async def _recount(job_ids: Optional[List[str]], started: datetime) -> Dict[str, dict]:
+    """Recount the given jobs (all when None) from the applications and store the counts"""
+    pipeline = [
+        {"$group": {
+            "_id": {"job_id": "$job_id", "status": "$status"},
+            # $max skips nulls, so one application with the employer is enough
+            "employer_id": {"$max": "$employer_id"},
+            "count": {"$sum": 1},
+        }},
+    ]
+    if job_ids is not None:
+        if not job_ids:
+            return {}
+        pipeline.insert(0, {"$match": {"job_id": {"$in": job_ids}}})
+    jobs: Dict[str, dict] = {}
+    async for row in Application.get_motor_collection().aggregate(pipeline):
+        job = jobs.setdefault(row["_id"]["job_id"], {"employer_id": None, "total": 0, "by_status": {}})
+        job["employer_id"] = job["employer_id"] or row["employer_id"]
+        job["total"] += row["count"]
+        job["by_status"][row["_id"]["status"]] = row["count"]
+
+    # Older applications may not carry the employer; take it from the job
+    missing = [job_id for job_id, job in jobs.items() if not job["employer_id"]]
+    if missing:
+        employers = await _employers_of(missing)
+        for job_id in missing:
+            jobs[job_id]["employer_id"] = employers.get(job_id)
+
+    operations = []
+    for job_id, job in jobs.items():
+        fields = {**job, "updated_at": started, "reconciled_at": started}
+        if job["employer_id"]:
+            operations.append(UpdateOne({"job_id": job_id}, {"$set": fields}, upsert=True))
+        else:
+            # Without an employer the document would not validate; only
+            # correct one that already exists
+            del fields["employer_id"]
+            operations.append(UpdateOne({"job_id": job_id}, {"$set": fields}))
+    if operations:
+        await _collection().bulk_write(operations, ordered=False)
+    return jobs
+
+
+async def reconcile_counters() -> int:
+    """Recount every job from the applications themselves. Returns the number of jobs recounted.
+
+    Increments racing with the recount can leave a job off by a few until
+    the next run; the counters are never more stale than one interval.
+    """
+    started = datetime.utcnow()
+    jobs = await _recount(None, started)
+
+    # Jobs that no longer have any applications
+    await _collection().update_many(
+        {"reconciled_at": {"$ne": started}, "updated_at": {"$lt": started}},
+        {"$set": {"total": 0, "by_status": {}, "reconciled_at": started}},
+    )
+    return len(jobs)
+
+
+class ApplicationCountersReconciler:
+    """Periodically recounts the per-job counters to repair any drift.
+
+    Every worker runs one, but a Mongo lease held for one interval lets only
+    one of them recount per interval.
+    """
+
+    def __init__(self, interval: int = APPLICATION_COUNTERS_RECONCILE_INTERVAL_SECONDS):
+        self.interval = interval
+        self._holder = new_holder()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if await acquire_lease(RECONCILE_LEASE, self._holder, timedelta(seconds=self.interval)):
+                    await reconcile_counters()
+            except Exception as e:
+                print(f"Error reconciling application counters: {e}")
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+application_counters_reconciler = ApplicationCountersReconciler()
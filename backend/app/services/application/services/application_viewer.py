@@ -0,0 +1,43 @@
+# app/services/application/services/application_viewer.py
+
+from app.services.application.models.application import Application
+from app.services.application.models.application_event import ApplicationEventType
+from app.services.application.services.event_log import get_application_history
+from app.core import events
+from beanie import PydanticObjectId
+from datetime import datetime, timezone
+from fastapi import HTTPException
+
+async def view_application(user: dict, application_id: str) -> dict:
+    """One application with its event history; employer views are logged"""
+    try:
+        app = await Application.get(PydanticObjectId(application_id))
+    except Exception:
+        app = None
+    if not app:
+        raise HTTPException(status_code=404, detail="Application not found.")
+    if user["id"] not in (app.candidate_id, app.employer_id):
+        raise HTTPException(status_code=403, detail="Unauthorized to view this application.")
+
+    if user["id"] == app.employer_id:
+        now = datetime.now(timezone.utc)
+        # Only the first view sets viewed_at; the guard makes that race-free
+        result = await Application.get_motor_collection().update_one(
+            {"_id": app.id, "viewed_at": None}, {"$set": {"viewed_at": now}}
+        )
+        await events.publish(events.APPLICATION_EVENTS, [{
+            "type": ApplicationEventType.VIEWED.value,
+            "application_id": application_id,
+            "job_id": app.job_id,
+            "candidate_id": app.candidate_id,
+            "employer_id": app.employer_id,
+            "actor_id": user["id"],
+            "first_view": result.modified_count == 1,
+            "at": now,
+        }])
+        app.viewed_at = app.viewed_at or now
+
+    data = app.dict()
+    data["id"] = str(app.id)
+    data["history"] = await get_application_history(application_id)
+    return data
@@ -1,16 +1,61 @@
 # app/services/application/services/apply_handler.py
 
 from app.services.application.db import application_crud
+from app.services.application.db.job_permission_check import get_employer_for_application
+from app.services.application.services import application_counters
+from app.services.application.services import event_log  # noqa: F401 (subscribes the event log)
+from app.services.application.models.application_event import ApplicationEventType
+from app.core import events
+from app.services.application.models.application import Application
 from datetime import datetime
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+from typing import Optional
+
+async def submit_application(user_id: str, form, idempotency_key: Optional[str] = None):
+    # Denormalized so employer listings stay single-index lookups
+    employer_id = await get_employer_for_application(form.job_id)
 
-async def submit_application(user_id: str, form):
     application_data = {
         "candidate_id": user_id,
         "job_id": form.job_id,
+        "employer_id": employer_id,
         "resume_url": form.resume_url,
         "cover_letter": form.cover_letter,
         "status": "pending",
         "applied_at": datetime.utcnow(),
+        "idempotency_key": idempotency_key,
     }
 
-    return await application_crud.create_application(application_data)
+    try:
+        application = await application_crud.create_application(application_data)
+    except DuplicateKeyError:
+        application = None
+
+    if application is not None:
+        try:
+            await application_counters.record_applied(form.job_id, employer_id)
+        except Exception as e:
+            # The periodic reconcile repairs the counters; never fail the apply
+            print(f"Error counting application for job {form.job_id}: {e}")
+        await events.publish(events.APPLICATION_EVENTS, [{
+            "type": ApplicationEventType.APPLIED.value,
+            "application_id": str(application.id),
+            "job_id": application.job_id,
+            "candidate_id": user_id,
+            "employer_id": employer_id,
+            "actor_id": user_id,
+            "to_status": application.status,
+            "at": application.applied_at,
+        }])
+        return application
+
+    # The unique indexes decide; work out which one fired
+    existing = await Application.find_one(
+        Application.candidate_id == user_id, Application.job_id == form.job_id
+    )
+    if existing and idempotency_key and existing.idempotency_key == idempotency_key:
+        return existing  # retry of a request that already succeeded
+    if existing:
+        raise HTTPException(status_code=409, detail="You have already applied to this job.")
+    raise HTTPException(status_code=422, detail="Idempotency key was already used for a different application.")
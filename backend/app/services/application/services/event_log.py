@@ -0,0 +1,86 @@
+# app/services/application/services/event_log.py
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from pymongo import UpdateOne
+
+from app.core import events
+from app.core.timeutils import naive_utc
+from app.models.application import ApplicationStatus
+from app.services.application.config import APPLICATION_EVENT_BUCKET_MAX_EVENTS
+from app.services.application.models.application_event import (
+    ApplicationEvent,
+    ApplicationEventBucket,
+    ApplicationEventType,
+)
+
+# Funnel stages in the order applications normally move through them
+FUNNEL_STAGES = [
+    ApplicationStatus.PENDING.value,
+    ApplicationEventType.VIEWED.value,
+    ApplicationStatus.UNDER_REVIEW.value,
+    ApplicationStatus.INTERVIEW_SCHEDULED.value,
+    ApplicationStatus.INTERVIEWED.value,
+    ApplicationStatus.ACCEPTED.value,
+    ApplicationStatus.REJECTED.value,
+    ApplicationStatus.WITHDRAWN.value,
+]
+
+
+def _bucket_start(at: datetime) -> datetime:
+    return naive_utc(at).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+async def append(batch: List[dict]) -> None:
+    """Append a batch of events with one write per (job, day) bucket"""
+    grouped: Dict[Tuple[str, datetime], List[dict]] = defaultdict(list)
+    employers: Dict[str, str] = {}
+    for event in batch:
+        entry = ApplicationEvent(**{**event, "at": naive_utc(event["at"])})
+        grouped[(event["job_id"], _bucket_start(event["at"]))].append(entry.model_dump(mode="python"))
+        employers[event["job_id"]] = event.get("employer_id")
+
+    operations = [
+        UpdateOne(
+            # A full bucket no longer matches, so the upsert starts the next one
+            {"job_id": job_id, "bucket_start": bucket_start, "size": {"$lt": APPLICATION_EVENT_BUCKET_MAX_EVENTS}},
+            {
+                "$push": {"events": {"$each": entries}},
+                "$inc": {"size": len(entries)},
+                "$setOnInsert": {"employer_id": employers[job_id]},
+            },
+            upsert=True,
+        )
+        for (job_id, bucket_start), entries in grouped.items()
+    ]
+    if operations:
+        await ApplicationEventBucket.get_motor_collection().bulk_write(operations, ordered=False)
+
+
+async def _on_application_events(batch: List[dict]) -> None:
+    await append(batch)
+
+
+async def get_application_history(application_id: str) -> List[dict]:
+    """Every event of one application, oldest first"""
+    pipeline = [
+        {"$match": {"events.application_id": application_id}},
+        {"$sort": {"bucket_start": 1, "_id": 1}},
+        {"$unwind": "$events"},
+        {"$match": {"events.application_id": application_id}},
+        {"$replaceRoot": {"newRoot": "$events"}},
+    ]
+    return await ApplicationEventBucket.get_motor_collection().aggregate(pipeline).to_list(None)
+
+
+async def get_funnel(job_id: str) -> dict:
+    """A job's funnel report; the analytics hiring funnel folds these events in"""
+    # Imported here: hiring_funnel itself imports FUNNEL_STAGES from this module
+    from app.services.analytics.services.hiring_funnel import JOB, get_funnel_report
+
+    return await get_funnel_report(JOB, job_id)
+
+
+events.subscribe(events.APPLICATION_EVENTS, _on_application_events)
@@ -1,21 +1,209 @@
 # app/services/application/services/status_updater.py
 
 from app.services.application.models.application import Application
+from app.services.application.config import BULK_STATUS_MAX_ITEMS
+from app.models.application import ApplicationStatus
+from app.services.application.services import application_counters
+from app.services.application.services import event_log  # noqa: F401 (subscribes the event log)
+from app.services.application.models.application_event import ApplicationEventType
+from app.core import events
 from beanie import PydanticObjectId
-from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
-async def update_status(employer_id: str, application_id: str, new_status: str):
-    app = await Application.get(PydanticObjectId(application_id))
+# Statuses an employer may move an application to, keyed by its current status.
+# Accepted, rejected and withdrawn applications are final.
+ALLOWED_TRANSITIONS: Dict[ApplicationStatus, set] = {
+    ApplicationStatus.PENDING: {ApplicationStatus.UNDER_REVIEW, ApplicationStatus.INTERVIEW_SCHEDULED, ApplicationStatus.REJECTED},
+    ApplicationStatus.SUBMITTED: {ApplicationStatus.UNDER_REVIEW, ApplicationStatus.INTERVIEW_SCHEDULED, ApplicationStatus.REJECTED},
+    ApplicationStatus.UNDER_REVIEW: {ApplicationStatus.INTERVIEW_SCHEDULED, ApplicationStatus.ACCEPTED, ApplicationStatus.REJECTED},
+    ApplicationStatus.INTERVIEW_SCHEDULED: {ApplicationStatus.INTERVIEWED, ApplicationStatus.REJECTED},
+    ApplicationStatus.INTERVIEWED: {ApplicationStatus.ACCEPTED, ApplicationStatus.REJECTED},
+}
+
+# Per-item outcomes of a bulk update
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+FORBIDDEN = "forbidden"
+INVALID_TRANSITION = "invalid_transition"
+CONFLICT = "conflict"  # status changed by someone else between read and write
+
+
+class _StatusView(BaseModel):
+    """Projection with only the fields needed to validate a transition"""
+    id: PydanticObjectId = Field(alias="_id")
+    job_id: str
+    candidate_id: str
+    employer_id: Optional[str] = None
+    status: str
+    applied_at: datetime
+    status_changed_at: Optional[datetime] = None
+
+
+def _sources_for(new_status: str) -> List[str]:
+    return [source.value for source, targets in ALLOWED_TRANSITIONS.items() if new_status in targets]
+
+
+async def bulk_update_status(
+    employer_id: str,
+    new_status: ApplicationStatus,
+    application_ids: Optional[List[str]] = None,
+    job_id: Optional[str] = None,
+    statuses: Optional[List[ApplicationStatus]] = None,
+) -> dict:
+    """Move many applications to ``new_status`` with one read and one write.
+
+    Targets either explicit ``application_ids`` or every application of the
+    employer matching ``job_id``/``statuses``. Returns an outcome per item;
+    one invalid item never blocks the rest.
+    """
+    new_status = ApplicationStatus(new_status).value
+    results: Dict[str, str] = {}
+
+    if application_ids is not None:
+        if len(application_ids) > BULK_STATUS_MAX_ITEMS:
+            raise HTTPException(status_code=400, detail=f"At most {BULK_STATUS_MAX_ITEMS} applications per request")
+        object_ids = []
+        for application_id in dict.fromkeys(application_ids):
+            results[application_id] = NOT_FOUND  # until the read below finds it
+            try:
+                object_ids.append(ObjectId(application_id))
+            except (InvalidId, TypeError):
+                pass
+        query = {"_id": {"$in": object_ids}}
+    else:
+        query = {"employer_id": employer_id}
+        if job_id:
+            query["job_id"] = job_id
+        if statuses:
+            query["status"] = {"$in": [ApplicationStatus(s).value for s in statuses]}
 
-    if not app:
-        raise ValueError("Application not found.")
+    found = await Application.find(query, projection_model=_StatusView).limit(BULK_STATUS_MAX_ITEMS + 1).to_list()
+    if application_ids is None and len(found) > BULK_STATUS_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Filter matches more than {BULK_STATUS_MAX_ITEMS} applications")
 
-    # Optional: enforce only the employer who owns the job can update
-    if app.employer_id != employer_id:
-        raise PermissionError("Unauthorized to update this application.")
+    sources = _sources_for(new_status)
+    eligible: Dict[str, _StatusView] = {}
+    for app in found:
+        application_id = str(app.id)
+        if app.employer_id != employer_id:
+            results[application_id] = FORBIDDEN
+        elif app.status == new_status:
+            results[application_id] = UNCHANGED
+        elif app.status not in sources:
+            results[application_id] = INVALID_TRANSITION
+        else:
+            eligible[application_id] = app
 
-    app.status = new_status
-    app.updated_at = datetime.utcnow()
+    if eligible:
+        # Mongo keeps milliseconds, so truncate to match the stored value
+        # when reading back which rows this write actually moved.
+        now = datetime.now(timezone.utc)
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        ids = [app.id for app in eligible.values()]
+        await Application.get_motor_collection().update_many(
+            # Re-check owner and source status in the filter so a concurrent
+            # change is never overwritten
+            {"_id": {"$in": ids}, "employer_id": employer_id, "status": {"$in": sources}},
+            {"$set": {"status": new_status, "updated_at": now, "status_changed_at": now}},
+        )
+        moved = await Application.get_motor_collection().distinct(
+            "_id", {"_id": {"$in": ids}, "status": new_status, "updated_at": now}
+        )
+        moved = {str(_id) for _id in moved}
 
-    await app.save()
+        changed = []
+        for application_id, app in eligible.items():
+            if application_id not in moved:
+                results[application_id] = CONFLICT
+                continue
+            results[application_id] = UPDATED
+            changed.append({
+                "type": ApplicationEventType.STATUS_CHANGED.value,
+                "application_id": application_id,
+                "job_id": app.job_id,
+                "candidate_id": app.candidate_id,
+                "employer_id": employer_id,
+                "actor_id": employer_id,
+                "from_status": app.status,
+                "to_status": new_status,
+                "stage_entered_at": app.status_changed_at or app.applied_at,
+                "applied_at": app.applied_at,
+                "at": now,
+            })
+        try:
+            await application_counters.record_status_changes(changed)
+        except Exception as e:
+            print(f"Error counting status changes: {e}")
+        await events.publish(events.APPLICATION_EVENTS, changed)
+
+    return {
+        "new_status": new_status,
+        "updated": sum(1 for outcome in results.values() if outcome == UPDATED),
+        "results": [{"application_id": key, "outcome": outcome} for key, outcome in results.items()],
+    }
+
+
+async def update_status(employer_id: str, application_id: str, new_status: str):
+    try:
+        new_status = ApplicationStatus(new_status)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Unknown status '{new_status}'")
+
+    result = await bulk_update_status(employer_id, new_status, application_ids=[application_id])
+    outcome = result["results"][0]["outcome"]
+    if outcome == NOT_FOUND:
+        raise HTTPException(status_code=404, detail="Application not found.")
+    if outcome == FORBIDDEN:
+        raise HTTPException(status_code=403, detail="Unauthorized to update this application.")
+    if outcome in (INVALID_TRANSITION, CONFLICT):
+        raise HTTPException(status_code=409, detail=f"Cannot move application to '{new_status.value}'.")
     return {"message": "Application status updated.", "application_id": application_id}
+
+
+async def withdraw_application(candidate_id: str, application_id: str):
+    """Candidate pulls out of a process that has not been decided yet"""
+    try:
+        object_id = ObjectId(application_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=404, detail="Application not found.")
+
+    now = datetime.now(timezone.utc)
+    sources = [status.value for status in ALLOWED_TRANSITIONS]
+    before = await Application.get_motor_collection().find_one_and_update(
+        {"_id": object_id, "candidate_id": candidate_id, "status": {"$in": sources}},
+        {"$set": {"status": ApplicationStatus.WITHDRAWN.value, "updated_at": now, "status_changed_at": now}},
+        projection={"job_id": 1, "employer_id": 1, "status": 1, "applied_at": 1, "status_changed_at": 1},
+    )
+    if before is None:
+        app = await Application.find_one({"_id": object_id}, projection_model=_StatusView)
+        if app is None:
+            raise HTTPException(status_code=404, detail="Application not found.")
+        if app.candidate_id != candidate_id:
+            raise HTTPException(status_code=403, detail="Unauthorized to withdraw this application.")
+        raise HTTPException(status_code=409, detail=f"Cannot withdraw an application that is '{app.status}'.")
+
+    change = {
+        "type": ApplicationEventType.WITHDRAWN.value,
+        "application_id": application_id,
+        "job_id": before["job_id"],
+        "candidate_id": candidate_id,
+        "employer_id": before.get("employer_id"),
+        "actor_id": candidate_id,
+        "from_status": before["status"],
+        "to_status": ApplicationStatus.WITHDRAWN.value,
+        "stage_entered_at": before.get("status_changed_at") or before["applied_at"],
+        "applied_at": before["applied_at"],
+        "at": now,
+    }
+    try:
+        await application_counters.record_status_changes([change])
+    except Exception as e:
+        print(f"Error counting withdrawal: {e}")
+    await events.publish(events.APPLICATION_EVENTS, [change])
+    return {"message": "Application withdrawn.", "application_id": application_id}
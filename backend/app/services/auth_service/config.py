@@ -0,0 +1,64 @@
+# app/services/auth_service/config.py
+
+import os
+
+# bcrypt runs in a dedicated thread pool so it never blocks the event loop.
+# Workers bound CPU use; pending bounds how many hash/verify calls may wait
+# (running + queued) before new ones are shed with a 503.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# Users allowed to read operational metrics such as the hash pool's load.
+# Roles are chosen at signup, so this is an explicit list of user ids
+# (comma-separated); empty means nobody.
+METRICS_ADMIN_USER_IDS = {user_id.strip() for user_id in os.getenv("METRICS_ADMIN_USER_IDS", "").split(",") if user_id.strip()}
+
+# bcrypt cost. Unless PASSWORD_HASH_ROUNDS pins it, each worker benchmarks
+# the host at startup and picks the highest cost whose verify time stays
+# within the target. Stored hashes below the chosen cost are upgraded on the
+# next successful login. Calibration never goes below the previous fixed
+# cost of 12, so a slow host cannot weaken new hashes; pin the cost to keep
+# every worker on the same one.
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "0")) or None
+PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS", "250"))
+PASSWORD_HASH_BASELINE_ROUNDS = 12
+PASSWORD_HASH_MIN_ROUNDS = max(PASSWORD_HASH_BASELINE_ROUNDS, int(os.getenv("PASSWORD_HASH_MIN_ROUNDS", "12")))
+PASSWORD_HASH_MAX_ROUNDS = int(os.getenv("PASSWORD_HASH_MAX_ROUNDS", "15"))
+
+# Authenticated principals (user documents) are cached per user id for a
+# short TTL and dropped explicitly whenever the user document changes.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+# Decoded JWT payloads, keyed by a hash of the token, kept until the token expires
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+
+# Revoked-token Bloom filter: sized for the number of tokens revoked within
+# one token lifetime. Each worker pulls new revocations every sync interval
+# and rebuilds the filter from Mongo (dropping expired tokens) periodically.
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+REVOCATION_SYNC_INTERVAL_SECONDS = float(os.getenv("REVOCATION_SYNC_INTERVAL_SECONDS", "5"))
+REVOCATION_REBUILD_INTERVAL_SECONDS = float(os.getenv("REVOCATION_REBUILD_INTERVAL_SECONDS", "900"))
+
+# Firebase ID tokens are verified locally against Google's public signing
+# certificates, which are cached for as long as their Cache-Control allows.
+FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
+FIREBASE_CERTS_URL = os.getenv(
+    "FIREBASE_CERTS_URL",
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com",
+)
+FIREBASE_TOKEN_CACHE_MAX_SIZE = int(os.getenv("FIREBASE_TOKEN_CACHE_MAX_SIZE", "10000"))
+
+# Token-bucket limits for the credential endpoints, applied by
+# app.core.rate_limit.RateLimitMiddleware before any DB lookup or hashing.
+# Each entry is (key, requests per minute, burst).
+LOGIN_LIMIT_PER_IP = (float(os.getenv("LOGIN_LIMIT_PER_IP_PER_MINUTE", "30")), int(os.getenv("LOGIN_LIMIT_PER_IP_BURST", "10")))
+LOGIN_LIMIT_PER_EMAIL = (float(os.getenv("LOGIN_LIMIT_PER_EMAIL_PER_MINUTE", "10")), int(os.getenv("LOGIN_LIMIT_PER_EMAIL_BURST", "5")))
+SIGNUP_LIMIT_PER_IP = (float(os.getenv("SIGNUP_LIMIT_PER_IP_PER_MINUTE", "10")), int(os.getenv("SIGNUP_LIMIT_PER_IP_BURST", "5")))
+
+AUTH_RATE_LIMITS = {
+    ("POST", "/api/auth/login"): [("ip", *LOGIN_LIMIT_PER_IP), ("email", *LOGIN_LIMIT_PER_EMAIL)],
+    ("POST", "/api/auth/signup"): [("ip", *SIGNUP_LIMIT_PER_IP), ("email", *LOGIN_LIMIT_PER_EMAIL)],
+    ("POST", "/api/auth/firebase-auth"): [("ip", *LOGIN_LIMIT_PER_IP)],
+}
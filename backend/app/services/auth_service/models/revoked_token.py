@@ -0,0 +1,19 @@
+from beanie import Document
+from pydantic import Field
+from datetime import datetime
+from pymongo import ASCENDING, IndexModel
+
+
+class RevokedToken(Document):
+    jti: str  # JWT id of the revoked access token
+    user_id: str
+    expires_at: datetime  # token expiry; Mongo drops the entry after this
+    revoked_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "revoked_tokens"
+        indexes = [
+            IndexModel([("jti", ASCENDING)], unique=True),
+            IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+            IndexModel([("revoked_at", ASCENDING)]),
+        ]
@@ -2,6 +2,7 @@ from beanie import Document
 from pydantic import EmailStr, Field
 from typing import Optional
 from datetime import datetime
+from pymongo import ASCENDING, IndexModel
 
 
 class User(Document):
@@ -21,6 +22,15 @@ class User(Document):
 
     class Settings:
         name = "users"  # MongoDB collection name
+        indexes = [
+            IndexModel([("email", ASCENDING)], unique=True),
+            # Only Firebase users have a uid; local accounts leave it null
+            IndexModel(
+                [("firebase_uid", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"firebase_uid": {"$type": "string"}},
+            ),
+        ]
 
     model_config = {
         "json_schema_extra": {
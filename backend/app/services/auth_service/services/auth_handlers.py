@@ -1,10 +1,13 @@
 # app/services/auth_service/services/auth_handlers.py
 
-from app.services.auth_service.services.auth_utils import hash_password, verify_password
+from app.services.auth_service.services.auth_utils import hash_password_async, verify_and_update_password_async
 from app.services.auth_service.services.jwt_handler import create_access_token
 from app.services.auth_service.models.user import User
 from app.models.auth import UserSignup, UserLogin
 from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+from app.core import events
+from datetime import datetime
 
 
 async def signup_user(payload: UserSignup):
@@ -14,13 +17,18 @@ async def signup_user(payload: UserSignup):
 
     user = User(
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password_async(payload.password),
         role=payload.role,
         full_name=payload.full_name
     )
-    await user.insert()
+    try:
+        await user.insert()
+    except DuplicateKeyError:
+        # Lost a race with a concurrent signup for the same email
+        raise HTTPException(status_code=400, detail="Email already registered")
+    await events.publish(events.USER_EVENTS, [{"type": "signed_up", "user_id": str(user.id), "role": user.role, "at": user.created_at}])
     
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data={"sub": str(user.id), "role": user.role})
     
     user_dict = user.dict()
     user_dict["id"] = str(user.id)  # Convert ObjectId to string
@@ -31,10 +39,18 @@ async def signup_user(payload: UserSignup):
 
 async def login_user(payload: UserLogin):
     user = await User.find_one(User.email == payload.email)
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user or not user.hashed_password:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    
+    valid, new_hash = await verify_and_update_password_async(payload.password, user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Stored with an outdated cost; upgrade transparently
+        await user.set({User.hashed_password: new_hash})
+    await events.publish(events.USER_EVENTS, [{"type": "logged_in", "user_id": str(user.id), "role": user.role, "at": datetime.utcnow()}])
 
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data={"sub": str(user.id), "role": user.role})
     
     user_dict = user.dict()
     user_dict["id"] = str(user.id)  # Convert ObjectId to string
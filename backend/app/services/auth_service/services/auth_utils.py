@@ -1,8 +1,15 @@
 # app/services/auth_service/services/auth_utils.py
 
 from passlib.context import CryptContext
+from typing import Optional, Tuple
+from app.services.auth_service.utils.password_hash import password_hash_pool, calibrate_bcrypt_rounds
+from app.services.auth_service.config import (
+    PASSWORD_HASH_ROUNDS,
+    PASSWORD_HASH_TARGET_MS,
+    PASSWORD_HASH_MIN_ROUNDS,
+    PASSWORD_HASH_MAX_ROUNDS,
+)
 from app.services.auth_service.models.user import User
-from app.core.db import db
 from beanie import PydanticObjectId
 from fastapi import HTTPException
 from datetime import datetime
@@ -16,3 +23,41 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the password-hash pool, keeping the event loop free"""
+    return await password_hash_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password-hash pool, keeping the event loop free"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and, if its hash uses outdated parameters, return a fresh hash to store"""
+    valid, new_hash = await password_hash_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+    if new_hash:
+        password_hash_pool.rehashed += 1
+    return valid, new_hash
+
+
+async def calibrate_password_hashing() -> int:
+    """Pick the bcrypt cost for this host and make it the minimum for stored hashes"""
+    if PASSWORD_HASH_ROUNDS:
+        rounds, source = PASSWORD_HASH_ROUNDS, "pinned by PASSWORD_HASH_ROUNDS"
+    else:
+        rounds = await password_hash_pool.run(
+            calibrate_bcrypt_rounds, PASSWORD_HASH_TARGET_MS, PASSWORD_HASH_MIN_ROUNDS, PASSWORD_HASH_MAX_ROUNDS
+        )
+        source = (
+            f"calibrated for {PASSWORD_HASH_TARGET_MS:g} ms within "
+            f"{PASSWORD_HASH_MIN_ROUNDS}-{PASSWORD_HASH_MAX_ROUNDS}"
+        )
+    # default_rounds (not rounds, which would also cap the cost) so stronger
+    # existing hashes are never downgraded
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    password_hash_pool.rounds = rounds
+    print(f"Password hashing uses bcrypt cost {rounds} ({source})")
+    return rounds
@@ -2,9 +2,58 @@
 
 from app.services.firebase_service import firebase_service
 from app.services.auth_service.models.user import User
-from app.services.auth_service.services.jwt_handler import create_access_token
+from app.services.auth_service.services.jwt_handler import create_access_token, invalidate_principal
 from fastapi import HTTPException
 from typing import Optional
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.core import events
+
+
+async def _upsert_firebase_user(
+    firebase_uid: str, email: str, name: str, picture: str, email_verified: bool, role: str
+) -> User:
+    """Return the user for a Firebase identity, linking or creating it atomically.
+
+    Existing users matched by email or uid are linked to Firebase only if they
+    are not linked yet; new users get the Firebase profile and requested role.
+    """
+    unlinked = {"$eq": [{"$ifNull": ["$firebase_uid", None]}, None]}
+
+    # Values are wrapped in $literal so user-supplied strings starting with
+    # "$" are never read as field paths
+    def on_link(field: str, value):
+        return {"$cond": [unlinked, {"$literal": value}, f"${field}"]}
+
+    def on_insert(field: str, value):
+        return {"$ifNull": [f"${field}", {"$literal": value}]}
+
+    update = [{"$set": {
+        "email": on_insert("email", email),
+        "full_name": on_insert("full_name", name),
+        "role": on_insert("role", role),
+        "is_active": on_insert("is_active", True),
+        "created_at": on_insert("created_at", datetime.utcnow()),
+        "hashed_password": on_insert("hashed_password", None),  # No password for Firebase users
+        "firebase_uid": on_link("firebase_uid", firebase_uid),
+        "auth_provider": on_link("auth_provider", "firebase"),
+        "email_verified": on_link("email_verified", email_verified),
+        "profile_picture": on_link("profile_picture", picture) if picture else on_insert("profile_picture", None),
+    }}]
+    query = {"$or": [{"email": email}, {"firebase_uid": firebase_uid}]}
+
+    collection = User.get_motor_collection()
+    try:
+        document = await collection.find_one_and_update(
+            query, update, upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # A concurrent login created the user first; it now matches the query
+        document = await collection.find_one_and_update(
+            query, update, return_document=ReturnDocument.AFTER
+        )
+    return User.model_validate(document)
 
 
 async def handle_firebase_auth(firebase_token: str, role: str = "candidate") -> dict:
@@ -25,41 +74,13 @@ async def handle_firebase_auth(firebase_token: str, role: str = "candidate") ->
         if not email or not firebase_uid:
             raise HTTPException(status_code=400, detail="Email and UID are required")
         
-        # Check if user already exists
-        existing_user = await User.find_one(
-            {"$or": [
-                {"email": email},
-                {"firebase_uid": firebase_uid}
-            ]}
-        )
-        
-        if existing_user:
-            # Update existing user with Firebase data if needed
-            if not existing_user.firebase_uid:
-                existing_user.firebase_uid = firebase_uid
-                existing_user.auth_provider = "firebase"
-                existing_user.email_verified = email_verified
-                if picture:
-                    existing_user.profile_picture = picture
-                await existing_user.save()
-            
-            user = existing_user
-        else:
-            # Create new user
-            user = User(
-                email=email,
-                full_name=name,
-                role=role,
-                firebase_uid=firebase_uid,
-                profile_picture=picture,
-                auth_provider="firebase",
-                email_verified=email_verified,
-                hashed_password=None  # No password for Firebase users
-            )
-            await user.insert()
+        # Find-or-create in one atomic round trip (indexed on email and firebase_uid)
+        user = await _upsert_firebase_user(firebase_uid, email, name, picture, email_verified, role)
+        invalidate_principal(user.id)
+        await events.publish(events.USER_EVENTS, [{"type": "logged_in", "user_id": str(user.id), "role": user.role, "at": datetime.utcnow()}])
         
         # Generate JWT token
-        access_token = create_access_token(data={"sub": str(user.id)})
+        access_token = create_access_token(data={"sub": str(user.id), "role": user.role})
         
         # Prepare user response
         user_dict = user.dict()
@@ -100,6 +121,7 @@ async def link_firebase_account(user_id: str, firebase_token: str) -> dict:
             user.profile_picture = picture
         
         await user.save()
+        invalidate_principal(user.id)
         
         # Prepare user response
         user_dict = user.dict()
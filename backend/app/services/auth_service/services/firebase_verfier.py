@@ -0,0 +1,104 @@
+# app/services/auth_service/services/firebase_verfier.py
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.request
+from typing import Callable, Dict, Tuple
+
+from jose import JWTError, jwt
+
+from app.core.cache import TTLCache
+from app.services.auth_service.config import FIREBASE_CERTS_URL, FIREBASE_TOKEN_CACHE_MAX_SIZE
+
+# Firebase ID tokens live for one hour
+FIREBASE_TOKEN_LIFETIME_SECONDS = 3600
+
+# Used when the certificate response carries no usable max-age
+DEFAULT_CERTS_MAX_AGE = 300
+
+# An unknown "kid" forces a certificate refresh (keys rotated early), but no
+# more often than this.
+MIN_REFRESH_INTERVAL = 30
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def fetch_google_certificates(url: str = FIREBASE_CERTS_URL) -> Tuple[Dict[str, str], int]:
+    """Download the kid -> PEM certificate map and how long it may be cached"""
+    with urllib.request.urlopen(url, timeout=10) as response:
+        certificates = json.loads(response.read())
+        match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+    return certificates, int(match.group(1)) if match else DEFAULT_CERTS_MAX_AGE
+
+
+class FirebaseTokenVerifier:
+    """Verifies Firebase ID tokens without blocking the event loop.
+
+    Signature checks (and any certificate download) run in a worker thread.
+    Certificates are kept in memory until their Cache-Control expiry, and
+    successfully verified tokens are memoized until their own ``exp``.
+    """
+
+    def __init__(self, fetch_certificates: Callable[[], Tuple[Dict[str, str], int]] = fetch_google_certificates):
+        self._fetch_certificates = fetch_certificates
+        self._certificates: Dict[str, str] = {}
+        self._certificates_expire_at = 0.0
+        self._last_fetch = 0.0
+        self._lock = threading.Lock()
+        self._verified = TTLCache(maxsize=FIREBASE_TOKEN_CACHE_MAX_SIZE, ttl=FIREBASE_TOKEN_LIFETIME_SECONDS)
+        self.certificate_fetches = 0
+
+    def _get_certificate(self, kid: str) -> str:
+        with self._lock:
+            now = time.time()
+            stale = now >= self._certificates_expire_at
+            rotated = kid not in self._certificates and now - self._last_fetch >= MIN_REFRESH_INTERVAL
+            if stale or rotated:
+                certificates, max_age = self._fetch_certificates()
+                self._certificates = certificates
+                self._certificates_expire_at = now + max_age
+                self._last_fetch = now
+                self.certificate_fetches += 1
+
+            certificate = self._certificates.get(kid)
+        if certificate is None:
+            raise JWTError(f"No Firebase signing certificate for kid {kid!r}")
+        return certificate
+
+    def _verify_sync(self, token: str, project_id: str) -> dict:
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") != "RS256":
+            raise JWTError("Firebase ID tokens must be signed with RS256")
+
+        payload = jwt.decode(
+            token,
+            self._get_certificate(header.get("kid")),
+            algorithms=["RS256"],
+            audience=project_id,
+            issuer=f"https://securetoken.google.com/{project_id}",
+        )
+        if not payload.get("sub"):
+            raise JWTError("Firebase ID token has no subject")
+        if payload.get("auth_time", 0) > time.time() + 60:
+            raise JWTError("Firebase ID token auth_time is in the future")
+
+        payload["uid"] = payload["sub"]
+        return payload
+
+    async def verify(self, token: str, project_id: str) -> dict:
+        """Decoded token claims; raises JWTError if the token is not valid"""
+        key = hashlib.sha256(f"{project_id}:{token}".encode()).hexdigest()
+        cached = self._verified.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        payload = await asyncio.to_thread(self._verify_sync, token, project_id)
+        self._verified.set(key, payload, ttl=payload["exp"] - time.time())
+        return dict(payload)
+
+
+firebase_token_verifier = FirebaseTokenVerifier()
@@ -5,41 +5,119 @@ from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status, Request
 from app.services.auth_service.models.user import User
-from app.core.db import db
+from app.services.auth_service.services.token_revocation import token_revocation_store
+from app.services.auth_service.config import (
+    PRINCIPAL_CACHE_TTL_SECONDS,
+    PRINCIPAL_CACHE_MAX_SIZE,
+    TOKEN_CACHE_MAX_SIZE,
+)
+from app.core.cache import TTLCache
+import hashlib
 import os
+import time
+import uuid
 
 SECRET_KEY = os.getenv("JWT_SECRET", "secret")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# user id -> user dict as returned by get_current_user
+_principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_MAX_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+# sha256(token) -> decoded payload; entries expire with the token itself
+_token_cache = TTLCache(maxsize=TOKEN_CACHE_MAX_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(request: Request):
+def decode_access_token(token: str) -> dict:
+    """Verify and decode a token, memoizing the result until the token expires"""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    expires_in = payload.get("exp", 0) - time.time()
+    _token_cache.set(key, payload, ttl=expires_in)
+    return payload
+
+
+async def revoke_access_token(token: str) -> None:
+    """Revoke a token until it expires; tokens that no longer verify need no revocation"""
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        return
+    if payload.get("jti") and payload.get("sub"):
+        await token_revocation_store.revoke(
+            payload["jti"], payload["sub"], datetime.utcfromtimestamp(payload["exp"])
+        )
+
+
+def invalidate_principal(user_id: str) -> None:
+    """Drop the cached principal after the user document changes"""
+    _principal_cache.pop(str(user_id))
+
+
+def _bearer_token(request: Request) -> str:
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Invalid auth header")
-    token = auth_header.split(" ")[1]
+    return auth_header.split(" ")[1]
+
 
+async def _token_payload(request: Request) -> dict:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-        user = await User.get(user_id)
-        if user is None:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        user_dict = user.dict()
-        user_dict["id"] = str(user.id)  # Convert ObjectId to string
-        user_dict.pop("hashed_password", None)  # Remove password from response
-        
-        return user_dict
+        payload = decode_access_token(_bearer_token(request))
     except JWTError:
-        raise HTTPException(status_code=403, detail="Invalid token")
\ No newline at end of file
+        raise HTTPException(status_code=403, detail="Invalid token")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+    if payload.get("jti") and await token_revocation_store.is_revoked(payload["jti"]):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return payload
+
+
+async def get_current_user(request: Request):
+    payload = await _token_payload(request)
+    user_id = payload["sub"]
+
+    cached = _principal_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
+
+    user = await User.get(user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user_dict = user.dict()
+    user_dict["id"] = str(user.id)  # Convert ObjectId to string
+    user_dict.pop("hashed_password", None)  # Remove password from response
+
+    _principal_cache.set(user_id, user_dict)
+    return dict(user_dict)
+
+
+async def get_current_principal(request: Request):
+    """Id and role straight from the signed token, for routes that only need a role check.
+
+    Tokens issued before role claims existed fall back to get_current_user.
+    """
+    payload = await _token_payload(request)
+    if payload.get("role"):
+        return {"id": payload["sub"], "role": payload["role"]}
+    return await get_current_user(request)
+
+
+async def get_optional_principal(request: Request):
+    """Like get_current_principal, but anonymous requests get None instead of a 401"""
+    if not request.headers.get("Authorization"):
+        return None
+    return await get_current_principal(request)
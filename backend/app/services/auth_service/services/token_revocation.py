@@ -0,0 +1,111 @@
+# app/services/auth_service/services/token_revocation.py
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
+
+from app.core.bloom import BloomFilter
+from app.services.auth_service.models.revoked_token import RevokedToken
+from app.services.auth_service.config import (
+    REVOCATION_BLOOM_CAPACITY,
+    REVOCATION_BLOOM_ERROR_RATE,
+    REVOCATION_SYNC_INTERVAL_SECONDS,
+    REVOCATION_REBUILD_INTERVAL_SECONDS,
+)
+
+# Re-read a little history on every sync so revocations written by other
+# workers with slightly skewed clocks are not missed.
+SYNC_OVERLAP = timedelta(seconds=max(30, 2 * REVOCATION_SYNC_INTERVAL_SECONDS))
+
+
+class _JtiView(BaseModel):
+    jti: str
+
+
+class TokenRevocationStore:
+    """Revoked token ids in Mongo (TTL-indexed), fronted by an in-process Bloom filter.
+
+    A token whose jti is not in the filter is definitely not revoked, so the
+    common case never touches the database; a filter hit is confirmed
+    against the collection.
+    """
+
+    def __init__(self):
+        self._bloom = self._new_filter()
+        self._synced_until: Optional[datetime] = None
+        self._last_rebuild = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _new_filter() -> BloomFilter:
+        return BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+
+    async def revoke(self, jti: str, user_id: str, expires_at: datetime) -> None:
+        try:
+            await RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at).insert()
+        except DuplicateKeyError:
+            pass  # already revoked
+        self._bloom.add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        if jti not in self._bloom:
+            return False
+        return await RevokedToken.find_one(RevokedToken.jti == jti) is not None
+
+    async def rebuild(self) -> None:
+        """Replace the filter with one built from all unexpired revocations"""
+        started = datetime.utcnow()
+        bloom = self._new_filter()
+        async for entry in RevokedToken.find(
+            RevokedToken.expires_at > started, projection_model=_JtiView
+        ):
+            bloom.add(entry.jti)
+
+        self._bloom = bloom
+        self._synced_until = started
+        self._last_rebuild = time.monotonic()
+        # Pick up anything revoked while the scan was running
+        await self.sync()
+
+    async def sync(self) -> None:
+        """Add revocations made since the last sync (possibly by other workers)"""
+        if self._synced_until is None:
+            return await self.rebuild()
+
+        started = datetime.utcnow()
+        async for entry in RevokedToken.find(
+            RevokedToken.revoked_at >= self._synced_until - SYNC_OVERLAP, projection_model=_JtiView
+        ):
+            self._bloom.add(entry.jti)
+        self._synced_until = started
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(REVOCATION_SYNC_INTERVAL_SECONDS)
+            try:
+                if time.monotonic() - self._last_rebuild >= REVOCATION_REBUILD_INTERVAL_SECONDS:
+                    await self.rebuild()
+                else:
+                    await self.sync()
+            except Exception as e:
+                print(f"Error syncing revoked tokens: {e}")
+
+    async def start(self) -> None:
+        await self.rebuild()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+token_revocation_store = TokenRevocationStore()
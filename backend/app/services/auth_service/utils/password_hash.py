@@ -0,0 +1,119 @@
+# app/services/auth_service/utils/password_hash.py
+
+import asyncio
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException
+
+from app.services.auth_service.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+
+# Window over which hashing throughput is reported
+THROUGHPUT_WINDOW_SECONDS = 60
+
+
+class PasswordHashPool:
+    """Bounded worker pool for bcrypt hashing and verification.
+
+    bcrypt releases the GIL, so a small thread pool gives real parallelism
+    while keeping the event loop free. Calls beyond ``max_pending`` are shed
+    immediately instead of queueing behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+        self._peak_pending = 0
+        self._recent = deque()  # completion times within the throughput window
+        self.rounds = None  # bcrypt cost in use, set once calibrated
+        self.rehashed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        self._peak_pending = max(self._peak_pending, self._pending)
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self._get_executor(), _timed, func, *args)
+        finally:
+            self._pending -= 1
+
+        # Counters are only touched from the event loop thread
+        self._busy_seconds += elapsed
+        self._completed += 1
+        self._recent.append(time.monotonic())
+        return result
+
+    def _throughput(self) -> float:
+        cutoff = time.monotonic() - THROUGHPUT_WINDOW_SECONDS
+        while self._recent and self._recent[0] < cutoff:
+            self._recent.popleft()
+        return len(self._recent) / THROUGHPUT_WINDOW_SECONDS
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": min(self._pending, self.workers),
+            "queue_depth": max(0, self._pending - self.workers),
+            "peak_pending": self._peak_pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_duration_ms": round(1000 * self._busy_seconds / self._completed, 2) if self._completed else None,
+            "throughput_per_second": round(self._throughput(), 3),
+            "bcrypt_rounds": self.rounds,
+            "rehashed": self.rehashed,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _timed(func: Callable[..., Any], *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """Highest bcrypt cost whose hash/verify time on this host stays within target_ms.
+
+    Each extra round doubles the work, so timing the minimum cost (best of
+    three, to skip warm-up noise) is enough to extrapolate.
+    """
+    from passlib.hash import bcrypt
+
+    hasher = bcrypt.using(rounds=min_rounds)
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        hasher.hash("calibration-password")
+        best = min(best, time.perf_counter() - started)
+
+    extra = math.floor(math.log2(target_ms / (best * 1000))) if best > 0 else 0
+    return max(min_rounds, min(max_rounds, min_rounds + extra))
+
+
+password_hash_pool = PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
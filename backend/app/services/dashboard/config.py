@@ -0,0 +1,17 @@
+# app/services/dashboard/config.py
+
+import os
+
+# Default per-widget budget; a slower widget is reported as timed out
+DASHBOARD_WIDGET_TIMEOUT_SECONDS = float(os.getenv("DASHBOARD_WIDGET_TIMEOUT_SECONDS", "2.0"))
+
+# Cached widget results per widget (one entry per user)
+DASHBOARD_WIDGET_CACHE_MAX_SIZE = int(os.getenv("DASHBOARD_WIDGET_CACHE_MAX_SIZE", "10000"))
+
+# Snapshots older than this are rebuilt even without an invalidating event
+DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv("DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS", "300"))
+
+# Users who loaded a dashboard this recently are kept warm in the background
+DASHBOARD_HOT_USER_WINDOW_SECONDS = int(os.getenv("DASHBOARD_HOT_USER_WINDOW_SECONDS", "900"))
+DASHBOARD_SNAPSHOT_REFRESH_INTERVAL_SECONDS = int(os.getenv("DASHBOARD_SNAPSHOT_REFRESH_INTERVAL_SECONDS", "15"))
+DASHBOARD_SNAPSHOT_REFRESH_BATCH = int(os.getenv("DASHBOARD_SNAPSHOT_REFRESH_BATCH", "50"))
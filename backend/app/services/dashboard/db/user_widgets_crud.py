@@ -0,0 +1,61 @@
+# app/services/dashboard/db/user_widgets_crud.py
+
+from app.services.dashboard.models.dashboard import DashboardSnapshot
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+from typing import Iterable, List, Optional
+
+# Reads refresh last_read_at at most this often, so hot users cost no write per load
+READ_TOUCH_INTERVAL = timedelta(seconds=60)
+
+
+def _collection():
+    return DashboardSnapshot.get_motor_collection()
+
+
+async def get_snapshot(user_id: str, role: str) -> Optional[DashboardSnapshot]:
+    return await DashboardSnapshot.find_one(DashboardSnapshot.user_id == user_id, DashboardSnapshot.role == role)
+
+
+async def touch_snapshot(snapshot: DashboardSnapshot) -> None:
+    now = datetime.utcnow()
+    if now - snapshot.last_read_at >= READ_TOUCH_INTERVAL:
+        await _collection().update_one({"_id": snapshot.id}, {"$set": {"last_read_at": now}})
+
+
+async def save_snapshot(user_id: str, role: str, payload: dict, version: int) -> bool:
+    """Store a freshly built dashboard unless it was invalidated while building"""
+    now = datetime.utcnow()
+    try:
+        await _collection().update_one(
+            {"user_id": user_id, "role": role, "version": version},
+            {
+                "$set": {"payload": payload, "built_at": now, "stale": False, "dirty_widgets": []},
+                "$setOnInsert": {"last_read_at": now},
+            },
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False  # version moved on; leave it stale for the next rebuild
+    return True
+
+
+async def invalidate_snapshots(role: str, user_ids: Iterable[str], widgets: Iterable[str]) -> None:
+    """Mark snapshots stale and remember which widgets the next rebuild must render fresh"""
+    user_ids = list(set(user_ids))
+    if user_ids:
+        await _collection().update_many(
+            {"role": role, "user_id": {"$in": user_ids}},
+            {
+                "$set": {"stale": True},
+                "$inc": {"version": 1},
+                "$addToSet": {"dirty_widgets": {"$each": sorted(set(widgets))}},
+            },
+        )
+
+
+async def get_snapshots_to_refresh(hot_since: datetime, built_before: datetime, limit: int) -> List[DashboardSnapshot]:
+    """Snapshots of recently active users that are stale or getting old"""
+    return await DashboardSnapshot.find(
+        {"last_read_at": {"$gte": hot_since}, "$or": [{"stale": True}, {"built_at": {"$lt": built_before}}]}
+    ).limit(limit).to_list()
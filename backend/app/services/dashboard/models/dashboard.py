@@ -0,0 +1,36 @@
+# app/services/dashboard/models/dashboard.py
+
+from beanie import Document
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pymongo import ASCENDING, IndexModel
+
+class WidgetResult(BaseModel):
+    status: str  # "ok", "cached", "timeout" or "error"
+    data: Optional[Any] = None
+    latency_ms: float
+
+class DashboardResponse(BaseModel):
+    role: str
+    widgets: Dict[str, WidgetResult]
+    latency_ms: float  # whole dashboard; roughly the slowest widget
+    snapshot_at: Optional[datetime] = None  # set when served from a stored snapshot
+
+class DashboardSnapshot(Document):
+    """Last assembled dashboard of one user in one role"""
+    user_id: str
+    role: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    built_at: datetime = Field(default_factory=datetime.utcnow)
+    last_read_at: datetime = Field(default_factory=datetime.utcnow)
+    stale: bool = False
+    version: int = 0  # bumped on every invalidation so a slow rebuild cannot clobber it
+    dirty_widgets: List[str] = Field(default_factory=list)  # invalidated since the last build, on any worker
+
+    class Settings:
+        name = "dashboard_snapshots"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("role", ASCENDING)], unique=True),
+            IndexModel([("last_read_at", ASCENDING)]),
+        ]
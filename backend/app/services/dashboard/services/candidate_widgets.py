@@ -1,12 +1,65 @@
 # app/services/dashboard/services/candidate_widgets.py
 
-async def get_candidate_summary():
+from app.services.application.models.application import Application
+from app.services.dashboard.services.dashboard_snapshots import get_dashboard
+from app.services.dashboard.services.widtet_registry import widget_registry
+from app.services.job.models.job import Job, JobStatus
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+from typing import List
+
+ROLE = "candidate"
+RECOMMENDED_JOBS_LIMIT = 5
+
+
+class _JobCard(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    company: str
+    location: str
+
+
+@widget_registry.widget(ROLE, "applications", ttl=30)
+async def applications(user_id: str) -> dict:
+    """Applications submitted, in total and per status"""
+    rows = await Application.get_motor_collection().aggregate([
+        {"$match": {"candidate_id": user_id}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ]).to_list(None)
+    by_status = {row["_id"]: row["count"] for row in rows}
     return {
-        "applications_submitted": 12,
-        "interviews_scheduled": 3,
-        "saved_jobs": 5,
-        "recommended_jobs": [
-            {"title": "Frontend Developer", "company": "Meta", "location": "Remote"},
-            {"title": "Data Scientist", "company": "Google", "location": "Bangalore"},
-        ]
+        "total": sum(by_status.values()),
+        "interviews_scheduled": by_status.get("interview_scheduled", 0),
+        "by_status": by_status,
     }
+
+
+@widget_registry.widget(ROLE, "saved_jobs", ttl=30)
+async def saved_jobs(user_id: str) -> int:
+    from app.routes import favorites  # favorites are still kept in memory
+    return sum(1 for favorite in favorites.favorites_db if favorite["user_id"] == user_id)
+
+
+@widget_registry.widget(ROLE, "recommended_jobs", ttl=300)
+async def recommended_jobs(user_id: str) -> List[dict]:
+    """Jobs similar to the latest one applied to, else the newest openings"""
+    latest = await Application.find(Application.candidate_id == user_id).sort(-Application.applied_at).limit(1).to_list()
+    if latest:
+        try:
+            job = await Job.get(PydanticObjectId(latest[0].job_id))
+        except Exception:
+            job = None
+        if job and job.similar_jobs:
+            return [item.model_dump() for item in job.similar_jobs[:RECOMMENDED_JOBS_LIMIT]]
+
+    jobs = await Job.find(
+        Job.status == JobStatus.ACTIVE, projection_model=_JobCard
+    ).sort(-Job.created_at).limit(RECOMMENDED_JOBS_LIMIT).to_list()
+    return [
+        {"job_id": str(job.id), "title": job.title, "company": job.company, "location": job.location}
+        for job in jobs
+    ]
+
+
+async def get_candidate_summary(user_id: str):
+    return await get_dashboard(ROLE, user_id)
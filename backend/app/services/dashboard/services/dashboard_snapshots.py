@@ -0,0 +1,120 @@
+# app/services/dashboard/services/dashboard_snapshots.py
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from app.core import events
+from app.services.dashboard.config import (
+    DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS,
+    DASHBOARD_HOT_USER_WINDOW_SECONDS,
+    DASHBOARD_SNAPSHOT_REFRESH_INTERVAL_SECONDS,
+    DASHBOARD_SNAPSHOT_REFRESH_BATCH,
+)
+from app.services.dashboard.db import user_widgets_crud
+from app.services.dashboard.models.dashboard import DashboardResponse
+from app.services.dashboard.services.widtet_registry import widget_registry
+
+MAX_AGE = timedelta(seconds=DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS)
+
+# Widgets whose data each kind of event can change, per role
+APPLICATION_WIDGETS = {
+    "candidate": {"applications", "recommended_jobs"},
+    "employer": {"applications_received", "recent_applications", "hiring_funnel"},
+}
+JOB_WIDGETS = {"employer": {"job_posts"}}
+FAVORITE_WIDGETS = {"candidate": {"saved_jobs"}}
+
+
+async def _rebuild(role: str, user_id: str, version: int, dirty_widgets: Iterable[str] = ()) -> DashboardResponse:
+    # Widgets invalidated on any worker since the last build skip their
+    # (per-worker) cache; the rest reuse whatever is still cached here
+    dashboard = await widget_registry.render(role, user_id, refresh=dirty_widgets)
+    # Timed-out or failed widgets are not worth pinning into a snapshot
+    if all(widget.status in ("ok", "cached") for widget in dashboard.widgets.values()):
+        await user_widgets_crud.save_snapshot(user_id, role, dashboard.model_dump(mode="json"), version)
+    return dashboard
+
+
+async def get_dashboard(role: str, user_id: str) -> DashboardResponse:
+    """Serve the stored snapshot when it is current, otherwise build and store one"""
+    snapshot = await user_widgets_crud.get_snapshot(user_id, role)
+    if snapshot is not None and not snapshot.stale and datetime.utcnow() - snapshot.built_at < MAX_AGE:
+        await user_widgets_crud.touch_snapshot(snapshot)
+        return DashboardResponse(**{**snapshot.payload, "snapshot_at": snapshot.built_at})
+    if snapshot is None:
+        return await _rebuild(role, user_id, 0)
+    return await _rebuild(role, user_id, snapshot.version, snapshot.dirty_widgets)
+
+
+async def _invalidate(targets, widgets) -> None:
+    for role, user_ids in targets.items():
+        for user_id in user_ids:
+            widget_registry.invalidate(role, user_id, widgets[role])
+        await user_widgets_crud.invalidate_snapshots(role, user_ids, widgets[role])
+
+
+async def _on_application_events(batch: List[dict]) -> None:
+    targets = defaultdict(set)
+    for event in batch:
+        targets["candidate"].add(event["candidate_id"])
+        if event.get("employer_id"):
+            targets["employer"].add(event["employer_id"])
+    await _invalidate(targets, APPLICATION_WIDGETS)
+
+
+async def _on_job_events(batch: List[dict]) -> None:
+    # Candidate recommendations just age out; they are not worth a fan-out
+    await _invalidate({"employer": {event["employer_id"] for event in batch}}, JOB_WIDGETS)
+
+
+async def _on_favorite_events(batch: List[dict]) -> None:
+    await _invalidate({"candidate": {event["user_id"] for event in batch}}, FAVORITE_WIDGETS)
+
+events.subscribe(events.APPLICATION_EVENTS, _on_application_events)
+events.subscribe(events.JOB_EVENTS, _on_job_events)
+events.subscribe(events.FAVORITE_EVENTS, _on_favorite_events)
+
+
+class DashboardSnapshotRefresher:
+    """Rebuilds stale or ageing snapshots of recently active users in the background"""
+
+    def __init__(self, interval: int = DASHBOARD_SNAPSHOT_REFRESH_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> int:
+        now = datetime.utcnow()
+        snapshots = await user_widgets_crud.get_snapshots_to_refresh(
+            hot_since=now - timedelta(seconds=DASHBOARD_HOT_USER_WINDOW_SECONDS),
+            # Rebuild slightly before expiry so hot users never see a cold load
+            built_before=now - MAX_AGE + timedelta(seconds=2 * self.interval),
+            limit=DASHBOARD_SNAPSHOT_REFRESH_BATCH,
+        )
+        for snapshot in snapshots:
+            await _rebuild(snapshot.role, snapshot.user_id, snapshot.version, snapshot.dirty_widgets)
+        return len(snapshots)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Error refreshing dashboard snapshots: {e}")
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+dashboard_snapshot_refresher = DashboardSnapshotRefresher()
@@ -1,15 +1,66 @@
 # app/services/dashboard/services/employer_widgets.py
 
-async def get_employer_summary():
-    return {
-        "total_job_posts": 8,
-        "applications_received": 42,
-        "recent_applications": [
-            {"candidate": "John Doe", "job_title": "UX Designer", "status": "Pending"},
-            {"candidate": "Ayesha Khan", "job_title": "Backend Dev", "status": "Interview Scheduled"},
-        ],
-        "analytics": {
-            "job_views": 240,
-            "profile_visits": 98
+from app.services.analytics.services.hiring_funnel import get_funnel_report
+from app.services.analytics.services.insights_aggregator import EMPLOYER
+from app.services.application.db import application_crud
+from app.services.application.services.application_counters import get_employer_counters
+from app.services.dashboard.services.dashboard_snapshots import get_dashboard
+from app.services.dashboard.services.widtet_registry import widget_registry
+from app.services.job.models.job import Job
+from collections import Counter
+from typing import List
+
+ROLE = "employer"
+RECENT_APPLICATIONS_LIMIT = 5
+
+
+@widget_registry.widget(ROLE, "job_posts", ttl=60)
+async def job_posts(user_id: str) -> dict:
+    """Jobs posted, in total and per status"""
+    rows = await Job.get_motor_collection().aggregate([
+        {"$match": {"employer_id": user_id}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ]).to_list(None)
+    by_status = {row["_id"]: row["count"] for row in rows}
+    return {"total": sum(by_status.values()), "by_status": by_status}
+
+
+@widget_registry.widget(ROLE, "applications_received", ttl=30)
+async def applications_received(user_id: str) -> dict:
+    """Summed from the per-job counters, so cost follows jobs, not applications"""
+    total, by_status = 0, Counter()
+    for counters in await get_employer_counters(user_id):
+        total += counters["total"]
+        by_status.update(counters["by_status"])
+    return {"total": total, "by_status": dict(by_status)}
+
+
+@widget_registry.widget(ROLE, "recent_applications", ttl=15)
+async def recent_applications(user_id: str) -> List[dict]:
+    page = await application_crud.get_applications_by_employer(user_id, limit=RECENT_APPLICATIONS_LIMIT)
+    return [
+        {
+            "application_id": item["id"],
+            "candidate_id": item["candidate_id"],
+            "job_title": item.get("job_title"),
+            "status": item["status"],
+            "applied_at": item["applied_at"],
         }
+        for item in page["items"]
+    ]
+
+
+@widget_registry.widget(ROLE, "hiring_funnel", ttl=60)
+async def hiring_funnel(user_id: str) -> dict:
+    """Conversion and time-to-hire across all of the employer's jobs"""
+    report = await get_funnel_report(EMPLOYER, user_id)
+    return {
+        "applied": report["applied"],
+        "hire_rate": report["hire_rate"],
+        "stages": [{"stage": stage["stage"], "entered": stage["entered"], "conversion": stage["conversion"]} for stage in report["stages"]],
+        "time_to_hire": report["time_to_hire"],
     }
+
+
+async def get_employer_summary(user_id: str):
+    return await get_dashboard(ROLE, user_id)
@@ -0,0 +1,103 @@
+# app/services/dashboard/services/widtet_registry.py
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from app.core.cache import TTLCache
+from app.services.dashboard.config import DASHBOARD_WIDGET_TIMEOUT_SECONDS, DASHBOARD_WIDGET_CACHE_MAX_SIZE
+from app.services.dashboard.models.dashboard import DashboardResponse, WidgetResult
+
+# Takes the user id, returns the widget's JSON-serialisable data
+WidgetProvider = Callable[[str], Awaitable[Any]]
+
+
+class Widget:
+    def __init__(self, name: str, provider: WidgetProvider, ttl: float, timeout: float):
+        self.name = name
+        self.provider = provider
+        self.timeout = timeout
+        self.cache = TTLCache(maxsize=DASHBOARD_WIDGET_CACHE_MAX_SIZE, ttl=ttl) if ttl > 0 else None
+        # When each user's entry was last invalidated, so a render already in
+        # flight at that moment does not put its older result back
+        self.invalidated_at = TTLCache(maxsize=DASHBOARD_WIDGET_CACHE_MAX_SIZE, ttl=ttl) if ttl > 0 else None
+
+
+class WidgetRegistry:
+    """Dashboard widgets per role, rendered concurrently.
+
+    Every widget has its own cache TTL and time budget. A widget that misses
+    its budget is reported as timed out while the others still render; it
+    keeps running in the background so its result warms the cache for the
+    next load.
+    """
+
+    def __init__(self):
+        self._widgets: Dict[str, Dict[str, Widget]] = {}
+
+    def widget(self, role: str, name: str, ttl: float = 30, timeout: float = DASHBOARD_WIDGET_TIMEOUT_SECONDS):
+        def register(provider: WidgetProvider) -> WidgetProvider:
+            self._widgets.setdefault(role, {})[name] = Widget(name, provider, ttl, timeout)
+            return provider
+        return register
+
+    def names(self, role: str):
+        return list(self._widgets.get(role, {}))
+
+    def invalidate(self, role: str, user_id: str, names: Optional[Iterable[str]] = None) -> None:
+        """Drop cached results of the named widgets (all of the role's by default)"""
+        names = None if names is None else set(names)
+        for widget in self._widgets.get(role, {}).values():
+            if widget.cache is not None and (names is None or widget.name in names):
+                widget.cache.pop(user_id)
+                widget.invalidated_at.set(user_id, time.perf_counter())
+
+    async def _render_one(self, widget: Widget, user_id: str, fresh: bool) -> Tuple[str, WidgetResult]:
+        started = time.perf_counter()
+
+        def result(status: str, data: Any = None) -> Tuple[str, WidgetResult]:
+            latency_ms = round((time.perf_counter() - started) * 1000, 2)
+            return widget.name, WidgetResult(status=status, data=data, latency_ms=latency_ms)
+
+        if widget.cache is not None and not fresh:
+            cached = widget.cache.get(user_id)
+            if cached is not None:
+                return result("cached", cached)
+
+        task = asyncio.ensure_future(widget.provider(user_id))
+        # Runs even after a timeout, when nothing awaits the shielded task any more
+        task.add_done_callback(lambda done: _settle(widget, user_id, started, done))
+        try:
+            return result("ok", await asyncio.wait_for(asyncio.shield(task), widget.timeout))
+        except asyncio.TimeoutError:
+            return result("timeout")
+        except Exception as e:
+            print(f"Error rendering dashboard widget {widget.name}: {e}")
+            return result("error")
+
+    async def render(self, role: str, user_id: str, refresh: Iterable[str] = ()) -> DashboardResponse:
+        """Render every widget of the role; those named in ``refresh`` skip their cached result but still refill it"""
+        started = time.perf_counter()
+        refresh = set(refresh)
+        rendered = await asyncio.gather(
+            *(self._render_one(widget, user_id, widget.name in refresh) for widget in self._widgets.get(role, {}).values())
+        )
+        return DashboardResponse(
+            role=role,
+            widgets=dict(rendered),
+            latency_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+
+def _settle(widget: Widget, user_id: str, started: float, task: asyncio.Future) -> None:
+    """Cache a finished render; always retrieves a failure, so a late one is not reported as unretrieved"""
+    if task.cancelled() or task.exception() is not None:
+        return
+    if widget.cache is None or task.result() is None:
+        return
+    if widget.invalidated_at.get(user_id, float("-inf")) >= started:
+        return  # invalidated while rendering; the result may predate the change
+    widget.cache.set(user_id, task.result())
+
+
+widget_registry = WidgetRegistry()
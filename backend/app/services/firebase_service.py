@@ -71,20 +71,35 @@
 
 # app/services/firebase_service.py
 
-import firebase_admin
-from firebase_admin import credentials, auth
+import asyncio
 import os
 import json
 from fastapi import HTTPException
 from typing import Optional
+from app.services.auth_service.config import FIREBASE_PROJECT_ID
+from app.services.auth_service.services.firebase_verfier import firebase_token_verifier
 
 class FirebaseService:
+    """Firebase Admin SDK wrapper; the SDK is imported and initialized on first use"""
+    
     def __init__(self):
-        self.app = None
-        self.initialize_firebase()
+        self._app = None
+        self._initialized = False
+    
+    @property
+    def app(self):
+        if not self._initialized:
+            self._initialized = True
+            self.initialize_firebase()
+        return self._app
     
     def initialize_firebase(self):
         """Initialize Firebase Admin SDK"""
+        # firebase_admin and its transitive deps are slow to import; keep them
+        # off the startup path until Firebase is actually needed
+        import firebase_admin
+        from firebase_admin import credentials
+        
         try:
             # Check if Firebase app is already initialized
             if not firebase_admin._apps:
@@ -93,28 +108,36 @@ class FirebaseService:
                 
                 if not os.path.exists(service_account_path):
                     print("Firebase service account file not found. Skipping Firebase initialization for testing.")
-                    self.app = None
+                    self._app = None
                     return
                 
                 cred = credentials.Certificate(service_account_path)
-                self.app = firebase_admin.initialize_app(cred)
+                self._app = firebase_admin.initialize_app(cred)
                 print("Firebase Admin SDK initialized successfully")
             else:
-                self.app = firebase_admin.get_app()
+                self._app = firebase_admin.get_app()
                 print("Firebase Admin SDK already initialized")
         except Exception as e:
             print(f"Error initializing Firebase: {e}")
             # For testing, don't raise the error
-            self.app = None
+            self._app = None
+    
+    @property
+    def project_id(self) -> Optional[str]:
+        # An explicitly configured project id avoids initializing the SDK at all
+        if FIREBASE_PROJECT_ID:
+            return FIREBASE_PROJECT_ID
+        return self.app.project_id if self.app is not None else None
     
     async def verify_firebase_token(self, token: str) -> Optional[dict]:
         """Verify Firebase ID token and return user data"""
         try:
-            if self.app is None:
-                print("Firebase not initialized, skipping token verification")
+            project_id = self.project_id
+            if not project_id:
+                print("Firebase project not configured, skipping token verification")
                 return None
-            # Verify the token
-            decoded_token = auth.verify_id_token(token)
+            # Verified off the event loop against cached Google certificates
+            decoded_token = await firebase_token_verifier.verify(token, project_id)
             return decoded_token
         except Exception as e:
             print(f"Error verifying Firebase token: {e}")
@@ -126,7 +149,8 @@ class FirebaseService:
             if self.app is None:
                 print("Firebase not initialized, skipping user lookup")
                 return None
-            user_record = auth.get_user(uid)
+            from firebase_admin import auth
+            user_record = await asyncio.to_thread(auth.get_user, uid)
             return {
                 'uid': user_record.uid,
                 'email': user_record.email,
@@ -148,5 +172,5 @@ class FirebaseService:
             print(f"Error getting user by UID: {e}")
             return None
 
-# Create global instance
+# Create global instance (cheap: nothing is initialized until first use)
 firebase_service = FirebaseService()
\ No newline at end of file
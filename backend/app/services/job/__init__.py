@@ -1,3 +1,3 @@
-from .job_service import list_jobs, get_job, create_job, apply_to_job
+from .job_service import list_jobs, get_job, create_job, update_job_status, get_similar_jobs, apply_to_job
 
-__all__ = ["list_jobs", "get_job", "create_job", "apply_to_job"]
\ No newline at end of file
+__all__ = ["list_jobs", "get_job", "create_job", "update_job_status", "get_similar_jobs", "apply_to_job"]
\ No newline at end of file
@@ -0,0 +1,16 @@
+# app/services/job/config.py
+
+import os
+
+# Number of related jobs kept on each job for the "similar jobs" rail
+SIMILAR_JOBS_TOP_K = int(os.getenv("SIMILAR_JOBS_TOP_K", "10"))
+
+# Weight of title words relative to required skills when comparing jobs
+SIMILAR_JOBS_TITLE_WEIGHT = float(os.getenv("SIMILAR_JOBS_TITLE_WEIGHT", "0.5"))
+
+# The in-memory feature matrix used for incremental updates is reloaded from
+# Mongo when older than this, picking up jobs opened or closed by other workers
+SIMILAR_JOBS_INDEX_MAX_AGE_SECONDS = int(os.getenv("SIMILAR_JOBS_INDEX_MAX_AGE_SECONDS", "300"))
+
+# Queued open/close changes are applied in the background at least this often
+SIMILAR_JOBS_UPDATE_INTERVAL_SECONDS = float(os.getenv("SIMILAR_JOBS_UPDATE_INTERVAL_SECONDS", "2.0"))
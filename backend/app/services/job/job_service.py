@@ -1,8 +1,16 @@
 from typing import List
 from app.models.jobs import JobCreate, JobResponse
-from app.services.job.models.job import Job
+from app.services.job.models.job import Job, JobStatus, SimilarJob
+from app.services.application.db.job_permission_check import forget_job
+from app.services.job.services.similar_jobs_updater import similar_jobs_updater
+from app.core import events
+from beanie import PydanticObjectId
 from datetime import datetime
 from fastapi import HTTPException
+from pydantic import BaseModel
+
+class _SimilarJobsView(BaseModel):
+    similar_jobs: List[SimilarJob] = []
 
 async def list_jobs() -> List[JobResponse]:
     """Get all active jobs"""
@@ -77,6 +85,8 @@ async def create_job(job_create: JobCreate, employer_id: str) -> JobResponse:
     )
     
     await job.insert()
+    _refresh_similar_jobs(job, None)
+    await events.publish(events.JOB_EVENTS, [{"type": "created", "job_id": str(job.id), "employer_id": employer_id, "status": job.status.value, "at": job.created_at}])
     
     return JobResponse(
         id=str(job.id),
@@ -121,6 +131,68 @@ async def get_employer_jobs(employer_id: str) -> List[JobResponse]:
         ) for job in jobs
     ]
 
+async def update_job_status(job_id: str, status: str, employer_id: str) -> JobResponse:
+    """Open, close or unpublish a job owned by the employer"""
+    try:
+        new_status = JobStatus(status)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid job status: {status}")
+
+    try:
+        job = await Job.get(job_id)
+    except Exception:
+        job = None
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.employer_id != employer_id:
+        raise HTTPException(status_code=403, detail="Not authorized to update this job")
+
+    previous_status = job.status
+    job.status = new_status
+    job.updated_at = datetime.utcnow()
+    await job.save()
+    forget_job(job_id)
+    _refresh_similar_jobs(job, previous_status)
+    await events.publish(events.JOB_EVENTS, [{"type": "status_changed", "job_id": job_id, "employer_id": employer_id, "status": new_status.value, "at": job.updated_at}])
+
+    return JobResponse(
+        id=str(job.id),
+        title=job.title,
+        company=job.company,
+        location=job.location,
+        salary=job.salary,
+        description=job.description,
+        requirements=job.requirements,
+        employment_type=job.employment_type,
+        remote=job.remote,
+        status=job.status,
+        employer_id=job.employer_id,
+        skills_required=job.skills_required,
+        benefits=job.benefits,
+        application_deadline=job.application_deadline,
+        created_at=job.created_at,
+        updated_at=job.updated_at
+    )
+
+def _refresh_similar_jobs(job: Job, previous_status) -> None:
+    """Queue the similar-jobs rail update for a job opening or closing; applied off the request path"""
+    if job.status == JobStatus.ACTIVE and previous_status != JobStatus.ACTIVE:
+        similar_jobs_updater.enqueue(job.id, opened=True)
+    elif job.status != JobStatus.ACTIVE and previous_status == JobStatus.ACTIVE:
+        similar_jobs_updater.enqueue(job.id, opened=False)
+
+async def get_similar_jobs(job_id: str) -> List[SimilarJob]:
+    """Read the precomputed similar-jobs rail of a job"""
+    try:
+        object_id = PydanticObjectId(job_id)
+    except Exception:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    view = await Job.find_one(Job.id == object_id, projection_model=_SimilarJobsView)
+    if view is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return view.similar_jobs
+
 async def apply_to_job(job_id: str, application_data: dict) -> dict:
     """Apply to a specific job"""
     job = await Job.get(job_id)
@@ -1,8 +1,9 @@
 from beanie import Document
-from pydantic import Field
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class EmploymentType(str, Enum):
     FULL_TIME = "full_time"
@@ -16,6 +17,14 @@ class JobStatus(str, Enum):
     CLOSED = "closed"
     DRAFT = "draft"
 
+class SimilarJob(BaseModel):
+    """Card-sized copy of a related job, stored on the job it relates to"""
+    job_id: str
+    title: str
+    company: str
+    location: str
+    score: float
+
 class Job(Document):
     title: str
     company: str
@@ -33,8 +42,18 @@ class Job(Document):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    # Precomputed "similar jobs" rail, maintained by services/similar_jobs.py
+    similar_jobs: List[SimilarJob] = []
+    similar_jobs_updated_at: Optional[datetime] = None
+
     class Settings:
         name = "jobs"
+        indexes = [
+            IndexModel([("employer_id", ASCENDING), ("status", ASCENDING)]),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+            # Rails that list a job, found when it closes
+            IndexModel([("similar_jobs.job_id", ASCENDING)]),
+        ]
 
     model_config = {
         "json_schema_extra": {
@@ -0,0 +1,259 @@
+# app/services/job/services/similar_jobs.py
+
+import re
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import UpdateOne
+
+from app.services.job.config import SIMILAR_JOBS_INDEX_MAX_AGE_SECONDS, SIMILAR_JOBS_TOP_K, SIMILAR_JOBS_TITLE_WEIGHT
+from app.services.job.models.job import Job, JobStatus, SimilarJob
+
+# Skills and title words are hashed into a fixed number of columns so the
+# feature matrix stays small no matter how many distinct skills exist.
+FEATURE_DIM = 1024
+
+# Rows of the similarity matrix computed at once; bounds memory to
+# BLOCK_ROWS x <active jobs> floats during a full rebuild.
+BLOCK_ROWS = 512
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+class _JobFeatures(BaseModel):
+    """Projection with only the fields needed to compare and display jobs"""
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    company: str
+    location: str
+    status: JobStatus
+    skills_required: Optional[List[str]] = []
+    similar_jobs: List[SimilarJob] = []
+
+
+def _features(job: _JobFeatures):
+    for skill in job.skills_required or []:
+        skill = skill.strip().lower()
+        if skill:
+            yield f"skill:{skill}", 1.0
+    for word in set(_WORD_RE.findall(job.title.lower())):
+        yield f"title:{word}", SIMILAR_JOBS_TITLE_WEIGHT
+
+
+def _vectorize(jobs: List[_JobFeatures]) -> np.ndarray:
+    """L2-normalised hashed feature vectors, one row per job"""
+    matrix = np.zeros((len(jobs), FEATURE_DIM), dtype=np.float32)
+    for row, job in enumerate(jobs):
+        for key, weight in _features(job):
+            matrix[row, zlib.crc32(key.encode()) % FEATURE_DIM] += weight
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _rank(
+    sources: List[_JobFeatures],
+    source_matrix: np.ndarray,
+    candidates: List[_JobFeatures],
+    candidate_matrix: np.ndarray,
+    top_k: int,
+) -> Dict[PydanticObjectId, List[SimilarJob]]:
+    """Top-K most similar candidates for every source job (cosine similarity)"""
+    results = {source.id: [] for source in sources}
+    k = min(top_k, len(candidates))
+    if k == 0:
+        return results
+
+    position = {job.id: i for i, job in enumerate(candidates)}
+    for start in range(0, len(sources), BLOCK_ROWS):
+        block = sources[start:start + BLOCK_ROWS]
+        scores = source_matrix[start:start + BLOCK_ROWS] @ candidate_matrix.T
+
+        # A job is never similar to itself
+        own = [(row, position[job.id]) for row, job in enumerate(block) if job.id in position]
+        if own:
+            rows, cols = zip(*own)
+            scores[list(rows), list(cols)] = -1.0
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        for row, job in enumerate(block):
+            results[job.id] = [
+                SimilarJob(
+                    job_id=str(candidates[col].id),
+                    title=candidates[col].title,
+                    company=candidates[col].company,
+                    location=candidates[col].location,
+                    score=round(float(score), 4),
+                )
+                for col, score in zip(top[row], top_scores[row])
+                if score > 0
+            ]
+    return results
+
+
+async def _load_jobs() -> List[_JobFeatures]:
+    """All published (active or closed) jobs; drafts never get a rail"""
+    return await Job.find(
+        {"status": {"$in": [JobStatus.ACTIVE.value, JobStatus.CLOSED.value]}},
+        projection_model=_JobFeatures,
+    ).to_list()
+
+
+async def _store(similar: Dict[PydanticObjectId, List[SimilarJob]]) -> None:
+    if not similar:
+        return
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"_id": job_id},
+            {"$set": {
+                "similar_jobs": [item.model_dump() for item in items],
+                "similar_jobs_updated_at": now,
+            }},
+        )
+        for job_id, items in similar.items()
+    ]
+    await Job.get_motor_collection().bulk_write(operations, ordered=False)
+
+
+async def rebuild_similar_jobs(top_k: int = SIMILAR_JOBS_TOP_K) -> int:
+    """Recompute the similar-jobs rail of every published job. Returns the number of jobs updated."""
+    jobs = await _load_jobs()
+    matrix = _vectorize(jobs)
+    active_rows = [i for i, job in enumerate(jobs) if job.status == JobStatus.ACTIVE]
+    candidates = [jobs[i] for i in active_rows]
+
+    similar = _rank(jobs, matrix, candidates, matrix[active_rows], top_k)
+    await _store(similar)
+    return len(similar)
+
+
+class _FeatureIndex:
+    """Published jobs and their feature rows, kept in memory between updates.
+
+    Opening or closing a job patches its row in place, so an update costs one
+    matrix-vector product instead of reloading and re-vectorizing every job.
+    """
+
+    def __init__(self, jobs: List[_JobFeatures]):
+        self.jobs = jobs
+        self.matrix = _vectorize(jobs)
+        self.position = {job.id: i for i, job in enumerate(jobs)}
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    async def load(cls) -> "_FeatureIndex":
+        return cls(await _load_jobs())
+
+    def upsert(self, job: _JobFeatures) -> int:
+        row = self.position.get(job.id)
+        if row is None:
+            row = len(self.jobs)
+            self.jobs.append(job)
+            self.position[job.id] = row
+            self.matrix = np.vstack([self.matrix, _vectorize([job])])
+        else:
+            self.jobs[row] = job
+            self.matrix[row] = _vectorize([job])[0]
+        return row
+
+    def set_status(self, job_id: PydanticObjectId, status: JobStatus) -> None:
+        row = self.position.get(job_id)
+        if row is not None:
+            self.jobs[row] = self.jobs[row].model_copy(update={"status": status})
+
+    def active_rows(self, exclude: Optional[PydanticObjectId] = None) -> List[int]:
+        return [i for i, job in enumerate(self.jobs) if job.status == JobStatus.ACTIVE and job.id != exclude]
+
+
+_index: Optional[_FeatureIndex] = None
+
+
+async def _get_index(required: Iterable[PydanticObjectId] = ()) -> _FeatureIndex:
+    """The cached index, reloaded when too old or missing any of ``required``"""
+    global _index
+    if (
+        _index is None
+        or time.monotonic() - _index.loaded_at > SIMILAR_JOBS_INDEX_MAX_AGE_SECONDS
+        or any(job_id not in _index.position for job_id in required)
+    ):
+        _index = await _FeatureIndex.load()
+    return _index
+
+
+async def on_job_opened(job_id: PydanticObjectId, top_k: int = SIMILAR_JOBS_TOP_K) -> None:
+    """Give a newly active job its own rail and slot it into the rails it now belongs to"""
+    opened = await Job.find_one({"_id": job_id}, projection_model=_JobFeatures)
+    if opened is None or opened.status != JobStatus.ACTIVE:
+        return
+    index = await _get_index()
+    row = index.upsert(opened)
+
+    active_rows = index.active_rows()
+    candidates = [index.jobs[i] for i in active_rows]
+    similar = _rank([opened], index.matrix[[row]], candidates, index.matrix[active_rows], top_k)
+    await _store(similar)
+
+    # Similarity is symmetric, so one product scores the opened job against
+    # every other published job's rail. Each rail is patched in Mongo, only
+    # if the job would make its top K, so rails never have to be read here.
+    scores = index.matrix @ index.matrix[row]
+    entry = SimilarJob(job_id=str(opened.id), title=opened.title, company=opened.company,
+                       location=opened.location, score=0.0)
+    now = datetime.utcnow()
+    operations = []
+    for job, score in zip(index.jobs, scores):
+        if job.id == opened.id or score <= 0:
+            continue
+        score = round(float(score), 4)
+        operations.append(UpdateOne(
+            {
+                "_id": job.id,
+                "similar_jobs.job_id": {"$ne": entry.job_id},
+                "$or": [
+                    {f"similar_jobs.{top_k - 1}": {"$exists": False}},
+                    {f"similar_jobs.{top_k - 1}.score": {"$lt": score}},
+                ],
+            },
+            {
+                "$push": {"similar_jobs": {
+                    "$each": [entry.model_copy(update={"score": score}).model_dump()],
+                    "$sort": {"score": -1},
+                    "$slice": top_k,
+                }},
+                "$set": {"similar_jobs_updated_at": now},
+            },
+        ))
+    if operations:
+        await Job.get_motor_collection().bulk_write(operations, ordered=False)
+
+
+async def on_job_closed(job_id: PydanticObjectId, top_k: int = SIMILAR_JOBS_TOP_K) -> None:
+    """Drop a job that is no longer active from every rail and backfill those rails"""
+    affected_ids = [
+        row["_id"]
+        async for row in Job.get_motor_collection().find({"similar_jobs.job_id": str(job_id)}, projection={"_id": 1})
+    ]
+    index = await _get_index(affected_ids)
+    index.set_status(job_id, JobStatus.CLOSED)
+    if not affected_ids:
+        return
+
+    rows = [index.position[i] for i in affected_ids]
+    active_rows = index.active_rows(exclude=job_id)
+    similar = _rank(
+        [index.jobs[i] for i in rows], index.matrix[rows],
+        [index.jobs[i] for i in active_rows], index.matrix[active_rows],
+        top_k,
+    )
+    await _store(similar)
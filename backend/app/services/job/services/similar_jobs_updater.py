@@ -0,0 +1,71 @@
+# app/services/job/services/similar_jobs_updater.py
+
+import asyncio
+from typing import Dict, Optional
+
+from beanie import PydanticObjectId
+
+from app.services.job.config import SIMILAR_JOBS_UPDATE_INTERVAL_SECONDS
+
+
+class SimilarJobsUpdater:
+    """Applies job open/close changes to the similar-jobs rails in the background.
+
+    ``enqueue`` is a synchronous dict write, so a job write never waits on
+    the rails. Repeated changes to one job before a flush collapse into its
+    latest state.
+    """
+
+    def __init__(self, interval: float = SIMILAR_JOBS_UPDATE_INTERVAL_SECONDS):
+        self.interval = interval
+        self._pending: Dict[PydanticObjectId, bool] = {}  # job id -> opened (True) or closed (False)
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def enqueue(self, job_id: PydanticObjectId, opened: bool) -> None:
+        self._pending.pop(job_id, None)  # re-insert so changes apply in order
+        self._pending[job_id] = opened
+        self._ready.set()
+
+    async def flush(self) -> None:
+        # Imported here so numpy stays off the startup path
+        from app.services.job.services.similar_jobs import on_job_closed, on_job_opened
+
+        pending, self._pending = self._pending, {}
+        for job_id, opened in pending.items():
+            try:
+                if opened:
+                    await on_job_opened(job_id)
+                else:
+                    await on_job_closed(job_id)
+            except Exception as e:
+                # The rail is a convenience; the next full rebuild repairs it
+                print(f"Error refreshing similar jobs for {job_id}: {e}")
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._ready.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._ready.clear()
+            if self._pending:
+                await self.flush()
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the updater and apply everything still queued"""
+        if self._task is not None:
+            self._stopping = True
+            self._ready.set()
+            await self._task
+            self._task = None
+        if self._pending:
+            await self.flush()
+
+
+similar_jobs_updater = SimilarJobsUpdater()
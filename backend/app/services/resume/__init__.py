@@ -1,4 +1,21 @@
+from .resume_service import (
+    upload_resume,
+    list_resumes,
+    delete_resume,
+    get_resume,
+    create_direct_upload,
+    complete_direct_upload,
+    get_resume_download,
+    resume_storage,
+)
 
-from .resume_service import upload_resume, list_resumes, delete_resume, get_resume
-
-__all__ = ["upload_resume", "list_resumes", "delete_resume", "get_resume"]
\ No newline at end of file
+__all__ = [
+    "upload_resume",
+    "list_resumes",
+    "delete_resume",
+    "get_resume",
+    "create_direct_upload",
+    "complete_direct_upload",
+    "get_resume_download",
+    "resume_storage",
+]
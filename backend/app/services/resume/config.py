@@ -0,0 +1,30 @@
+# app/services/resume/config.py
+
+import os
+
+RESUME_UPLOAD_DIR = os.getenv("RESUME_UPLOAD_DIR", "uploads/resumes")
+
+# Files are stored once per content hash under <dir>/ab/cd/<sha256>.<ext>;
+# two levels of 256 shards keep each directory small
+RESUME_SHARD_LEVELS = int(os.getenv("RESUME_SHARD_LEVELS", "2"))
+
+# Largest resume accepted. Uploads are streamed to disk in chunks of
+# RESUME_UPLOAD_CHUNK_BYTES, so memory per upload stays at about one chunk.
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+RESUME_UPLOAD_CHUNK_BYTES = int(os.getenv("RESUME_UPLOAD_CHUNK_BYTES", str(256 * 1024)))
+
+# Content types accepted, decided from the file's first bytes rather than
+# the client's Content-Type header
+RESUME_ALLOWED_CONTENT_TYPES = {
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/rtf",
+    "text/plain",
+}
+
+# Request body caps, applied before the multipart body is parsed. The
+# allowance covers multipart boundaries and part headers.
+RESUME_BODY_LIMITS = {
+    ("POST", "/api/resume/upload"): RESUME_MAX_BYTES + 64 * 1024,
+}
@@ -0,0 +1,42 @@
+# app/services/resume/db/resume_crud.py
+
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+from app.services.resume.models.resume import ResumeBlob
+
+
+def _blobs():
+    return ResumeBlob.get_motor_collection()
+
+
+async def acquire_blob(sha256: str, path: str, size: int, content_type: str) -> dict:
+    """Add a reference to the blob of this content, creating its record if new"""
+    return await _blobs().find_one_and_update(
+        {"sha256": sha256},
+        {
+            "$inc": {"refcount": 1},
+            "$setOnInsert": {"path": path, "size": size, "content_type": content_type, "created_at": datetime.utcnow()},
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+        projection={"_id": 0, "path": 1, "refcount": 1},
+    )
+
+
+async def release_blob(sha256: str) -> Optional[dict]:
+    """Drop one reference; returns the blob's path and remaining refcount, or None if there is no blob"""
+    return await _blobs().find_one_and_update(
+        {"sha256": sha256, "refcount": {"$gt": 0}},
+        {"$inc": {"refcount": -1}},
+        return_document=ReturnDocument.AFTER,
+        projection={"_id": 0, "path": 1, "refcount": 1},
+    )
+
+
+async def delete_unreferenced_blob(sha256: str) -> bool:
+    """Delete the record only if nothing re-acquired the blob in the meantime"""
+    result = await _blobs().delete_one({"sha256": sha256, "refcount": {"$lte": 0}})
+    return result.deleted_count == 1
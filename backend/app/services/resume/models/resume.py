@@ -1,7 +1,8 @@
 from beanie import Document
-from pydantic import Field
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
+from pymongo import ASCENDING, IndexModel
 
 class Resume(Document):
     user_id: str
@@ -9,6 +10,8 @@ class Resume(Document):
     file_url: str
     file_size: int
     content_type: str
+    sha256: Optional[str] = None  # hex digest of the stored file; its ResumeBlob when set
+    storage_key: Optional[str] = None  # key in the resume storage backend; None for older uploads
     is_primary: bool = False
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -25,4 +28,30 @@ class Resume(Document):
                 "content_type": "application/pdf"
             }
         }
-    }
\ No newline at end of file
+    }
+
+class ResumeBlob(Document):
+    """One stored file, shared by every resume with the same content"""
+    sha256: str
+    path: str  # key in the resume storage backend
+    size: int
+    content_type: str
+    refcount: int = 0  # resumes pointing at this blob
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "resume_blobs"
+        indexes = [
+            IndexModel([("sha256", ASCENDING)], unique=True),
+        ]
+
+class DirectUploadRequest(BaseModel):
+    """A client asking to upload a resume straight to object storage"""
+    filename: str
+    content_type: str
+    size: int = Field(gt=0)
+    sha256: str = Field(pattern="^[0-9a-f]{64}$")
+
+class DirectUploadComplete(BaseModel):
+    upload_id: str = Field(pattern="^[0-9a-f]{64}\\.[0-9a-f]{32}$")
+    filename: str
@@ -1,47 +1,194 @@
-from typing import List, Dict, Any
-from fastapi import HTTPException
+from typing import Awaitable, Callable, List, Dict, Any, Optional
+from uuid import uuid4
+from fastapi import HTTPException, UploadFile
+from app.services.resume.config import RESUME_ALLOWED_CONTENT_TYPES, RESUME_MAX_BYTES, RESUME_UPLOAD_DIR
+from app.services.application.db import application_crud
+from app.services.resume.db import resume_crud
 from app.services.resume.models.resume import Resume
+from app.services.resume.utils.file_utils import SNIFF_BYTES, blob_path, save_upload, sniff_content_type
+from app.services.upload.services.storage import create_storage
+import asyncio
 import os
-import uuid
 from datetime import datetime
 
-async def upload_resume(file_data: Dict[str, Any], user_id: str = None) -> Dict[str, Any]:
-    """Upload a resume file"""
+# Where resume files live: a local directory or an S3-compatible bucket
+resume_storage = create_storage(RESUME_UPLOAD_DIR, prefix="resumes/")
+
+# Direct uploads land here until they are checked and moved to their blob key
+INCOMING_PREFIX = "incoming/"
+
+UNSUPPORTED_TYPE = "Resumes must be PDF, Word, RTF or plain text files"
+
+async def _release_blob(sha256: str) -> bool:
+    """Drop one reference to a stored file, removing the file with the last one.
+
+    Returns False if the content has no blob record (older uploads).
+    """
+    blob = await resume_crud.release_blob(sha256)
+    if blob is None:
+        return False
+    if blob["refcount"] == 0:
+        # Moved aside before the record goes: an upload of the same content
+        # racing this delete finds the file missing and stores its own copy,
+        # so it can never lose its file to a removal decided before it
+        key = blob["path"]
+        tombstone = f"{key}.{uuid4().hex}.deleting"
+        staged = await resume_storage.move(key, tombstone)
+        deleted = await resume_crud.delete_unreferenced_blob(sha256)
+        if staged:
+            if deleted or await resume_storage.exists(key):
+                await resume_storage.delete(tombstone)
+            else:
+                await resume_storage.move(tombstone, key)  # re-acquired meanwhile; put it back
+    return True
+
+async def _store_resume(
+    user_id: Optional[str],
+    filename: str,
+    sha256: str,
+    size: int,
+    content_type: str,
+    place: Callable[[str], Awaitable[None]],
+    discard: Callable[[], Awaitable[None]],
+) -> Dict[str, Any]:
+    """Reference the blob for this content, put the file in place if it is new and record the resume.
+
+    ``place(key)`` stores the new file under its blob key; ``discard()``
+    drops it when the same content is already stored.
+    """
+    # Identical files are stored once, under their hash. The reference is
+    # counted before the file is put in place, so a concurrent delete of
+    # the same content cannot remove it from under this upload.
+    blob = await resume_crud.acquire_blob(sha256, blob_path(sha256, content_type), size, content_type)
     try:
-        # Create upload directory if it doesn't exist
-        upload_dir = "uploads/resumes"
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Generate unique filename
-        file_extension = os.path.splitext(file_data["filename"])[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        # Save file (in production, this would be saved to cloud storage)
-        with open(file_path, "wb") as f:
-            f.write(file_data["content"])
-        
+        key = blob["path"]
+        if await resume_storage.exists(key):
+            await discard()
+        else:
+            await place(key)
+
         # Create resume record
         resume = Resume(
             user_id=user_id or "anonymous",
-            filename=file_data["filename"],
-            file_url=f"/{file_path}",
-            file_size=len(file_data["content"]),
-            content_type=file_data["content_type"]
+            filename=filename,
+            file_url=resume_storage.describe(key),
+            file_size=size,
+            content_type=content_type,
+            sha256=sha256,
+            storage_key=key,
         )
-        
+
         await resume.insert()
-        
-        return {
-            "id": str(resume.id),
-            "filename": resume.filename,
-            "file_url": resume.file_url,
-            "uploaded_at": resume.uploaded_at,
-            "message": "Resume uploaded successfully"
-        }
+    except BaseException:
+        await _release_blob(sha256)
+        raise
+
+    return {
+        "id": str(resume.id),
+        "filename": resume.filename,
+        "file_url": resume.file_url,
+        "file_size": resume.file_size,
+        "sha256": resume.sha256,
+        "uploaded_at": resume.uploaded_at,
+        "message": "Resume uploaded successfully"
+    }
+
+async def upload_resume(file: UploadFile, user_id: str = None) -> Dict[str, Any]:
+    """Upload a resume file"""
+    # Streamed to a temporary file; rejected early if it grows past the size limit
+    stored = await save_upload(file, RESUME_UPLOAD_DIR)
+    try:
+        if stored.content_type not in RESUME_ALLOWED_CONTENT_TYPES:
+            raise HTTPException(status_code=415, detail=UNSUPPORTED_TYPE)
+        return await _store_resume(
+            user_id, file.filename, stored.sha256, stored.size, stored.content_type,
+            place=lambda key: resume_storage.put_file(key, stored.path, stored.content_type),
+            discard=lambda: asyncio.to_thread(os.remove, stored.path),
+        )
     except Exception as e:
+        if os.path.exists(stored.path):
+            os.remove(stored.path)
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(status_code=500, detail=f"Failed to upload resume: {str(e)}")
 
+async def create_direct_upload(filename: str, content_type: str, size: int, sha256: str) -> Dict[str, Any]:
+    """A presigned URL the client uploads the file to itself, bypassing the API"""
+    if size > RESUME_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"File is larger than {RESUME_MAX_BYTES} bytes")
+    if content_type not in RESUME_ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail=UNSUPPORTED_TYPE)
+
+    upload_id = f"{sha256}.{uuid4().hex}"
+    upload = await resume_storage.presign_upload(INCOMING_PREFIX + upload_id, content_type, size, sha256)
+    if upload is None:
+        raise HTTPException(status_code=400, detail="Direct uploads need object storage; use /api/resume/upload")
+    return {"upload_id": upload_id, "filename": filename, **upload}
+
+async def complete_direct_upload(upload_id: str, filename: str, user_id: str = None) -> Dict[str, Any]:
+    """Check a finished direct upload and record it like any other resume"""
+    staging = INCOMING_PREFIX + upload_id
+    size = await resume_storage.size(staging)
+    if size is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    try:
+        if size > RESUME_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"File is larger than {RESUME_MAX_BYTES} bytes")
+        # The client named the hash; files are shared by hash, so it is
+        # confirmed against the stored bytes before anything relies on it
+        sha256 = upload_id.split(".")[0]
+        if await resume_storage.sha256(staging) != sha256:
+            raise HTTPException(status_code=422, detail="Uploaded file does not match its SHA-256")
+        content_type = sniff_content_type(await resume_storage.read_head(staging, SNIFF_BYTES), filename)
+        if content_type not in RESUME_ALLOWED_CONTENT_TYPES:
+            raise HTTPException(status_code=415, detail=UNSUPPORTED_TYPE)
+
+        async def place(key: str) -> None:
+            if not await resume_storage.move(staging, key):
+                raise HTTPException(status_code=404, detail="Upload not found")
+
+        return await _store_resume(
+            user_id, filename, sha256, size, content_type,
+            place=place,
+            discard=lambda: resume_storage.delete(staging),
+        )
+    except Exception as e:
+        try:
+            await resume_storage.delete(staging)
+        except Exception as cleanup_error:
+            print(f"Error removing direct upload {upload_id}: {cleanup_error}")
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"Failed to upload resume: {str(e)}")
+
+async def _sent_to_employer(resume: Resume, user: dict) -> bool:
+    """Employers see a resume only once it is attached to an application for one of their jobs"""
+    if user.get("role") != "employer":
+        return False
+    # Applications reference the resume by whichever link the candidate submitted
+    references = [resume.file_url, str(resume.id), f"/api/resume/{resume.id}/download"]
+    return await application_crud.employer_received_resume(user["id"], resume.user_id, references)
+
+async def get_resume_download(resume_id: str, user: dict) -> Dict[str, Any]:
+    """Where to fetch a resume's file: a presigned ``url``, or a local ``path`` the API serves"""
+    resume = await Resume.get(resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    if resume.user_id != user["id"] and not await _sent_to_employer(resume, user):
+        raise HTTPException(status_code=403, detail="Not authorized to view this resume")
+
+    if resume.storage_key is None:
+        # Uploaded before storage backends; the file is on local disk
+        return {"path": resume.file_url.lstrip("/"), "filename": resume.filename, "content_type": resume.content_type}
+    url = await resume_storage.download_url(resume.storage_key, resume.filename, resume.content_type)
+    if url is not None:
+        return {"url": url}
+    return {
+        "path": resume_storage.local_path(resume.storage_key),
+        "filename": resume.filename,
+        "content_type": resume.content_type,
+    }
+
 async def list_resumes(user_id: str) -> List[Dict[str, Any]]:
     """List all resumes for a user"""
     resumes = await Resume.find(Resume.user_id == user_id).to_list()
@@ -83,13 +230,16 @@ async def delete_resume(resume_id: str, user_id: str) -> Dict[str, str]:
     if resume.user_id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this resume")
     
-    # Delete file from storage
+    await resume.delete()
+    
+    # Shared files go with their last reference; files uploaded before
+    # content addressing have no blob and are removed directly
+    if resume.sha256 and await _release_blob(resume.sha256):
+        return {"message": "Resume deleted successfully"}
     try:
         if os.path.exists(resume.file_url.lstrip('/')):
             os.remove(resume.file_url.lstrip('/'))
     except Exception:
         pass  # File might already be deleted
     
-    await resume.delete()
-    
     return {"message": "Resume deleted successfully"}
\ No newline at end of file
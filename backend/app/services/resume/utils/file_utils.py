@@ -0,0 +1,106 @@
+# app/services/resume/utils/file_utils.py
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile
+from pydantic import BaseModel
+
+from app.services.resume.config import RESUME_MAX_BYTES, RESUME_SHARD_LEVELS, RESUME_UPLOAD_CHUNK_BYTES
+
+# Bytes kept from the start of an upload for content sniffing
+SNIFF_BYTES = 2048
+
+PDF = "application/pdf"
+DOC = "application/msword"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+RTF = "application/rtf"
+TEXT = "text/plain"
+
+EXTENSIONS = {PDF: ".pdf", DOC: ".doc", DOCX: ".docx", RTF: ".rtf", TEXT: ".txt"}
+
+
+class StoredFile(BaseModel):
+    """An upload written to a temporary file, ready to be moved into place"""
+    path: str
+    size: int
+    sha256: str
+    content_type: Optional[str] = None  # None when the bytes match no known format
+
+
+def _is_text(head: bytes) -> bool:
+    if b"\x00" in head:
+        return False
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # The sniffed prefix may end in the middle of a multi-byte character
+        return e.start >= len(head) - 3 and len(head) == SNIFF_BYTES
+    return True
+
+
+def sniff_content_type(head: bytes, filename: str = "") -> Optional[str]:
+    """Content type from the file's magic bytes; the client's claim is ignored"""
+    if head.startswith(b"%PDF-"):
+        return PDF
+    if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):  # OLE2 compound file
+        return DOC
+    if head.startswith(b"PK\x03\x04"):
+        # A zip; Word documents start with their content types or the word/ part
+        if b"[Content_Types].xml" in head or b"word/" in head or filename.lower().endswith(".docx"):
+            return DOCX
+        return None
+    if head.startswith(b"{\\rtf"):
+        return RTF
+    if head and _is_text(head):
+        return TEXT
+    return None
+
+
+def _copy(source: BinaryIO, directory: str, filename: str, max_bytes: int, chunk_size: int) -> StoredFile:
+    """Blocking copy loop; runs in a worker thread"""
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as target:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"File is larger than {max_bytes} bytes")
+                if len(head) < SNIFF_BYTES:
+                    head += chunk[:SNIFF_BYTES - len(head)]
+                digest.update(chunk)
+                target.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return StoredFile(path=path, size=size, sha256=digest.hexdigest(), content_type=sniff_content_type(head, filename))
+
+
+async def save_upload(
+    upload: UploadFile,
+    directory: str,
+    max_bytes: int = RESUME_MAX_BYTES,
+    chunk_size: int = RESUME_UPLOAD_CHUNK_BYTES,
+) -> StoredFile:
+    """Stream an upload to a temporary file in ``directory``, hashing and sniffing it on the way.
+
+    Memory stays at one chunk whatever the file size, and the event loop
+    only waits on the worker thread. The caller moves the file into place
+    or removes it.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File is larger than {max_bytes} bytes")
+    return await asyncio.to_thread(_copy, upload.file, directory, upload.filename or "", max_bytes, chunk_size)
+
+
+def blob_path(sha256: str, content_type: str) -> str:
+    """Sharded storage key of a content-addressed file, e.g. ``3f/a2/3fa2...9c.pdf``"""
+    shards = [sha256[2 * level:2 * level + 2] for level in range(RESUME_SHARD_LEVELS)]
+    return "/".join([*shards, f"{sha256}{EXTENSIONS[content_type]}"])
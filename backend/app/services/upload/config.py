@@ -0,0 +1,32 @@
+# app/services/upload/config.py
+
+import os
+
+# "local" keeps files on this host's disk; "s3" stores them in any
+# S3-compatible object store (AWS, MinIO, R2, GCS interoperability)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "https://s3.amazonaws.com")
+S3_BUCKET = os.getenv("S3_BUCKET", "")
+S3_REGION = os.getenv("S3_REGION", "us-east-1")
+S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID", "")
+S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY", "")
+# "path" (endpoint/bucket/key, what MinIO expects) or "virtual" (bucket.endpoint/key)
+S3_ADDRESSING_STYLE = os.getenv("S3_ADDRESSING_STYLE", "path")
+
+# One pooled HTTP client per worker; connections are kept alive between requests
+S3_MAX_CONNECTIONS = int(os.getenv("S3_MAX_CONNECTIONS", "32"))
+S3_TIMEOUT_SECONDS = float(os.getenv("S3_TIMEOUT_SECONDS", "30"))
+
+# Files at least this large are sent as a multipart upload, up to
+# S3_MULTIPART_CONCURRENCY parts at a time (S3 parts are at least 5 MB,
+# except the last)
+S3_MULTIPART_THRESHOLD_BYTES = int(os.getenv("S3_MULTIPART_THRESHOLD_BYTES", str(8 * 1024 * 1024)))
+S3_MULTIPART_PART_BYTES = max(5 * 1024 * 1024, int(os.getenv("S3_MULTIPART_PART_BYTES", str(8 * 1024 * 1024))))
+S3_MULTIPART_CONCURRENCY = int(os.getenv("S3_MULTIPART_CONCURRENCY", "4"))
+
+# Lifetime of presigned download and direct-upload URLs
+STORAGE_URL_EXPIRES_SECONDS = int(os.getenv("STORAGE_URL_EXPIRES_SECONDS", "900"))
+
+# Body chunks are read from disk in pieces of this size while streaming
+STORAGE_STREAM_CHUNK_BYTES = int(os.getenv("STORAGE_STREAM_CHUNK_BYTES", str(256 * 1024)))
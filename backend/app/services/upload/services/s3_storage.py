@@ -0,0 +1,229 @@
+# app/services/upload/services/s3_storage.py
+
+import asyncio
+import base64
+import hashlib
+import os
+import xml.etree.ElementTree as ElementTree
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+from app.core.sigv4 import EMPTY_SHA256, UNSIGNED_PAYLOAD, SigV4Signer, canonical_query, uri_encode
+from app.services.upload.config import (
+    S3_ACCESS_KEY_ID,
+    S3_ADDRESSING_STYLE,
+    S3_BUCKET,
+    S3_ENDPOINT_URL,
+    S3_MAX_CONNECTIONS,
+    S3_MULTIPART_CONCURRENCY,
+    S3_MULTIPART_PART_BYTES,
+    S3_MULTIPART_THRESHOLD_BYTES,
+    S3_REGION,
+    S3_SECRET_ACCESS_KEY,
+    S3_TIMEOUT_SECONDS,
+    STORAGE_STREAM_CHUNK_BYTES,
+    STORAGE_URL_EXPIRES_SECONDS,
+)
+from app.services.upload.services.storage import StorageBackend, StorageError
+
+
+def _xml_text(content: bytes, tag: str) -> Optional[str]:
+    """Text of the first element named ``tag``, whatever its namespace"""
+    for element in ElementTree.fromstring(content).iter():
+        if element.tag == tag or element.tag.endswith("}" + tag):
+            return element.text
+    return None
+
+
+class S3Storage(StorageBackend):
+    """Objects in an S3-compatible bucket, over one pooled keep-alive HTTP client.
+
+    Large files go up as multipart uploads with a few parts in flight at
+    once; downloads and direct client uploads use presigned URLs, so the
+    bytes never pass through the API workers.
+    """
+
+    def __init__(
+        self,
+        bucket: str = S3_BUCKET,
+        endpoint_url: str = S3_ENDPOINT_URL,
+        region: str = S3_REGION,
+        access_key: str = S3_ACCESS_KEY_ID,
+        secret_key: str = S3_SECRET_ACCESS_KEY,
+        addressing_style: str = S3_ADDRESSING_STYLE,
+        prefix: str = "",
+    ):
+        try:
+            import httpx
+        except ImportError:
+            raise RuntimeError("STORAGE_BACKEND is 's3' but the 'httpx' package is not installed")
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND is 's3' but S3_BUCKET is not set")
+
+        endpoint = urlsplit(endpoint_url.rstrip("/"))
+        if addressing_style == "virtual":
+            self._base_url = f"{endpoint.scheme}://{bucket}.{endpoint.netloc}"
+        else:
+            self._base_url = f"{endpoint.scheme}://{endpoint.netloc}/{uri_encode(bucket)}"
+        self.bucket = bucket
+        self.prefix = prefix
+        self._signer = SigV4Signer(access_key, secret_key, region)
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=S3_MAX_CONNECTIONS, max_keepalive_connections=S3_MAX_CONNECTIONS),
+            timeout=httpx.Timeout(S3_TIMEOUT_SECONDS),
+        )
+
+    def _url(self, key: str) -> str:
+        return f"{self._base_url}/{uri_encode(self.prefix + key, safe='/')}"
+
+    def describe(self, key: str) -> str:
+        return f"s3://{self.bucket}/{self.prefix}{key}"
+
+    def _signed(self, method: str, key: str, query=None, headers=None, has_body: bool = False):
+        url = self._url(key)
+        signed = self._signer.sign(method, url, query, headers, UNSIGNED_PAYLOAD if has_body else EMPTY_SHA256)
+        if query:
+            # Encoded exactly as signed; httpx would encode params its own way
+            url = f"{url}?{canonical_query(query)}"
+        return url, signed
+
+    async def _request(
+        self,
+        method: str,
+        key: str,
+        query: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        content=None,
+        expected=(200,),
+    ):
+        url, signed = self._signed(method, key, query, headers, has_body=content is not None)
+        response = await self._client.request(method, url, headers=signed, content=content)
+        if response.status_code not in expected:
+            raise StorageError(f"S3 {method} {key} failed with {response.status_code}: {response.text[:200]}")
+        return response
+
+    async def _read_chunks(self, fd: int, offset: int, length: int) -> AsyncIterator[bytes]:
+        """Stream a byte range of an open file from worker threads, one chunk in memory at a time"""
+        end = offset + length
+        while offset < end:
+            chunk = await asyncio.to_thread(os.pread, fd, min(STORAGE_STREAM_CHUNK_BYTES, end - offset), offset)
+            if not chunk:
+                raise StorageError("File shrank while it was being uploaded")
+            offset += len(chunk)
+            yield chunk
+
+    async def put_file(self, key: str, path: str, content_type: str) -> None:
+        fd = await asyncio.to_thread(os.open, path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            if size >= S3_MULTIPART_THRESHOLD_BYTES:
+                await self._put_multipart(key, fd, size, content_type)
+            else:
+                await self._request(
+                    "PUT", key,
+                    headers={"content-type": content_type, "content-length": str(size)},
+                    content=self._read_chunks(fd, 0, size),
+                )
+        finally:
+            os.close(fd)
+        await asyncio.to_thread(os.remove, path)
+
+    async def _put_multipart(self, key: str, fd: int, size: int, content_type: str) -> None:
+        response = await self._request("POST", key, {"uploads": ""}, {"content-type": content_type})
+        upload_id = _xml_text(response.content, "UploadId")
+        slots = asyncio.Semaphore(S3_MULTIPART_CONCURRENCY)
+
+        async def upload_part(number: int, offset: int) -> str:
+            length = min(S3_MULTIPART_PART_BYTES, size - offset)
+            async with slots:
+                response = await self._request(
+                    "PUT", key, {"partNumber": str(number), "uploadId": upload_id},
+                    {"content-length": str(length)}, content=self._read_chunks(fd, offset, length),
+                )
+            return response.headers["etag"]
+
+        try:
+            offsets = range(0, size, S3_MULTIPART_PART_BYTES)
+            etags = await asyncio.gather(*(upload_part(number, offset) for number, offset in enumerate(offsets, 1)))
+            manifest = "".join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+                for number, etag in enumerate(etags, 1)
+            )
+            response = await self._request(
+                "POST", key, {"uploadId": upload_id},
+                content=f"<CompleteMultipartUpload>{manifest}</CompleteMultipartUpload>".encode(),
+            )
+            # Completion can fail after a 200 has already been sent
+            if _xml_text(response.content, "Code"):
+                raise StorageError(f"S3 multipart upload of {key} failed: {response.text[:200]}")
+        except BaseException:
+            try:
+                await self._request("DELETE", key, {"uploadId": upload_id}, expected=(204, 404))
+            except Exception as e:
+                print(f"Error aborting multipart upload of {key}: {e}")
+            raise
+
+    async def exists(self, key: str) -> bool:
+        return await self.size(key) is not None
+
+    async def size(self, key: str) -> Optional[int]:
+        response = await self._request("HEAD", key, expected=(200, 404))
+        return int(response.headers["content-length"]) if response.status_code == 200 else None
+
+    async def sha256(self, key: str) -> Optional[str]:
+        response = await self._request("HEAD", key, headers={"x-amz-checksum-mode": "ENABLED"}, expected=(200, 404))
+        if response.status_code == 404:
+            return None
+        checksum = response.headers.get("x-amz-checksum-sha256")
+        if checksum and "-" not in checksum:  # "-N" marks a checksum of part checksums
+            return base64.b64decode(checksum).hex()
+
+        # No whole-object checksum recorded: hash the bytes as they stream past
+        digest = hashlib.sha256()
+        url, signed = self._signed("GET", key)
+        async with self._client.stream("GET", url, headers=signed) as response:
+            if response.status_code != 200:
+                raise StorageError(f"S3 GET {key} failed with {response.status_code}")
+            async for chunk in response.aiter_bytes(STORAGE_STREAM_CHUNK_BYTES):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    async def read_head(self, key: str, length: int) -> bytes:
+        response = await self._request("GET", key, headers={"range": f"bytes=0-{length - 1}"}, expected=(200, 206))
+        return response.content[:length]
+
+    async def move(self, source: str, target: str) -> bool:
+        copy_source = f"/{self.bucket}/{uri_encode(self.prefix + source, safe='/')}"
+        response = await self._request("PUT", target, headers={"x-amz-copy-source": copy_source}, expected=(200, 404))
+        if response.status_code == 404:
+            return False
+        if _xml_text(response.content, "Code"):
+            raise StorageError(f"S3 copy of {source} failed: {response.text[:200]}")
+        await self.delete(source)
+        return True
+
+    async def delete(self, key: str) -> None:
+        await self._request("DELETE", key, expected=(204, 200, 404))
+
+    async def download_url(self, key: str, filename: str, content_type: str) -> Optional[str]:
+        return self._signer.presign("GET", self._url(key), STORAGE_URL_EXPIRES_SECONDS, query={
+            "response-content-disposition": f'attachment; filename="{filename.replace(chr(34), "")}"',
+            "response-content-type": content_type,
+        })
+
+    async def presign_upload(self, key: str, content_type: str, size: int, sha256: str) -> Optional[dict]:
+        # The store rejects a body whose length or SHA-256 differs from what was signed
+        headers = {
+            "content-type": content_type,
+            "content-length": str(size),
+            "x-amz-checksum-sha256": base64.b64encode(bytes.fromhex(sha256)).decode(),
+        }
+        return {
+            "method": "PUT",
+            "url": self._signer.presign("PUT", self._url(key), STORAGE_URL_EXPIRES_SECONDS, headers=headers),
+            "headers": headers,
+            "expires_in": STORAGE_URL_EXPIRES_SECONDS,
+        }
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,152 @@
+# app/services/upload/services/storage.py
+
+import asyncio
+import hashlib
+import os
+import shutil
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.services.upload.config import STORAGE_BACKEND, STORAGE_STREAM_CHUNK_BYTES
+
+
+class StorageError(Exception):
+    """A storage backend refused or failed an operation"""
+
+
+class StorageBackend(ABC):
+    """Where uploaded files live, addressed by a relative key like ``ab/cd/<sha256>.pdf``.
+
+    Every method is safe to call from the event loop; blocking work runs
+    in worker threads or over a pooled async HTTP client.
+    """
+
+    @abstractmethod
+    def describe(self, key: str) -> str:
+        """Stable, human-readable location stored on records (not a download link)"""
+
+    @abstractmethod
+    async def put_file(self, key: str, path: str, content_type: str) -> None:
+        """Store the local file at ``path`` under ``key``; the local file is consumed"""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether an object is stored under ``key``"""
+
+    @abstractmethod
+    async def size(self, key: str) -> Optional[int]:
+        """Stored size in bytes, or None if there is no such object"""
+
+    @abstractmethod
+    async def sha256(self, key: str) -> Optional[str]:
+        """Hex SHA-256 of the stored bytes, or None if there is no such object"""
+
+    @abstractmethod
+    async def read_head(self, key: str, length: int) -> bytes:
+        """The first ``length`` bytes, e.g. for content sniffing"""
+
+    @abstractmethod
+    async def move(self, source: str, target: str) -> bool:
+        """Rename an object; False if ``source`` does not exist"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove an object; a missing one is not an error"""
+
+    async def download_url(self, key: str, filename: str, content_type: str) -> Optional[str]:
+        """A time-limited URL clients can fetch directly, or None if the API must serve the file"""
+        return None
+
+    async def presign_upload(self, key: str, content_type: str, size: int, sha256: str) -> Optional[dict]:
+        """URL, method and headers for a direct client upload, or None if unsupported"""
+        return None
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    async def close(self) -> None:
+        pass
+
+
+def _move_into_place(path: str, target: str) -> None:
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    shutil.move(path, target)  # a rename when both are on the same filesystem
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _read_head(path: str, length: int) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(length)
+
+
+def _hash_file(path: str) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(STORAGE_STREAM_CHUNK_BYTES):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def _rename(source: str, target: str) -> bool:
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(source, target)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class LocalStorage(StorageBackend):
+    """Files under a directory on this host; the API serves downloads itself"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def describe(self, key: str) -> str:
+        return f"/{self.local_path(key)}"
+
+    async def put_file(self, key: str, path: str, content_type: str) -> None:
+        await asyncio.to_thread(_move_into_place, path, self.local_path(key))
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self.local_path(key))
+
+    async def size(self, key: str) -> Optional[int]:
+        try:
+            return (await asyncio.to_thread(os.stat, self.local_path(key))).st_size
+        except FileNotFoundError:
+            return None
+
+    async def sha256(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(_hash_file, self.local_path(key))
+
+    async def read_head(self, key: str, length: int) -> bytes:
+        return await asyncio.to_thread(_read_head, self.local_path(key), length)
+
+    async def move(self, source: str, target: str) -> bool:
+        return await asyncio.to_thread(_rename, self.local_path(source), self.local_path(target))
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(_remove, self.local_path(key))
+
+
+def create_storage(local_root: str, prefix: str = "") -> StorageBackend:
+    """The configured backend; ``prefix`` namespaces keys inside a shared bucket"""
+    if STORAGE_BACKEND == "s3":
+        from app.services.upload.services.s3_storage import S3Storage
+        return S3Storage(prefix=prefix)
+    if STORAGE_BACKEND != "local":
+        raise RuntimeError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}'")
+    return LocalStorage(local_root)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Script to move aged analytics events into the columnar archive
+"""
+import asyncio
+import sys
+sys.path.append('/app/backend')
+
+from app.core.db import init_db
+from app.services.analytics.services.event_archive import (
+    archive_job_views,
+    event_archive,
+    export_application_events,
+)
+
+async def main():
+    """Safe to re-run, even after a crash: archived views are matched by id and never appended twice"""
+    
+    # Initialize database
+    await init_db()
+    
+    moved = await archive_job_views(event_archive)
+    print(f"✅ Archived {moved} job view events")
+    exported = await export_application_events(event_archive)
+    print(f"✅ Exported {exported} application events")
+
+if __name__ == "__main__":
+    asyncio.run(main())
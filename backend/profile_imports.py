@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Script to report where import time goes when a worker starts
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+prints the slowest modules and a per-package breakdown, e.g.:
+
+    python profile_imports.py                 # profiles app.main
+    python profile_imports.py server --top 30
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+def profile(module: str):
+    """Return [(module, self_us, cumulative_us, depth)] in import order"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        sys.exit(result.returncode)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", nargs="?", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    entries = profile(args.module)
+    total_us = sum(self_us for _, self_us, _, _ in entries)
+
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"⏱️  import {args.module}: {total_us / 1000:.1f} ms across {len(entries)} modules\n")
+
+    print(f"{'package':<32}{'self ms':>10}{'share':>8}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}{100 * self_us / total_us:>7.1f}%")
+
+    print(f"\n{'module':<56}{'self ms':>10}{'cumul ms':>10}")
+    for name, self_us, cumulative_us, _ in sorted(entries, key=lambda entry: -entry[2])[:args.top]:
+        print(f"{name:<56}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
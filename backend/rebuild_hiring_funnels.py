@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Script to recompute the hiring funnel of every job, employer and the platform
+"""
+import asyncio
+import sys
+sys.path.append('/app/backend')
+
+from app.core.db import init_db
+from app.services.analytics.services.hiring_funnel import rebuild_funnel_stats
+
+async def main():
+    """Backfill from the event log; new transitions are folded in as they happen"""
+    
+    # Initialize database
+    await init_db()
+    
+    scopes = await rebuild_funnel_stats()
+    print(f"✅ Hiring funnels rebuilt for {scopes} scopes")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Script to recompute the "similar jobs" rail of every published job
+"""
+import asyncio
+import sys
+sys.path.append('/app/backend')
+
+from app.core.db import init_db
+from app.services.job.services.similar_jobs import rebuild_similar_jobs
+
+async def main():
+    """Full rebuild; incremental updates happen when jobs open or close"""
+    
+    # Initialize database
+    await init_db()
+    
+    updated = await rebuild_similar_jobs()
+    print(f"✅ Similar jobs rebuilt for {updated} jobs")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Script to recount the per-job applicant counters from the applications
+"""
+import asyncio
+import sys
+sys.path.append('/app/backend')
+
+from app.core.db import init_db
+from app.services.application.services.application_counters import reconcile_counters
+
+async def main():
+    """Full recount; the API also reconciles periodically while running"""
+    
+    # Initialize database
+    await init_db()
+    
+    jobs = await reconcile_counters()
+    print(f"✅ Application counters reconciled for {jobs} jobs")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,6 +8,8 @@ import requests
 import json
 import sys
 import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
 # Backend URL from frontend .env
@@ -484,6 +486,73 @@ class AuthenticationTester:
             self.log_test(test_name, False, "Bcrypt password verification failed", {"login_data": login_data})
             return False
     
+    def test_login_storm_latency(self, email: str, password: str, logins: int = 48):
+        """Test that a burst of logins does not stall unrelated endpoints
+        
+        All logins share one IP and one email, so the backend must run with
+        login rate limits above the storm size, e.g.
+        LOGIN_LIMIT_PER_IP_BURST=100 LOGIN_LIMIT_PER_EMAIL_BURST=100.
+        Otherwise most logins get 429 before bcrypt and nothing is measured.
+        """
+        test_name = "Login Storm Latency"
+        min_hashed = logins // 2  # logins that must reach bcrypt for the timing to mean anything
+        
+        def health_latency_ms():
+            started = time.perf_counter()
+            requests.get(f"{BACKEND_URL}/health", timeout=10)
+            return (time.perf_counter() - started) * 1000
+        
+        def login():
+            response = requests.post(
+                f"{API_BASE}/auth/login",
+                json={"email": email, "password": password},
+                timeout=30
+            )
+            return response.status_code
+        
+        try:
+            baseline = [health_latency_ms() for _ in range(10)]
+            
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                storm = [pool.submit(login) for _ in range(logins)]
+                during = []
+                while not all(f.done() for f in storm):
+                    during.append(health_latency_ms())
+                statuses = [f.result() for f in storm]
+            
+            baseline_p50 = statistics.median(baseline)
+            during_p50 = statistics.median(during) if during else baseline_p50
+            details = {
+                "baseline_p50_ms": round(baseline_p50, 1),
+                "storm_p50_ms": round(during_p50, 1),
+                "storm_max_ms": round(max(during), 1) if during else None,
+                "logins_ok": statuses.count(200),
+                "logins_shed": statuses.count(503),
+                "logins_rate_limited": statuses.count(429),
+            }
+            
+            if statuses.count(200) < min_hashed:
+                self.log_test(
+                    test_name, False,
+                    f"Only {statuses.count(200)} of {logins} logins ran bcrypt; raise LOGIN_LIMIT_PER_IP_BURST "
+                    f"and LOGIN_LIMIT_PER_EMAIL_BURST on the backend above {logins}",
+                    details
+                )
+                return False
+            
+            # Health checks should not queue behind bcrypt: allow some noise,
+            # but not the ~200 ms per login a blocked event loop would add
+            if during_p50 <= baseline_p50 + 50:
+                self.log_test(test_name, True, f"Health p50 stayed flat during {logins} logins", details)
+                return True
+            else:
+                self.log_test(test_name, False, "Health latency grew during login storm", details)
+                return False
+                
+        except requests.exceptions.RequestException as e:
+            self.log_test(test_name, False, f"Network error during login storm: {str(e)}")
+            return False
+    
     def run_all_tests(self):
         """Run the complete backend test suite for Mentaurra rebranding verification"""
         print("🚀 Starting Mentaurra Backend API Tests")
@@ -558,6 +627,10 @@ class AuthenticationTester:
         # Test bcrypt specifically
         self.test_bcrypt_compatibility()
         
+        print("\n🌩️ Testing Login Storm Latency...")
+        # bcrypt must run off the event loop
+        self.test_login_storm_latency(candidate_email, "SecurePass123!")
+        
         # Summary
         print("\n" + "=" * 60)
         print("📊 MENTAURRA BACKEND TEST SUMMARY")
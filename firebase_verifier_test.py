@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Firebase Token Verifier Test Suite
+Tests local Firebase ID token verification against a stand-in signing key,
+without contacting Google's certificate endpoint
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from jose import JWTError, jwt
+
+from app.services.auth_service.services.firebase_verfier import FirebaseTokenVerifier
+
+PROJECT_ID = "mentaurra-test"
+
+
+class StandInKeyServer:
+    """Plays the part of Google's x509 certificate endpoint"""
+
+    def __init__(self, max_age: int = 3600):
+        self.max_age = max_age
+        self.keys = {}
+        self.certificates = {}
+        self.requests = 0
+        self.add_key("key-1")
+
+    def add_key(self, kid: str):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.system.gserviceaccount.com")])
+        now = datetime.now(timezone.utc)
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - timedelta(days=1))
+            .not_valid_after(now + timedelta(days=1))
+            .sign(key, hashes.SHA256())
+        )
+        self.keys[kid] = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        self.certificates[kid] = certificate.public_bytes(serialization.Encoding.PEM).decode()
+
+    def fetch(self):
+        self.requests += 1
+        return dict(self.certificates), self.max_age
+
+    def sign(self, kid: str = "key-1", audience: str = PROJECT_ID, expires_in: int = 3600, **claims):
+        now = int(time.time())
+        payload = {
+            "iss": f"https://securetoken.google.com/{audience}",
+            "aud": audience,
+            "sub": "firebase-uid-123",
+            "email": "ada@example.com",
+            "email_verified": True,
+            "auth_time": now,
+            "iat": now,
+            "exp": now + expires_in,
+            **claims,
+        }
+        return jwt.encode(payload, self.keys[kid], algorithm="RS256", headers={"kid": kid})
+
+
+class FirebaseVerifierTester:
+    def __init__(self):
+        self.test_results = []
+
+    def log_test(self, test_name: str, success: bool, message: str, details: Dict[Any, Any] = None):
+        """Log test results"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "message": message,
+            "details": details or {}
+        }
+        self.test_results.append(result)
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    async def expect_rejected(self, verifier: FirebaseTokenVerifier, token: str) -> bool:
+        try:
+            await verifier.verify(token, PROJECT_ID)
+            return False
+        except JWTError:
+            return True
+
+    async def test_valid_token(self):
+        """A token signed by a published key verifies and exposes the uid"""
+        test_name = "Valid Token"
+        server = StandInKeyServer()
+        verifier = FirebaseTokenVerifier(server.fetch)
+
+        claims = await verifier.verify(server.sign(), PROJECT_ID)
+        if claims.get("uid") == "firebase-uid-123" and claims.get("email") == "ada@example.com":
+            self.log_test(test_name, True, "Token verified against stand-in certificate")
+        else:
+            self.log_test(test_name, False, "Unexpected claims", {"claims": claims})
+
+    async def test_verified_token_memoized(self):
+        """Verifying the same token twice does the signature check once"""
+        test_name = "Verified Token Memoized"
+        server = StandInKeyServer()
+        verifier = FirebaseTokenVerifier(server.fetch)
+        token = server.sign()
+
+        await verifier.verify(token, PROJECT_ID)
+        checks = []
+        original = verifier._verify_sync
+        verifier._verify_sync = lambda *args: checks.append(args) or original(*args)
+        await verifier.verify(token, PROJECT_ID)
+
+        if not checks:
+            self.log_test(test_name, True, "Second verification served from memo")
+        else:
+            self.log_test(test_name, False, "Token was verified again", {"checks": len(checks)})
+
+    async def test_certificates_cached(self):
+        """Certificates are fetched once while their max-age holds"""
+        test_name = "Certificates Cached"
+        server = StandInKeyServer(max_age=3600)
+        verifier = FirebaseTokenVerifier(server.fetch)
+
+        for i in range(5):
+            await verifier.verify(server.sign(sub=f"uid-{i}"), PROJECT_ID)
+
+        if server.requests == 1:
+            self.log_test(test_name, True, "5 tokens verified with one certificate fetch")
+        else:
+            self.log_test(test_name, False, "Certificates refetched", {"requests": server.requests})
+
+    async def test_certificate_expiry_honored(self):
+        """A zero max-age means the next verification refetches"""
+        test_name = "Certificate Expiry Honored"
+        server = StandInKeyServer(max_age=0)
+        verifier = FirebaseTokenVerifier(server.fetch)
+
+        await verifier.verify(server.sign(sub="uid-a"), PROJECT_ID)
+        await verifier.verify(server.sign(sub="uid-b"), PROJECT_ID)
+
+        if server.requests == 2:
+            self.log_test(test_name, True, "Expired certificates were refetched")
+        else:
+            self.log_test(test_name, False, "Cache-Control expiry ignored", {"requests": server.requests})
+
+    async def test_rotated_key(self):
+        """A token signed with a newly published key triggers a refresh"""
+        test_name = "Rotated Key"
+        server = StandInKeyServer()
+        verifier = FirebaseTokenVerifier(server.fetch)
+        await verifier.verify(server.sign(), PROJECT_ID)
+
+        server.add_key("key-2")
+        verifier._last_fetch = 0  # pretend the minimum refresh interval has passed
+        claims = await verifier.verify(server.sign(kid="key-2"), PROJECT_ID)
+
+        if claims.get("uid") and server.requests == 2:
+            self.log_test(test_name, True, "Unknown kid refreshed the certificates")
+        else:
+            self.log_test(test_name, False, "Rotated key not picked up", {"requests": server.requests})
+
+    async def test_invalid_tokens_rejected(self):
+        """Wrong audience, expired, forged and unknown-key tokens are rejected"""
+        test_name = "Invalid Tokens Rejected"
+        server = StandInKeyServer()
+        verifier = FirebaseTokenVerifier(server.fetch)
+
+        other = StandInKeyServer()
+        other.add_key("key-9")
+
+        results = {
+            "wrong_audience": await self.expect_rejected(verifier, server.sign(audience="another-project")),
+            "expired": await self.expect_rejected(verifier, server.sign(expires_in=-60)),
+            "forged_signature": await self.expect_rejected(verifier, other.sign(kid="key-1")),
+            "unknown_kid": await self.expect_rejected(verifier, other.sign(kid="key-9")),
+        }
+
+        if all(results.values()):
+            self.log_test(test_name, True, "All invalid tokens rejected")
+        else:
+            self.log_test(test_name, False, "Invalid token accepted", results)
+
+    def run_all_tests(self):
+        """Run the complete Firebase verifier test suite"""
+        print("🚀 Starting Firebase Token Verifier Tests")
+        print("=" * 60)
+
+        for test in [
+            self.test_valid_token,
+            self.test_verified_token_memoized,
+            self.test_certificates_cached,
+            self.test_certificate_expiry_honored,
+            self.test_rotated_key,
+            self.test_invalid_tokens_rejected,
+        ]:
+            try:
+                asyncio.run(test())
+            except Exception as e:
+                self.log_test(test.__name__, False, f"Unexpected error: {str(e)}")
+
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        failed_tests = total_tests - passed_tests
+
+        print("\n" + "=" * 60)
+        print(f"Total Tests: {total_tests}")
+        print(f"Passed: {passed_tests}")
+        print(f"Failed: {failed_tests}")
+
+        return failed_tests == 0
+
+
+def main():
+    """Main test execution for the Firebase token verifier"""
+    tester = FirebaseVerifierTester()
+    success = tester.run_all_tests()
+
+    if success:
+        print("\n🎉 All Firebase verifier tests passed!")
+        sys.exit(0)
+    else:
+        print("\n💥 Some Firebase verifier tests failed!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Heavy Hitters Test Suite
+Tests the decayed count-min sketch and space-saving top-K behind the
+trending jobs feed offline, with explicit timestamps so every run is exact
+"""
+
+import math
+import os
+import sys
+from typing import Dict, Any
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.heavy_hitters import MAX_EXPONENT, DecayedCountMinSketch, SpaceSavingTopK
+from app.services.analytics.services.trending import TrendingJobs
+
+T0 = 1_800_000_000.0
+HALF_LIFE = 3600.0
+
+
+def close(a: float, b: float) -> bool:
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def sketch(width: int = 2048, depth: int = 4) -> DecayedCountMinSketch:
+    result = DecayedCountMinSketch(width, depth, half_life_seconds=HALF_LIFE)
+    result._decay.landmark = T0  # pin the landmark so decay depends only on at=
+    return result
+
+
+def top_k(k: int) -> SpaceSavingTopK:
+    result = SpaceSavingTopK(k, half_life_seconds=HALF_LIFE)
+    result._decay.landmark = T0
+    return result
+
+
+class HeavyHittersTester:
+    def __init__(self):
+        self.test_results = []
+
+    def log_test(self, test_name: str, success: bool, message: str, details: Dict[Any, Any] = None):
+        """Log test results"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "message": message,
+            "details": details or {}
+        }
+        self.test_results.append(result)
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def test_decay_halves_score(self):
+        """A score halves after one half-life, in both structures"""
+        test_name = "Decay Halves Score"
+        scores = sketch()
+        top = top_k(10)
+        scores.add("job-1", 8.0, at=T0 + 100)
+        top.add("job-1", 8.0, at=T0 + 100)
+
+        later = T0 + 100 + HALF_LIFE
+        results = {
+            "sketch_now": scores.estimate("job-1", now=T0 + 100),
+            "sketch_after_half_life": scores.estimate("job-1", now=later),
+            "sketch_after_two": scores.estimate("job-1", now=later + HALF_LIFE),
+            "top_after_half_life": top.top(now=later)[0][1],
+        }
+        expected = {"sketch_now": 8.0, "sketch_after_half_life": 4.0, "sketch_after_two": 2.0, "top_after_half_life": 4.0}
+        if all(close(results[name], value) for name, value in expected.items()):
+            self.log_test(test_name, True, "8 -> 4 -> 2 over two half-lives")
+        else:
+            self.log_test(test_name, False, "Decay off", results)
+
+    def test_rescale_keeps_estimates(self):
+        """Moving the landmark far ahead rescales counters without changing any estimate"""
+        test_name = "Landmark Rescale"
+        scores = sketch()
+        top = top_k(10)
+        for i, key in enumerate(["job-1", "job-2", "job-3"]):
+            scores.add(key, i + 1.0, at=T0 + i)
+            top.add(key, i + 1.0, at=T0 + i)
+
+        # Just past the point where exp(rate * age) would need a rescale
+        far = T0 + (MAX_EXPONENT + 1) / scores._decay.rate
+        before = {key: scores.estimate(key, now=far) for key in ["job-1", "job-2", "job-3"]}
+        top_before = {key: score for key, score, _ in top.top(now=far)}
+
+        # A zero-weight add at `far` triggers the rescale without adding mass
+        scores.add("job-4", 0.0, at=far)
+        top.add("job-1", 0.0, at=far)
+        after = {key: scores.estimate(key, now=far) for key in ["job-1", "job-2", "job-3"]}
+        top_after = {key: score for key, score, _ in top.top(now=far)}
+
+        results = {
+            "sketch_rescaled": scores._decay.landmark == far,
+            "top_rescaled": top._decay.landmark == far,
+            "sketch_unchanged": all(math.isclose(before[key], after[key], rel_tol=1e-9) for key in before),
+            "top_unchanged": all(math.isclose(top_before[key], top_after[key], rel_tol=1e-9) for key in top_before),
+        }
+        if all(results.values()):
+            self.log_test(test_name, True, "Estimates identical across the landmark move")
+        else:
+            self.log_test(test_name, False, "Rescale changed estimates", {**results, "before": before, "after": after})
+
+    def test_heavy_hitters_tracked(self):
+        """Keys above total / k stay in the top-K however much noise passes through"""
+        test_name = "Heavy Hitters Tracked"
+        k = 10
+        top = top_k(k)
+        total = 0.0
+        now = T0 + 5_000
+        hot_a_truth = 0.0
+        for i in range(5_000):
+            at = T0 + i  # decays mildly over the run
+            if i % 4 == 0:
+                top.add("hot-a", at=at)
+                hot_a_truth += 2 ** (-(now - at) / HALF_LIFE)
+            elif i % 6 == 1:
+                top.add("hot-b", at=at)
+            else:
+                top.add(f"noise-{i}", at=at)  # every noise key is seen once
+            total += 1
+
+        ranked = top.top(now=now)
+        tracked = {key: (score, error) for key, score, error in ranked}
+        results = {
+            "size_bounded": len(ranked) == k,
+            "hot_a_tracked": "hot-a" in tracked,
+            "hot_b_tracked": "hot-b" in tracked,
+            "hot_a_first": ranked[0][0] == "hot-a",
+            # Space-saving never undercounts, and score - error is a lower bound
+            "hot_a_bounds": "hot-a" in tracked
+            and tracked["hot-a"][0] - tracked["hot-a"][1] - 1e-9 <= hot_a_truth <= tracked["hot-a"][0] + 1e-9,
+        }
+        if all(results.values()):
+            self.log_test(test_name, True, f"Both hot keys kept among {k} slots after {int(total)} events")
+        else:
+            self.log_test(test_name, False, "Heavy hitter lost", {**results, "top": [key for key, _, _ in ranked]})
+
+    def test_sketch_never_undercounts(self):
+        """Count-min estimates are at least the true decayed score, even when columns collide"""
+        test_name = "Sketch Never Undercounts"
+        scores = sketch(width=16, depth=2)  # tiny, so collisions are certain
+        truth = {}
+        for i in range(200):
+            key = f"job-{i % 40}"
+            scores.add(key, 1.0, at=T0)
+            truth[key] = truth.get(key, 0.0) + 1.0
+
+        low = [key for key, value in truth.items() if scores.estimate(key, now=T0) < value - 1e-9]
+        if not low:
+            self.log_test(test_name, True, "No key estimated below its true score")
+        else:
+            self.log_test(test_name, False, "Undercounted keys", {"keys": low})
+
+    def test_local_top_takes_minimum(self):
+        """local_top reports the smaller of the sketch and top-K estimates"""
+        test_name = "Local Top Takes Minimum"
+        trending = TrendingJobs()
+        trending._scores = sketch()
+        trending._top = top_k(2)
+
+        # With two slots, "job-c" evicts "job-b" and inherits its count:
+        # top-K overestimates it, the sketch does not
+        trending.record("job-a", 5.0, at=T0)
+        trending.record("job-b", 3.0, at=T0)
+        trending.record("job-c", 1.0, at=T0)
+        evicted = {entry.job_id: entry.score for entry in trending.local_top(now=T0)}
+
+        # A one-column sketch sums every key: now the sketch overestimates
+        colliding = TrendingJobs()
+        colliding._scores = sketch(width=1, depth=1)
+        colliding._top = top_k(10)
+        colliding.record("job-a", 5.0, at=T0)
+        colliding.record("job-b", 3.0, at=T0)
+        collided = {entry.job_id: entry.score for entry in colliding.local_top(now=T0)}
+
+        results = {
+            "top_k_inflated": close(trending._top.top(now=T0)[-1][1], 4.0),
+            "sketch_wins": evicted == {"job-a": 5.0, "job-c": 1.0},
+            "sketch_inflated": close(colliding._scores.estimate("job-b", now=T0), 8.0),
+            "top_k_wins": collided == {"job-a": 5.0, "job-b": 3.0},
+        }
+        if all(results.values()):
+            self.log_test(test_name, True, "Tighter estimate chosen either way")
+        else:
+            self.log_test(test_name, False, "Wrong estimate chosen", {**results, "evicted": evicted, "collided": collided})
+
+    def run_all_tests(self):
+        """Run the complete heavy hitters test suite"""
+        print("🚀 Starting Heavy Hitters Tests")
+        print("=" * 60)
+
+        for test in [
+            self.test_decay_halves_score,
+            self.test_rescale_keeps_estimates,
+            self.test_heavy_hitters_tracked,
+            self.test_sketch_never_undercounts,
+            self.test_local_top_takes_minimum,
+        ]:
+            try:
+                test()
+            except Exception as e:
+                self.log_test(test.__name__, False, f"Unexpected error: {str(e)}")
+
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        failed_tests = total_tests - passed_tests
+
+        print("\n" + "=" * 60)
+        print(f"Total Tests: {total_tests}")
+        print(f"Passed: {passed_tests}")
+        print(f"Failed: {failed_tests}")
+
+        return failed_tests == 0
+
+
+def main():
+    """Main test execution for the trending sketches"""
+    tester = HeavyHittersTester()
+    success = tester.run_all_tests()
+
+    if success:
+        print("\n🎉 All heavy hitters tests passed!")
+        sys.exit(0)
+    else:
+        print("\n💥 Some heavy hitters tests failed!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+HyperLogLog Test Suite
+Tests the distinct-count sketch behind unique job viewers offline:
+accuracy, the sparse to dense switch, serialization and merging
+"""
+
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Any
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.hyperloglog import HyperLogLog
+from app.services.analytics.config import ANALYTICS_HLL_PRECISION
+from app.services.analytics.services.unique_viewers import UniqueViewerCounter
+
+# Standard error at precision 14 is ~0.8%; items are fixed, so estimates are too
+MAX_RELATIVE_ERROR = 0.02
+
+
+def sketch_of(items, precision: int = ANALYTICS_HLL_PRECISION) -> HyperLogLog:
+    sketch = HyperLogLog(precision)
+    for item in items:
+        sketch.add(item)
+    return sketch
+
+
+def registers(sketch: HyperLogLog) -> list:
+    """Register values whatever the representation"""
+    if sketch._dense is not None:
+        return list(sketch._dense)
+    values = [0] * sketch.num_registers
+    for index, rank in sketch._sparse.items():
+        values[index] = rank
+    return values
+
+
+def users(start: int, stop: int):
+    return (f"u:user-{i}" for i in range(start, stop))
+
+
+class HyperLogLogTester:
+    def __init__(self):
+        self.test_results = []
+
+    def log_test(self, test_name: str, success: bool, message: str, details: Dict[Any, Any] = None):
+        """Log test results"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "message": message,
+            "details": details or {}
+        }
+        self.test_results.append(result)
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def test_estimate_accuracy(self):
+        """Estimates stay within ~1% of the true count from 10^2 to 10^5 items"""
+        test_name = "Estimate Accuracy"
+        errors = {}
+        for count in (100, 1_000, 10_000, 100_000):
+            sketch = sketch_of(users(0, count))
+            errors[count] = round(abs(sketch.estimate() - count) / count, 4)
+
+        if all(error <= MAX_RELATIVE_ERROR for error in errors.values()):
+            self.log_test(test_name, True, f"Relative errors {errors}")
+        else:
+            self.log_test(test_name, False, f"Error above {MAX_RELATIVE_ERROR:.0%}", errors)
+
+    def test_duplicates_ignored(self):
+        """Adding the same items again does not change the estimate"""
+        test_name = "Duplicates Ignored"
+        sketch = sketch_of(users(0, 5_000))
+        before = sketch.estimate()
+        for item in users(0, 5_000):
+            sketch.add(item)
+
+        if sketch.estimate() == before:
+            self.log_test(test_name, True, "Repeated viewers counted once")
+        else:
+            self.log_test(test_name, False, "Estimate moved", {"before": before, "after": sketch.estimate()})
+
+    def test_sparse_to_dense(self):
+        """A sketch stays sparse while small and turns dense once that is smaller"""
+        test_name = "Sparse To Dense"
+        sketch = HyperLogLog(ANALYTICS_HLL_PRECISION)
+        threshold = sketch.num_registers // 3  # sparse registers cost 3 bytes each
+        switched_at = None
+        for i, item in enumerate(users(0, 50_000), 1):
+            sketch.add(item)
+            if sketch._dense is not None:
+                switched_at = i
+                break
+
+        small = sketch_of(users(0, 100))
+        results = {
+            "small_sparse": small._dense is None and len(small.to_bytes()) < 400,
+            "switched": switched_at is not None,
+            "touched_registers_at_switch": threshold < sum(1 for rank in (sketch._dense or []) if rank),
+            "dense_size": len(sketch.to_bytes()) == 2 + sketch.num_registers,
+        }
+        if all(results.values()):
+            self.log_test(test_name, True, f"Switched to dense after {switched_at} items")
+        else:
+            self.log_test(test_name, False, "Representation switch wrong", results)
+
+    def test_serialization_round_trip(self):
+        """to_bytes/from_bytes give back the same registers, sparse or dense"""
+        test_name = "Serialization Round Trip"
+        results = {}
+        for name, count in (("empty", 0), ("sparse", 500), ("dense", 20_000)):
+            sketch = sketch_of(users(0, count))
+            restored = HyperLogLog.from_bytes(sketch.to_bytes())
+            results[name] = (
+                restored.precision == sketch.precision
+                and restored._sparse == sketch._sparse
+                and restored._dense == sketch._dense
+                and restored.estimate() == sketch.estimate()
+            )
+
+        if all(results.values()):
+            self.log_test(test_name, True, "Sketches restored exactly")
+        else:
+            self.log_test(test_name, False, "Round trip changed a sketch", results)
+
+    def test_merge(self):
+        """Merging any mix of sparse and dense sketches equals sketching the union"""
+        test_name = "Merge"
+        results = {}
+        cases = {
+            "sparse+sparse": ((0, 1_000), (500, 1_500), (0, 1_500)),
+            "sparse+dense": ((0, 1_000), (500, 30_000), (0, 30_000)),
+            "dense+sparse": ((0, 29_500), (29_000, 30_000), (0, 30_000)),
+            "dense+dense": ((0, 20_000), (10_000, 30_000), (0, 30_000)),
+        }
+        for name, (left, right, expected) in cases.items():
+            merged = sketch_of(users(*left))
+            merged.merge(sketch_of(users(*right)))
+            results[name] = registers(merged) == registers(sketch_of(users(*expected)))
+
+        try:
+            HyperLogLog(12).merge(HyperLogLog(14))
+            results["precision_mismatch_rejected"] = False
+        except ValueError:
+            results["precision_mismatch_rejected"] = True
+
+        if all(results.values()):
+            self.log_test(test_name, True, "Merged sketches match the union")
+        else:
+            self.log_test(test_name, False, "Merge differs from union", results)
+
+    def test_viewer_counter_scopes(self):
+        """Views fold into job, employer and platform sketches; anonymous views are skipped"""
+        test_name = "Viewer Counter Scopes"
+        counter = UniqueViewerCounter()
+        at = datetime(2026, 10, 19, 15, 30)
+        day = at.replace(hour=0, minute=0)
+        batch = [
+            {"job_id": "job-1", "employer_id": "emp-1", "viewer_id": "ada", "at": at},
+            {"job_id": "job-1", "employer_id": "emp-1", "viewer_id": "ada", "at": at},
+            {"job_id": "job-2", "employer_id": "emp-1", "session_id": "s-9", "at": at},
+            {"job_id": "job-2", "employer_id": "emp-1", "at": at},  # anonymous, no session
+            {"job_id": "job-2", "employer_id": "emp-1", "viewer_id": "bob", "kind": "click", "at": at},
+        ]
+        counter.record(batch)
+
+        counts = {key[:2]: len(sketch) for key, sketch in counter._pending.items() if key[2] == day}
+        expected = {("platform", ""): 2, ("job", "job-1"): 1, ("job", "job-2"): 1, ("employer", "emp-1"): 2}
+        if counts == expected:
+            self.log_test(test_name, True, "Each scope counts its distinct viewers")
+        else:
+            self.log_test(test_name, False, "Unexpected per-scope counts", {"counts": counts})
+
+    def run_all_tests(self):
+        """Run the complete HyperLogLog test suite"""
+        print("🚀 Starting HyperLogLog Tests")
+        print("=" * 60)
+
+        for test in [
+            self.test_estimate_accuracy,
+            self.test_duplicates_ignored,
+            self.test_sparse_to_dense,
+            self.test_serialization_round_trip,
+            self.test_merge,
+            self.test_viewer_counter_scopes,
+        ]:
+            try:
+                test()
+            except Exception as e:
+                self.log_test(test.__name__, False, f"Unexpected error: {str(e)}")
+
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        failed_tests = total_tests - passed_tests
+
+        print("\n" + "=" * 60)
+        print(f"Total Tests: {total_tests}")
+        print(f"Passed: {passed_tests}")
+        print(f"Failed: {failed_tests}")
+
+        return failed_tests == 0
+
+
+def main():
+    """Main test execution for the HyperLogLog sketch"""
+    tester = HyperLogLogTester()
+    success = tester.run_all_tests()
+
+    if success:
+        print("\n🎉 All HyperLogLog tests passed!")
+        sys.exit(0)
+    else:
+        print("\n💥 Some HyperLogLog tests failed!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
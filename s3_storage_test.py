@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+S3 Storage Backend Test Suite
+Tests the S3-compatible resume storage backend against a local stand-in
+(moto_server or MinIO), without touching a real cloud bucket
+
+    moto_server -p 5000
+    python s3_storage_test.py
+
+For MinIO set S3_TEST_ENDPOINT_URL=http://127.0.0.1:9000 and the
+S3_TEST_ACCESS_KEY_ID / S3_TEST_SECRET_ACCESS_KEY of the server.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import sys
+import tempfile
+import uuid
+from typing import Dict, Any
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import httpx
+
+from app.core.sigv4 import EMPTY_SHA256
+from app.services.upload.config import S3_MULTIPART_PART_BYTES, S3_MULTIPART_THRESHOLD_BYTES
+from app.services.upload.services.s3_storage import S3Storage
+from app.services.upload.services.storage import StorageError
+
+ENDPOINT_URL = os.getenv("S3_TEST_ENDPOINT_URL", "http://127.0.0.1:5000")
+BUCKET = os.getenv("S3_TEST_BUCKET", "mentaurra-storage-test")
+ACCESS_KEY = os.getenv("S3_TEST_ACCESS_KEY_ID", "test")
+SECRET_KEY = os.getenv("S3_TEST_SECRET_ACCESS_KEY", "test")
+
+# Big enough to need at least two parts
+MULTIPART_BYTES = max(S3_MULTIPART_THRESHOLD_BYTES, S3_MULTIPART_PART_BYTES) + S3_MULTIPART_PART_BYTES // 2
+
+
+def make_storage() -> S3Storage:
+    # A fresh prefix per test keeps runs independent in a shared bucket
+    return S3Storage(
+        bucket=BUCKET,
+        endpoint_url=ENDPOINT_URL,
+        access_key=ACCESS_KEY,
+        secret_key=SECRET_KEY,
+        prefix=f"test-{uuid.uuid4().hex[:8]}/",
+    )
+
+
+def write_temp_file(data: bytes) -> str:
+    fd, path = tempfile.mkstemp(suffix=".part")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+
+class RecordingStorage:
+    """Records every request an S3Storage makes, optionally failing some of them"""
+
+    def __init__(self, storage: S3Storage, fail=None):
+        self.calls = []
+        original = storage._request
+
+        async def request(method, key, query=None, headers=None, content=None, expected=(200,)):
+            self.calls.append((method, dict(query or {})))
+            if fail and fail(method, query or {}):
+                raise StorageError("Injected failure")
+            return await original(method, key, query, headers, content, expected)
+
+        storage._request = request
+
+    def parts(self):
+        return [query["partNumber"] for method, query in self.calls if method == "PUT" and "partNumber" in query]
+
+
+class S3StorageTester:
+    def __init__(self):
+        self.test_results = []
+
+    def log_test(self, test_name: str, success: bool, message: str, details: Dict[Any, Any] = None):
+        """Log test results"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "message": message,
+            "details": details or {}
+        }
+        self.test_results.append(result)
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    async def create_bucket(self) -> bool:
+        storage = make_storage()
+        try:
+            headers = storage._signer.sign("PUT", storage._base_url, payload_hash=EMPTY_SHA256)
+            response = await storage._client.put(storage._base_url, headers=headers)
+            # 409 means the bucket is already there
+            return response.status_code in (200, 409)
+        finally:
+            await storage.close()
+
+    async def test_single_put(self):
+        """A small file goes up in one PUT and reads back the same"""
+        test_name = "Single PUT"
+        storage = make_storage()
+        recorder = RecordingStorage(storage)
+        try:
+            data = b"%PDF-1.4 " + os.urandom(64 * 1024)
+            path = write_temp_file(data)
+            await storage.put_file("single.pdf", path, "application/pdf")
+
+            results = {
+                "one_put": recorder.parts() == [] and [c[0] for c in recorder.calls] == ["PUT"],
+                "size": await storage.size("single.pdf") == len(data),
+                "sha256": await storage.sha256("single.pdf") == hashlib.sha256(data).hexdigest(),
+                "read_head": await storage.read_head("single.pdf", 16) == data[:16],
+                "local_file_consumed": not os.path.exists(path),
+            }
+            if all(results.values()):
+                self.log_test(test_name, True, f"{len(data)} bytes stored and read back")
+            else:
+                self.log_test(test_name, False, "Single PUT mismatch", results)
+        finally:
+            await storage.close()
+
+    async def test_multipart_put(self):
+        """A file past the threshold is uploaded in several parts and reassembled"""
+        test_name = "Multipart PUT"
+        storage = make_storage()
+        recorder = RecordingStorage(storage)
+        try:
+            data = os.urandom(MULTIPART_BYTES)
+            await storage.put_file("multi.bin", write_temp_file(data), "application/octet-stream")
+
+            results = {
+                "parts": recorder.parts(),
+                "size": await storage.size("multi.bin") == len(data),
+                "sha256": await storage.sha256("multi.bin") == hashlib.sha256(data).hexdigest(),
+            }
+            if len(results["parts"]) > 1 and results["size"] and results["sha256"]:
+                self.log_test(test_name, True, f"{len(data)} bytes uploaded in {len(results['parts'])} parts")
+            else:
+                self.log_test(test_name, False, "Multipart upload mismatch", results)
+        finally:
+            await storage.close()
+
+    async def test_multipart_abort(self):
+        """A failed part aborts the multipart upload and leaves no object behind"""
+        test_name = "Multipart Abort"
+        storage = make_storage()
+        recorder = RecordingStorage(storage, fail=lambda method, query: query.get("partNumber") == "2")
+        try:
+            path = write_temp_file(os.urandom(MULTIPART_BYTES))
+            try:
+                await storage.put_file("aborted.bin", path, "application/octet-stream")
+                raised = False
+            except StorageError:
+                raised = True
+
+            aborts = [query for method, query in recorder.calls if method == "DELETE" and "uploadId" in query]
+            listing = None
+            if aborts:
+                # Listing the parts of an aborted upload is NoSuchUpload
+                response = await storage._request("GET", "aborted.bin", {"uploadId": aborts[0]["uploadId"]}, expected=(200, 404))
+                listing = response.status_code
+
+            results = {
+                "raised": raised,
+                "aborted": len(aborts) == 1,
+                "upload_gone": listing == 404,
+                "no_object": not await storage.exists("aborted.bin"),
+                "local_file_kept": os.path.exists(path),  # the caller decides what to do with it
+            }
+            if os.path.exists(path):
+                os.remove(path)
+            if all(results.values()):
+                self.log_test(test_name, True, "Failed part aborted the upload")
+            else:
+                self.log_test(test_name, False, "Multipart upload not cleaned up", results)
+        finally:
+            await storage.close()
+
+    async def test_move_and_delete(self):
+        """Move renames an object, reports a missing source, and delete is idempotent"""
+        test_name = "Move And Delete"
+        storage = make_storage()
+        try:
+            data = b"move me"
+            await storage.put_file("source.txt", write_temp_file(data), "text/plain")
+
+            results = {
+                "moved": await storage.move("source.txt", "target.txt"),
+                "source_gone": not await storage.exists("source.txt"),
+                "target_there": await storage.read_head("target.txt", 64) == data,
+                "missing_source": await storage.move("source.txt", "elsewhere.txt") is False,
+            }
+            await storage.delete("target.txt")
+            results["deleted"] = not await storage.exists("target.txt")
+            await storage.delete("target.txt")  # deleting again is not an error
+
+            if all(results.values()):
+                self.log_test(test_name, True, "Move and delete behave")
+            else:
+                self.log_test(test_name, False, "Move/delete mismatch", results)
+        finally:
+            await storage.close()
+
+    async def test_presigned_put_with_checksum(self):
+        """A presigned PUT stores the declared bytes; a body that differs is caught"""
+        test_name = "Presigned PUT With Checksum"
+        storage = make_storage()
+        try:
+            data = b"%PDF-1.7 " + os.urandom(4096)
+            sha256 = hashlib.sha256(data).hexdigest()
+            upload = await storage.presign_upload("direct.pdf", "application/pdf", len(data), sha256)
+
+            async with httpx.AsyncClient() as client:
+                accepted = await client.put(upload["url"], headers=upload["headers"], content=data)
+                tampered_body = data[:-1] + bytes([data[-1] ^ 1])
+                upload = await storage.presign_upload("tampered.pdf", "application/pdf", len(data), sha256)
+                tampered = await client.put(upload["url"], headers=upload["headers"], content=tampered_body)
+
+            # Stores that enforce the signed checksum refuse the body outright;
+            # otherwise sha256() of the stored object must give it away
+            tampered_caught = tampered.status_code >= 400 or await storage.sha256("tampered.pdf") != sha256
+            results = {
+                "headers_signed": upload["headers"]["x-amz-checksum-sha256"] == base64.b64encode(bytes.fromhex(sha256)).decode(),
+                "accepted": accepted.status_code == 200,
+                "stored_sha256": await storage.sha256("direct.pdf") == sha256,
+                "tampered_caught": tampered_caught,
+                "tampered_rejected_by_store": tampered.status_code >= 400,
+            }
+            required = ("headers_signed", "accepted", "stored_sha256", "tampered_caught")
+            if all(results[name] for name in required):
+                how = "rejected by the store" if results["tampered_rejected_by_store"] else "caught by its SHA-256"
+                self.log_test(test_name, True, f"Direct upload stored; tampered body {how}")
+            else:
+                self.log_test(test_name, False, "Presigned upload mismatch", results)
+        finally:
+            await storage.close()
+
+    async def test_presigned_download(self):
+        """A presigned GET serves the object with the requested filename"""
+        test_name = "Presigned Download"
+        storage = make_storage()
+        try:
+            data = b"%PDF-1.4 download"
+            await storage.put_file("download.pdf", write_temp_file(data), "application/pdf")
+            url = await storage.download_url("download.pdf", 'Ada "CV".pdf', "application/pdf")
+
+            async with httpx.AsyncClient() as client:
+                response = await client.get(url)
+
+            disposition = response.headers.get("content-disposition", "")
+            if response.status_code == 200 and response.content == data and 'filename="Ada CV.pdf"' in disposition:
+                self.log_test(test_name, True, "Presigned URL served the file")
+            else:
+                self.log_test(test_name, False, "Presigned GET mismatch", {
+                    "status": response.status_code,
+                    "disposition": disposition,
+                })
+        finally:
+            await storage.close()
+
+    def run_all_tests(self):
+        """Run the complete S3 storage test suite"""
+        print("🚀 Starting S3 Storage Backend Tests")
+        print(f"   Endpoint: {ENDPOINT_URL}, bucket: {BUCKET}")
+        print("=" * 60)
+
+        try:
+            if not asyncio.run(self.create_bucket()):
+                print("\n❌ Could not create the test bucket. Stopping tests.")
+                return False
+        except httpx.HTTPError as e:
+            print(f"\n❌ S3 stand-in is not accessible at {ENDPOINT_URL}: {e}")
+            return False
+
+        for test in [
+            self.test_single_put,
+            self.test_multipart_put,
+            self.test_multipart_abort,
+            self.test_move_and_delete,
+            self.test_presigned_put_with_checksum,
+            self.test_presigned_download,
+        ]:
+            try:
+                asyncio.run(test())
+            except Exception as e:
+                self.log_test(test.__name__, False, f"Unexpected error: {str(e)}")
+
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        failed_tests = total_tests - passed_tests
+
+        print("\n" + "=" * 60)
+        print(f"Total Tests: {total_tests}")
+        print(f"Passed: {passed_tests}")
+        print(f"Failed: {failed_tests}")
+
+        return failed_tests == 0
+
+
+def main():
+    """Main test execution for the S3 storage backend"""
+    tester = S3StorageTester()
+    success = tester.run_all_tests()
+
+    if success:
+        print("\n🎉 All S3 storage tests passed!")
+        sys.exit(0)
+    else:
+        print("\n💥 Some S3 storage tests failed!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()